@@ -1,8 +1,7 @@
 from dataclasses import dataclass
 from typing import List
 
-from crewai import Agent, Task, Crew
-
+from ai_agents.registry import get_crew
 from backend.services.azure_openai_service import AzureOpenAIService
 
 
@@ -27,19 +26,8 @@ async def extract_concepts(transcript: str) -> ConceptExtractionResult:
 
     concepts = [line.strip("-• ").strip() for line in content.splitlines() if line.strip()]
 
-    agent = Agent(
-        role="Concept Extractor",
-        goal="Identify key concepts learners must master.",
-        backstory="Expert in mapping content to learning objectives.",
-        allow_delegation=False,
-        verbose=False,
-    )
-    task = Task(
-        description="Extract key concepts from the lesson.",
-        agent=agent,
-        expected_output="Bullet list of key concepts.",
-    )
-    Crew(agents=[agent], tasks=[task])
+    # Shared agent definition (built once, see ai_agents.registry)
+    get_crew("concept_extractor")
 
     return ConceptExtractionResult(concepts=concepts)
 
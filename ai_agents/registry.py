@@ -0,0 +1,101 @@
+"""
+CrewAI agent definitions, built once per process on first use.
+
+The LLM calls themselves go through AzureOpenAIService; the Agent/Task/Crew
+objects describe each step for CrewAI tooling. Constructing them runs pydantic
+validation, tool registration and telemetry setup, so they are cached here
+instead of being rebuilt on every call. With CREWAI_AGENTS_ENABLED=false they
+are never built and crewai is never imported.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+from backend.core.config import settings
+
+
+@dataclass(frozen=True)
+class AgentSpec:
+    role: str
+    goal: str
+    backstory: str
+    task_description: str
+    expected_output: str
+
+
+AGENT_SPECS: dict[str, AgentSpec] = {
+    "transcript_cleaner": AgentSpec(
+        role="Transcript Cleaner",
+        goal="Produce a clean, well-formatted transcript.",
+        backstory="Expert at turning ASR output into readable learning material.",
+        task_description="Clean the given transcript.",
+        expected_output="A single cleaned transcript string.",
+    ),
+    "topic_segmenter": AgentSpec(
+        role="Topic Segmenter",
+        goal="Break lessons into coherent topics.",
+        backstory="Expert at structuring long-form educational content.",
+        task_description="Segment a lesson transcript into topic blocks.",
+        expected_output="JSON array of topic segments with title, summary, start_index, end_index.",
+    ),
+    "summary_agent": AgentSpec(
+        role="Lesson Summarizer",
+        goal="Produce summaries and key takeaways learners can quickly review.",
+        backstory="Specialist in instructional design.",
+        task_description="Summarize the lesson and extract key takeaways.",
+        expected_output="Narrative summary plus 'Key Takeaways' section.",
+    ),
+    "concept_extractor": AgentSpec(
+        role="Concept Extractor",
+        goal="Identify key concepts learners must master.",
+        backstory="Expert in mapping content to learning objectives.",
+        task_description="Extract key concepts from the lesson.",
+        expected_output="Bullet list of key concepts.",
+    ),
+    "revision_agent": AgentSpec(
+        role="Revision Planner",
+        goal="Generate targeted revision plans for learners.",
+        backstory="Experienced in adaptive learning and remediation.",
+        task_description="Generate a revision plan for a learner based on weak topics.",
+        expected_output="Structured plan with sections and practice questions.",
+    ),
+}
+
+
+def build_crew(spec: AgentSpec) -> Any:
+    """Construct a fresh single-agent Crew for `spec` (uncached)."""
+    from crewai import Agent, Crew, Task
+
+    agent = Agent(
+        role=spec.role,
+        goal=spec.goal,
+        backstory=spec.backstory,
+        allow_delegation=False,
+        verbose=False,
+    )
+    task = Task(
+        description=spec.task_description,
+        agent=agent,
+        expected_output=spec.expected_output,
+    )
+    return Crew(agents=[agent], tasks=[task])
+
+
+@lru_cache(maxsize=None)
+def _cached_crew(name: str) -> Any:
+    return build_crew(AGENT_SPECS[name])
+
+
+def get_crew(name: str) -> Any | None:
+    """The shared Crew for an agent, or None when CrewAI is bypassed."""
+    if not settings.crewai_agents_enabled:
+        return None
+    return _cached_crew(name)
+
+
+def build_all() -> None:
+    """Warm-up hook: build every agent definition ahead of the first request."""
+    for name in AGENT_SPECS:
+        get_crew(name)
@@ -1,7 +1,6 @@
 from typing import Optional
 
-from crewai import Agent, Task, Crew
-
+from ai_agents.registry import get_crew
 from backend.services.azure_openai_service import AzureOpenAIService
 
 
@@ -35,19 +34,8 @@ async def generate_revision_plan(
         temperature=0.4,
     )
 
-    agent = Agent(
-        role="Revision Planner",
-        goal="Generate targeted revision plans for learners.",
-        backstory="Experienced in adaptive learning and remediation.",
-        allow_delegation=False,
-        verbose=False,
-    )
-    task = Task(
-        description="Generate a revision plan for a learner based on weak topics.",
-        agent=agent,
-        expected_output="Structured plan with sections and practice questions.",
-    )
-    Crew(agents=[agent], tasks=[task])
+    # Shared agent definition (built once, see ai_agents.registry)
+    get_crew("revision_agent")
 
     return content
 
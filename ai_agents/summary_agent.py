@@ -1,7 +1,6 @@
 from dataclasses import dataclass
 
-from crewai import Agent, Task, Crew
-
+from ai_agents.registry import get_crew
 from backend.services.azure_openai_service import AzureOpenAIService
 
 
@@ -30,19 +29,8 @@ async def summarize_lesson(transcript: str) -> SummaryResult:
     summary = parts[0].strip()
     key_takeaways = parts[1].strip() if len(parts) > 1 else ""
 
-    agent = Agent(
-        role="Lesson Summarizer",
-        goal="Produce summaries and key takeaways learners can quickly review.",
-        backstory="Specialist in instructional design.",
-        allow_delegation=False,
-        verbose=False,
-    )
-    task = Task(
-        description="Summarize the lesson and extract key takeaways.",
-        agent=agent,
-        expected_output="Narrative summary plus 'Key Takeaways' section.",
-    )
-    Crew(agents=[agent], tasks=[task])
+    # Shared agent definition (built once, see ai_agents.registry)
+    get_crew("summary_agent")
 
     return SummaryResult(summary=summary, key_takeaways=key_takeaways)
 
@@ -1,8 +1,7 @@
 from dataclasses import dataclass
 from typing import List
 
-from crewai import Agent, Task, Crew
-
+from ai_agents.registry import get_crew
 from backend.services.azure_openai_service import AzureOpenAIService
 
 
@@ -59,20 +58,8 @@ async def segment_topics(transcript: str) -> TopicSegmentationResult:
         except Exception:
             continue
 
-    # Minimal CrewAI wiring for architecture
-    agent = Agent(
-        role="Topic Segmenter",
-        goal="Break lessons into coherent topics.",
-        backstory="Expert at structuring long-form educational content.",
-        allow_delegation=False,
-        verbose=False,
-    )
-    task = Task(
-        description="Segment a lesson transcript into topic blocks.",
-        agent=agent,
-        expected_output="JSON array of topic segments with title, summary, start_index, end_index.",
-    )
-    Crew(agents=[agent], tasks=[task])
+    # Shared agent definition (built once, see ai_agents.registry)
+    get_crew("topic_segmenter")
 
     return TopicSegmentationResult(segments=segments)
 
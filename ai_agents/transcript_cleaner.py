@@ -1,7 +1,6 @@
 from dataclasses import dataclass
 
-from crewai import Agent, Task, Crew
-
+from ai_agents.registry import get_crew
 from backend.services.azure_openai_service import AzureOpenAIService
 
 
@@ -31,23 +30,8 @@ async def clean_transcript(transcript: str) -> CleanTranscriptResult:
             temperature=0.1,
         )
 
-    # Minimal CrewAI wiring (agent + task + crew) as a sample
-    agent = Agent(
-        role="Transcript Cleaner",
-        goal="Produce a clean, well-formatted transcript.",
-        backstory="Expert at turning ASR output into readable learning material.",
-        allow_delegation=False,
-        verbose=False,
-    )
-
-    task = Task(
-        description="Clean the given transcript.",
-        agent=agent,
-        expected_output="A single cleaned transcript string.",
-    )
-
-    # We don't rely on Crew to call the LLM directly; instead we use our AzureOpenAIService.
-    Crew(agents=[agent], tasks=[task])  # Constructed for architectural completeness
+    # Shared agent definition (built once, see ai_agents.registry)
+    get_crew("transcript_cleaner")
 
     cleaned = await _llm_call()
     return CleanTranscriptResult(cleaned_transcript=cleaned.strip())
@@ -10,7 +10,7 @@ from alembic import context
 from backend.db.base import Base
 from backend.core.config import settings
 # Import models to ensure they are registered
-from backend.models import user, course, activity_log, certificate, enrollment, chat_log
+from backend.models import user, course, activity_log, certificate, enrollment, chat_log, embedding, upload, media_blob
 
 config = context.config
 
@@ -57,6 +57,12 @@ async def run_async_migrations() -> None:
 
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode."""
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        # Called from `backend.manage migrate`, which holds the advisory lock
+        # and the transaction on this connection
+        do_run_migrations(connection)
+        return
     asyncio.run(run_async_migrations())
 
 if context.is_offline_mode():
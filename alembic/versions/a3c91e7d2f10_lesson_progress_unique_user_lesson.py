@@ -0,0 +1,43 @@
+"""lesson_progress_unique_user_lesson
+
+Revision ID: a3c91e7d2f10
+Revises: 5ff5c74515fd
+Create Date: 2026-10-19 09:12:41.208113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c91e7d2f10'
+down_revision: Union[str, Sequence[str], None] = '5ff5c74515fd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Collapse rows duplicated by the old select-then-insert race, keeping the
+    # most recently written one, so the unique constraint can be created.
+    op.execute(
+        """
+        DELETE FROM lesson_progress lp
+        USING lesson_progress newer
+        WHERE lp.user_id = newer.user_id
+          AND lp.lesson_id = newer.lesson_id
+          AND lp.id < newer.id
+        """
+    )
+    op.create_unique_constraint(
+        'uq_lesson_progress_user_lesson',
+        'lesson_progress',
+        ['user_id', 'lesson_id'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_lesson_progress_user_lesson', 'lesson_progress', type_='unique')
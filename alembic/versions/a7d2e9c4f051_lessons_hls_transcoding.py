@@ -0,0 +1,41 @@
+"""lessons_hls_transcoding
+
+Revision ID: a7d2e9c4f051
+Revises: f3a9c0d4b1e6
+Create Date: 2026-10-19 15:12:37.408126
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d2e9c4f051'
+down_revision: Union[str, Sequence[str], None] = 'f3a9c0d4b1e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('lessons', sa.Column('hls_status', sa.String(length=20), nullable=True))
+    op.add_column('lessons', sa.Column('hls_progress', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('lessons', sa.Column('hls_path', sa.Text(), nullable=True))
+    op.add_column('lessons', sa.Column('hls_updated_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(
+        'ix_lessons_hls_pending',
+        'lessons',
+        ['hls_status', 'id'],
+        postgresql_where=sa.text("hls_status IN ('queued', 'processing')"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_lessons_hls_pending', table_name='lessons')
+    op.drop_column('lessons', 'hls_updated_at')
+    op.drop_column('lessons', 'hls_path')
+    op.drop_column('lessons', 'hls_progress')
+    op.drop_column('lessons', 'hls_status')
@@ -0,0 +1,47 @@
+"""upload_sessions
+
+Revision ID: b1c6f4e8d329
+Revises: a7d2e9c4f051
+Create Date: 2026-10-19 16:03:51.217940
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b1c6f4e8d329'
+down_revision: Union[str, Sequence[str], None] = 'a7d2e9c4f051'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'upload_sessions',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('lesson_id', sa.Integer(), nullable=False),
+        sa.Column('filename', sa.String(length=255), nullable=False),
+        sa.Column('category', sa.String(length=20), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('offset', sa.BigInteger(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('sha256', sa.String(length=64), nullable=True),
+        sa.Column('stored_path', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['lesson_id'], ['lessons.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_upload_sessions_status_updated', 'upload_sessions', ['status', 'updated_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_upload_sessions_status_updated', table_name='upload_sessions')
+    op.drop_table('upload_sessions')
@@ -0,0 +1,44 @@
+"""users_last_active_date
+
+Revision ID: b7e4d2a95c31
+Revises: a3c91e7d2f10
+Create Date: 2026-10-19 10:03:17.551920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e4d2a95c31'
+down_revision: Union[str, Sequence[str], None] = 'a3c91e7d2f10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('last_active_date', sa.Date(), nullable=True))
+    # Seed from existing progress so streaks continue rather than restarting at 0.
+    # Only the latest access per lesson is stored, so history beyond the most
+    # recent day cannot be reconstructed; active users start from a streak of 1.
+    op.execute(
+        """
+        UPDATE users u
+        SET last_active_date = p.last_day,
+            current_streak = GREATEST(u.current_streak, 1)
+        FROM (
+            SELECT user_id, max((last_accessed AT TIME ZONE 'UTC')::date) AS last_day
+            FROM lesson_progress
+            GROUP BY user_id
+        ) p
+        WHERE p.user_id = u.id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'last_active_date')
@@ -0,0 +1,72 @@
+"""media_blobs
+
+Revision ID: c4e8a1f7b265
+Revises: b1c6f4e8d329
+Create Date: 2026-10-19 16:47:12.590384
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a1f7b265'
+down_revision: Union[str, Sequence[str], None] = 'b1c6f4e8d329'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'media_blobs',
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('stored_path', sa.Text(), nullable=False),
+        sa.Column('category', sa.String(length=20), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('ref_count', sa.Integer(), nullable=False),
+        sa.Column('pipeline_status', sa.String(length=20), nullable=True),
+        sa.Column('transcript', sa.Text(), nullable=True),
+        sa.Column('cleaned_transcript', sa.Text(), nullable=True),
+        sa.Column('summary', sa.Text(), nullable=True),
+        sa.Column('key_takeaways', sa.Text(), nullable=True),
+        sa.Column('concepts', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('sha256'),
+        sa.UniqueConstraint('stored_path'),
+    )
+    op.create_index(
+        'ix_media_blobs_unreferenced',
+        'media_blobs',
+        ['updated_at'],
+        postgresql_where=sa.text('ref_count <= 0'),
+    )
+    # The baseline revision dropped lesson_chunks and databases got it back from
+    # the old create_all-at-startup, so it may be missing here
+    if 'lesson_chunks' not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            'lesson_chunks',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('lesson_id', sa.Integer(), nullable=False),
+            sa.Column('chunk_id', sa.String(length=255), nullable=False),
+            sa.Column('content', sa.Text(), nullable=False),
+            sa.Column('order_index', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['lesson_id'], ['lessons.id']),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('chunk_id'),
+        )
+        op.create_index(op.f('ix_lesson_chunks_id'), 'lesson_chunks', ['id'])
+        op.create_index(op.f('ix_lesson_chunks_lesson_id'), 'lesson_chunks', ['lesson_id'])
+    op.add_column('lesson_chunks', sa.Column('content_sha256', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_lesson_chunks_content_sha256'), 'lesson_chunks', ['content_sha256'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_lesson_chunks_content_sha256'), table_name='lesson_chunks')
+    op.drop_column('lesson_chunks', 'content_sha256')
+    op.drop_index('ix_media_blobs_unreferenced', table_name='media_blobs')
+    op.drop_table('media_blobs')
@@ -0,0 +1,77 @@
+"""analytics_materialized_views
+
+Revision ID: c5f18b3e7a42
+Revises: b7e4d2a95c31
+Create Date: 2026-10-19 11:26:04.733018
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5f18b3e7a42'
+down_revision: Union[str, Sequence[str], None] = 'b7e4d2a95c31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Each view needs a unique index so it can be refreshed CONCURRENTLY,
+    # i.e. without blocking the analytics endpoints that read from it.
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW mv_course_completion AS
+        SELECT c.id AS course_id,
+               c.title,
+               c.created_by_id,
+               coalesce(avg(lp.completion_percentage), 0)::float AS avg_completion,
+               count(DISTINCT lp.user_id) AS students
+        FROM courses c
+        LEFT JOIN modules m ON m.course_id = c.id
+        LEFT JOIN lessons l ON l.module_id = m.id
+        LEFT JOIN lesson_progress lp ON lp.lesson_id = l.id
+        GROUP BY c.id, c.title, c.created_by_id
+        """
+    )
+    op.create_index('ux_mv_course_completion_course', 'mv_course_completion', ['course_id'], unique=True)
+    op.create_index('ix_mv_course_completion_created_by', 'mv_course_completion', ['created_by_id'])
+
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW mv_lesson_difficulty AS
+        SELECT l.id AS lesson_id,
+               l.title,
+               avg(lp.completion_percentage)::float AS avg_completion,
+               count(lp.id) AS attempts
+        FROM lessons l
+        JOIN lesson_progress lp ON lp.lesson_id = l.id
+        GROUP BY l.id, l.title
+        """
+    )
+    op.create_index('ux_mv_lesson_difficulty_lesson', 'mv_lesson_difficulty', ['lesson_id'], unique=True)
+    op.create_index('ix_mv_lesson_difficulty_avg', 'mv_lesson_difficulty', ['avg_completion'])
+
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW mv_enrollment_monthly AS
+        SELECT course_id,
+               date_trunc('month', enrolled_at)::date AS month,
+               count(*) AS enrollments
+        FROM enrollments
+        WHERE enrolled_at IS NOT NULL
+        GROUP BY course_id, date_trunc('month', enrolled_at)::date
+        """
+    )
+    op.create_index('ux_mv_enrollment_monthly_course_month', 'mv_enrollment_monthly', ['course_id', 'month'], unique=True)
+    op.create_index('ix_mv_enrollment_monthly_month', 'mv_enrollment_monthly', ['month'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_enrollment_monthly")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_lesson_difficulty")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_course_completion")
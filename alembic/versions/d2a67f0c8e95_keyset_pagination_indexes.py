@@ -0,0 +1,33 @@
+"""keyset_pagination_indexes
+
+Revision ID: d2a67f0c8e95
+Revises: c5f18b3e7a42
+Create Date: 2026-10-19 12:40:52.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a67f0c8e95'
+down_revision: Union[str, Sequence[str], None] = 'c5f18b3e7a42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Composite (sort key, id) indexes backing the keyset-paginated admin listings
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+    op.create_index('ix_certificates_issued_at_id', 'certificates', ['issued_at', 'id'], unique=False)
+    op.create_index('ix_activity_logs_created_at_id', 'activity_logs', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_activity_logs_created_at_id', table_name='activity_logs')
+    op.drop_index('ix_certificates_issued_at_id', table_name='certificates')
+    op.drop_index('ix_users_created_at_id', table_name='users')
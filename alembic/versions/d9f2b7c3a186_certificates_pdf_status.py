@@ -0,0 +1,35 @@
+"""certificates_pdf_status
+
+Revision ID: d9f2b7c3a186
+Revises: c4e8a1f7b265
+Create Date: 2026-10-19 18:41:09.552310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9f2b7c3a186'
+down_revision: Union[str, Sequence[str], None] = 'c4e8a1f7b265'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows start as pending: the first download checks the file and
+    # renders it if it is missing
+    op.add_column(
+        'certificates',
+        sa.Column('pdf_status', sa.String(length=20), server_default='pending', nullable=False),
+    )
+    op.add_column('certificates', sa.Column('pdf_rendered_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('certificates', 'pdf_rendered_at')
+    op.drop_column('certificates', 'pdf_status')
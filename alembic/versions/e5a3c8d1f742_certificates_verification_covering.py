@@ -0,0 +1,45 @@
+"""certificates_verification_covering
+
+Revision ID: e5a3c8d1f742
+Revises: d9f2b7c3a186
+Create Date: 2026-10-19 19:26:14.830571
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a3c8d1f742'
+down_revision: Union[str, Sequence[str], None] = 'd9f2b7c3a186'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('certificates', sa.Column('student_name', sa.String(length=255), nullable=True))
+    op.add_column('certificates', sa.Column('course_title', sa.String(length=255), nullable=True))
+    op.execute(
+        """
+        UPDATE certificates c
+        SET student_name = u.full_name, course_title = co.title
+        FROM users u, courses co
+        WHERE u.id = c.user_id AND co.id = c.course_id
+        """
+    )
+    op.create_index(
+        'ix_certificates_verification_covering',
+        'certificates',
+        ['verification_id'],
+        postgresql_include=['revoked', 'student_name', 'course_title', 'ai_mastery_score', 'issued_at'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_certificates_verification_covering', table_name='certificates')
+    op.drop_column('certificates', 'course_title')
+    op.drop_column('certificates', 'student_name')
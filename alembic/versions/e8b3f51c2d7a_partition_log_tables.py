@@ -0,0 +1,112 @@
+"""partition_log_tables
+
+Revision ID: e8b3f51c2d7a
+Revises: d2a67f0c8e95
+Create Date: 2026-10-19 13:05:27.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b3f51c2d7a'
+down_revision: Union[str, Sequence[str], None] = 'd2a67f0c8e95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# table -> (partition bound suffix, indexes recreated on the partitioned parent).
+# activity_logs.created_at is timestamptz, so its bounds are pinned to UTC;
+# chat_logs.created_at is a naive UTC timestamp.
+LOG_TABLES = {
+    'activity_logs': ('+00', [
+        ('ix_activity_logs_id', ['id']),
+        ('ix_activity_logs_action', ['action']),
+        ('ix_activity_logs_created_at', ['created_at']),
+        ('ix_activity_logs_created_at_id', ['created_at', 'id']),
+        ('ix_activity_logs_user_created', ['user_id', 'created_at']),
+    ]),
+    'chat_logs': ('', [
+        ('ix_chat_logs_id', ['id']),
+        ('ix_chat_logs_user_created', ['user_id', 'created_at']),
+    ]),
+}
+
+# Monthly partitions created past the current month (PartitionService keeps this rolling)
+MONTHS_AHEAD = 3
+
+
+def _create_monthly_partitions(table: str, bound_suffix: str) -> None:
+    """One partition per month from the oldest row up to MONTHS_AHEAD, plus a DEFAULT."""
+    op.execute(f"""
+        DO $$
+        DECLARE
+            m date := date_trunc('month', coalesce((SELECT min(created_at) FROM {table}_old), now()))::date;
+            last date := (date_trunc('month', now()) + interval '{MONTHS_AHEAD} months')::date;
+        BEGIN
+            WHILE m <= last LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF {table} FOR VALUES FROM (%L) TO (%L)',
+                    '{table}_y' || to_char(m, 'YYYY') || 'm' || to_char(m, 'MM'),
+                    m::text || ' 00:00:00{bound_suffix}',
+                    (m + interval '1 month')::date::text || ' 00:00:00{bound_suffix}'
+                );
+                m := (m + interval '1 month')::date;
+            END LOOP;
+        END $$;
+    """)
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+
+def _add_constraints(table: str, primary_key: list[str]) -> None:
+    op.create_primary_key(f'{table}_pkey', table, primary_key)
+    op.create_foreign_key(f'{table}_user_id_fkey', table, 'users', ['user_id'], ['id'])
+    if table == 'activity_logs':
+        op.create_foreign_key(
+            'activity_logs_related_course_id_fkey', table, 'courses',
+            ['related_course_id'], ['id'], ondelete='SET NULL',
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Month boundaries below are computed in UTC
+    op.execute("SET LOCAL TIME ZONE 'UTC'")
+    for table, (bound_suffix, indexes) in LOG_TABLES.items():
+        # created_at becomes the partition key, so it can no longer be null
+        op.execute(f"UPDATE {table} SET created_at = now() WHERE created_at IS NULL")
+        op.rename_table(table, f'{table}_old')
+
+        op.execute(f"CREATE TABLE {table} (LIKE {table}_old INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)")
+        op.alter_column(table, 'created_at', nullable=False, server_default=sa.func.now())
+        _create_monthly_partitions(table, bound_suffix)
+
+        op.execute(f"INSERT INTO {table} SELECT * FROM {table}_old")
+        # Keep the id sequence alive when the old table goes
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+        op.drop_table(f'{table}_old')
+
+        # Primary key and indexes declared on the parent are created per partition
+        _add_constraints(table, ['id', 'created_at'])
+        for name, columns in indexes:
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, (_, indexes) in LOG_TABLES.items():
+        op.rename_table(table, f'{table}_old')
+        op.execute(f"CREATE TABLE {table} (LIKE {table}_old INCLUDING DEFAULTS)")
+        op.execute(f"INSERT INTO {table} SELECT * FROM {table}_old")
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+        # Drops every partition, including any created later by PartitionService
+        op.drop_table(f'{table}_old')
+
+        _add_constraints(table, ['id'])
+        for name, columns in indexes:
+            if name.endswith('_user_created'):
+                continue
+            op.create_index(name, table, columns, unique=False)
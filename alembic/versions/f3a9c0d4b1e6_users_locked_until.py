@@ -0,0 +1,31 @@
+"""users_locked_until
+
+Revision ID: f3a9c0d4b1e6
+Revises: e8b3f51c2d7a
+Create Date: 2026-10-19 13:48:02.664215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a9c0d4b1e6'
+down_revision: Union[str, Sequence[str], None] = 'e8b3f51c2d7a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('locked_until', sa.DateTime(timezone=True), nullable=True))
+    # login_attempts now records the failures behind the last lockout rather
+    # than a running counter, so clear the old per-attempt counts
+    op.execute("UPDATE users SET login_attempts = 0")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'locked_until')
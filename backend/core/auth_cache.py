@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+
+from backend.core.cache import TTLCache
+from backend.core.config import settings
+from backend.core.pubsub import bus
+
+
+AUTH_INVALIDATION_CHANNEL = "auth:user"
+
+
+@dataclass(frozen=True, slots=True)
+class AuthUser:
+    """
+    The slice of a User that authentication and role checks need, cached per
+    worker so hot endpoints (progress heartbeats, media) skip the users lookup.
+    Routes that need the full row depend on `get_current_user` instead.
+    """
+
+    id: int
+    role: str
+    status: str
+    is_active: bool
+    current_streak: int
+    last_active_date: date | None
+
+    @classmethod
+    def from_user(cls, user) -> "AuthUser":
+        return cls(
+            id=user.id,
+            role=user.role,
+            status=user.status,
+            is_active=user.is_active,
+            current_streak=user.current_streak or 0,
+            last_active_date=user.last_active_date,
+        )
+
+
+_cache = TTLCache(ttl_seconds=settings.auth_cache_ttl_seconds, maxsize=50_000)
+
+
+def get(user_id: int) -> AuthUser | None:
+    if settings.auth_cache_ttl_seconds <= 0:
+        return None
+    return _cache.get(user_id)
+
+
+def put(user) -> AuthUser:
+    auth_user = AuthUser.from_user(user)
+    if settings.auth_cache_ttl_seconds > 0:
+        _cache.set(user.id, auth_user)
+    return auth_user
+
+
+def invalidate(user_id: int) -> None:
+    """Drop a user's cached auth state here and in every subscribed worker."""
+    bus.publish(AUTH_INVALIDATION_CHANNEL, user_id)
+
+
+bus.subscribe(AUTH_INVALIDATION_CHANNEL, _cache.invalidate)
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable
+
+from loguru import logger
+
+
+_tasks: dict[str, asyncio.Task] = {}
+
+
+def run_periodically(
+    name: str,
+    interval_seconds: float,
+    job: Callable[[], Awaitable[None]],
+    initial_delay_seconds: float = 0.0,
+) -> None:
+    """
+    Run `job` every `interval_seconds` in a background task owned by this worker.
+    Failures are logged and the loop keeps going. A non-positive interval disables the job.
+    """
+    if interval_seconds <= 0 or name in _tasks:
+        return
+
+    async def _loop() -> None:
+        if initial_delay_seconds:
+            await asyncio.sleep(initial_delay_seconds)
+        while True:
+            try:
+                await job()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[Background] Job '{name}' failed: {e}")
+            await asyncio.sleep(interval_seconds)
+
+    _tasks[name] = asyncio.create_task(_loop(), name=f"periodic:{name}")
+    logger.info(f"[Background] Scheduled '{name}' every {interval_seconds}s")
+
+
+async def stop_all() -> None:
+    """Cancel every periodic job (called on application shutdown)."""
+    tasks = list(_tasks.values())
+    _tasks.clear()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
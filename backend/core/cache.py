@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+from loguru import logger
+
+
+T = TypeVar("T")
+
+
+class TTLCache:
+    """
+    Small in-process cache with per-entry expiry and LRU eviction.
+    Per-worker only — each uvicorn worker holds its own copy.
+    """
+
+    def __init__(self, ttl_seconds: float, maxsize: int = 10_000) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: float | None = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class StaleWhileRevalidateCache:
+    """
+    Async cache that serves a fresh value for `ttl_seconds`, then keeps serving
+    the stale value for up to `stale_seconds` more while a single background
+    task refreshes it. Concurrent cold misses share one load.
+    """
+
+    def __init__(self, ttl_seconds: float, stale_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self._data: dict[Hashable, tuple[float, Any]] = {}
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[T]],
+        refresher: Callable[[], Awaitable[T]] | None = None,
+    ) -> T:
+        """
+        `loader` runs in the caller's context on a cold miss; callers that miss
+        the same key meanwhile wait for that load instead of starting their own,
+        and take it over if the loading caller is cancelled. `refresher` runs in
+        a detached task and must not depend on request-scoped resources such as
+        the request's DB session; it defaults to `loader`.
+        """
+        now = time.monotonic()
+        entry = self._data.get(key)
+        if entry is not None:
+            loaded_at, value = entry
+            age = now - loaded_at
+            if age < self.ttl_seconds:
+                return value
+            if age < self.ttl_seconds + self.stale_seconds:
+                if key not in self._inflight:
+                    self._inflight[key] = asyncio.create_task(self._refresh(key, refresher or loader))
+                return value
+
+        while (pending := self._inflight.get(key)) is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # The caller running the load went away: take over the load,
+                # unless this caller is the one being cancelled
+                if pending.cancelled() and not asyncio.current_task().cancelling():
+                    continue
+                raise
+
+        # Cold miss: this caller loads; concurrent callers wait on the future
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Retrieved here so an exception nobody else awaited isn't logged as lost
+            future.exception()
+            raise
+        else:
+            self._data[key] = (time.monotonic(), value)
+            future.set_result(value)
+            return value
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    async def _refresh(self, key: Hashable, refresher: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await refresher()
+            self._data[key] = (time.monotonic(), value)
+            return value
+        except Exception as e:
+            logger.warning(f"[Cache] Background refresh of {key!r} failed: {e}")
+            entry = self._data.get(key)
+            if entry is None:
+                raise
+            return entry[1]
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
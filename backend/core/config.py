@@ -10,6 +10,27 @@ class Settings(BaseSettings):
 
     database_url: str
 
+    # Async engine pool (per worker process — multiply by the worker count
+    # to get the connection budget Postgres has to allow)
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: int = 1_800
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: int = 30_000  # 0 disables
+    db_prepared_statement_cache_size: int = 100  # 0 when behind PgBouncer (transaction mode)
+    db_echo: bool = False
+
+    # Optional streaming replica for analytics, listings and exports. Reads fall
+    # back to the primary while it lags more than `replica_max_lag_seconds`.
+    database_replica_url: Optional[str] = None
+    replica_max_lag_seconds: float = 10.0
+    replica_lag_check_interval_seconds: float = 5.0
+
+    # Startup only compares alembic_version with the migration head; schema
+    # changes and seeding run once per deploy via `python -m backend.manage migrate`
+    schema_check: str = "error"  # "error" | "warn" | "off"
+
     azure_openai_endpoint: AnyUrl
     azure_openai_key: str
     azure_openai_deployment: str
@@ -25,13 +46,111 @@ class Settings(BaseSettings):
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 60
 
+    # Argon2 cost. Changing these rehashes each password on its next login.
+    argon2_time_cost: int = 3
+    argon2_memory_cost_kib: int = 65_536
+    argon2_parallelism: int = 4
+    # Threads hashing passwords per worker, and queued jobs allowed before
+    # sign-ins are shed with 503
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 64
+
+    # Login throttling. Buckets/counters live in the rate-limit store:
+    # "memory" (per worker) or "sqlite" (one file shared by workers on the host).
+    rate_limit_backend: str = "memory"
+    rate_limit_sqlite_path: str = "/tmp/ltc_rate_limit.sqlite3"
+    # Per client IP. A classroom behind one NAT shares an address, so the
+    # bucket is sized for a cohort signing in at the start of a session
+    login_ip_burst: int = 100
+    login_ip_per_minute: float = 60.0
+    # Reverse proxies (IPs/CIDRs, comma-separated) whose X-Forwarded-For is
+    # trusted for the client IP; empty uses the TCP peer address
+    trusted_proxies: str = ""
+    login_email_burst: int = 5
+    login_email_per_minute: float = 5.0
+    # This many failures within the window locks the account for `lockout` minutes
+    login_max_failures: int = 5
+    login_failure_window_minutes: int = 15
+    login_lockout_minutes: int = 15
+
+    # Per-worker cache of auth fields (role/status/is_active); 0 disables.
+    # Also the longest a revoke can take to reach other workers.
+    auth_cache_ttl_seconds: int = 30
+
+    # Learning streaks — calendar days are counted in this IANA timezone
+    streak_timezone: str = "UTC"
+
+    # Admin dashboard stats cache (seconds). After the TTL the stale value is
+    # still served for up to `stale` seconds while it refreshes in the background.
+    admin_stats_cache_ttl_seconds: int = 15
+    admin_stats_cache_stale_seconds: int = 300
+
+    # Analytics materialized views are refreshed this often (0 disables)
+    analytics_refresh_interval_seconds: int = 300
+
+    # Batched activity log writer (per worker)
+    activity_log_queue_size: int = 10_000
+    activity_log_batch_size: int = 500
+    activity_log_flush_interval_ms: int = 250
+    activity_log_enqueue_timeout_seconds: float = 1.0
+
+    # Monthly partitions of activity_logs / chat_logs. Retention of 0 keeps
+    # every month; otherwise older partitions are detached (archived) or dropped.
+    log_partition_months_ahead: int = 3
+    log_retention_months: int = 0
+    log_retention_action: str = "detach"  # "detach" | "drop"
+    partition_maintenance_interval_seconds: int = 86_400
+
+    # Import and initialise the AI/PDF SDKs right after startup instead of on
+    # first use (for workers that serve the knowledge pipeline and chat)
+    warmup_on_startup: bool = False
+
+    # Build the CrewAI agent definitions (once per process). False skips CrewAI
+    # entirely — LLM calls go through AzureOpenAIService either way.
+    crewai_agents_enabled: bool = True
+
     # Storage configuration
     storage_type: str = "local"  # "local" | "cloud"
 
+    # Resumable (chunked) uploads
+    upload_max_bytes: int = 20 * 1024 ** 3
+    upload_session_ttl_hours: int = 24
+    # Content-addressed media: blobs no lesson references are deleted after this long
+    media_gc_grace_hours: int = 24
+
+    # HLS packaging of uploaded videos (local storage only; needs ffmpeg/ffprobe
+    # on PATH). Renditions are "height:video kbps", skipped above the source height.
+    hls_enabled: bool = False
+    hls_workers: int = 1  # concurrent ffmpeg jobs per app process
+    hls_renditions: str = "360:800,540:1400,720:2800,1080:5000"
+    hls_segment_seconds: int = 6
+    hls_poll_interval_seconds: float = 30.0
+    hls_stale_after_seconds: int = 900  # requeue jobs with no progress for this long
+    ffmpeg_path: str = "ffmpeg"
+    ffprobe_path: str = "ffprobe"
+
+    # Certificate PDFs are drawn by this many worker processes per app process
+    certificate_render_workers: int = 2
+    # Public verification: per-worker cache TTL, also sent as Cache-Control
+    # max-age. Revocations only invalidate the cache of the worker that made
+    # them (the bus is in-process), so this is how long other workers and
+    # HTTP caches may keep showing a revoked certificate as valid; unknown
+    # ids (including one issued by another worker) are cached for the
+    # shorter negative TTL
+    certificate_verify_ttl_seconds: int = 60
+    certificate_verify_negative_ttl_seconds: int = 30
+
     # Cloudinary (optional — used when storage_type=cloud)
     cloudinary_cloud_name: Optional[str] = None
     cloudinary_api_key: Optional[str] = None
     cloudinary_api_secret: Optional[str] = None
+    # Point at a local stand-in for testing; uploads are sent in chunks of
+    # cloudinary_chunk_bytes (min 5 MiB), this many at a time per process
+    cloudinary_api_base: str = "https://api.cloudinary.com"
+    cloudinary_chunk_bytes: int = 20 * 1024 ** 2
+    cloudinary_upload_concurrency: int = 4
+    cloudinary_max_retries: int = 3
+    cloudinary_timeout_seconds: float = 120.0
 
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=False, extra="ignore")
 
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import mimetypes
+import os
+import secrets
+import stat
+from email.utils import formatdate, parsedate_to_datetime
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Receive, Scope, Send
+
+
+CHUNK_SIZE = 256 * 1024
+# More ranges than this in one request is ignored (whole file sent) rather
+# than turned into a many-part response
+MAX_RANGES = 16
+CACHE_CONTROL = "private, max-age=3600"
+
+# HLS output (the platform default maps .ts to Qt translation files)
+mimetypes.add_type("application/vnd.apple.mpegurl", ".m3u8")
+mimetypes.add_type("video/mp2t", ".ts")
+
+
+def strong_etag(stat_result: os.stat_result) -> str:
+    # Uploads are written once under unique names, so inode + size + mtime
+    # identifies the exact bytes and the tag can be strong (usable in If-Range)
+    return f'"{stat_result.st_ino:x}-{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"'
+
+
+def parse_range(header: str, size: int) -> list[tuple[int, int]] | None:
+    """
+    Parse a `bytes=` Range header into sorted, merged (start, end) pairs with
+    inclusive ends. None means the header is ignored and the whole file is
+    sent; an empty list means no range is satisfiable (416).
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec.strip():
+        return None
+    parts = spec.split(",")
+    if len(parts) > MAX_RANGES:
+        return None
+
+    ranges = []
+    for part in parts:
+        first, dash, last = part.strip().partition("-")
+        if not dash or not (first + last).isdigit():
+            return None
+        if not first:
+            # Suffix range: the last N bytes
+            start, end = max(0, size - int(last)), size - 1
+        else:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+            if last and int(last) < start:
+                return None
+        if start <= end:
+            ranges.append((start, end))
+
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _not_modified(request_headers: Headers, etag: str, mtime: float) -> bool:
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        # Weak comparison, and If-Modified-Since is ignored when this is present
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _range_applies(request_headers: Headers, etag: str, last_modified: str) -> bool:
+    """If-Range: honour the Range only if the client's copy is still current."""
+    if_range = request_headers.get("if-range")
+    if if_range is None:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith('"'):
+        return if_range == etag  # strong comparison
+    return if_range == last_modified
+
+
+class MediaFileResponse(Response):
+    """
+    File response with byte ranges (206, multipart/byteranges), strong ETags
+    and If-None-Match / If-Modified-Since / If-Range handling.
+
+    The body goes out through the ASGI `http.response.pathsend` or
+    `http.response.zerocopysend` extension (sendfile) when the server offers
+    one; otherwise it is read with pread() in a worker thread.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        stat_result: os.stat_result | None = None,
+        media_type: str | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        self.path = path
+        self.stat_result = stat_result
+        self.status_code = 200
+        self.media_type = media_type or mimetypes.guess_type(str(path))[0] or "application/octet-stream"
+        self.background = None
+        self.init_headers(headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        stat_result = self.stat_result or await anyio.to_thread.run_sync(os.stat, self.path)
+        if not stat.S_ISREG(stat_result.st_mode):
+            raise RuntimeError(f"File at path {self.path} is not a file.")
+        size = stat_result.st_size
+        etag = strong_etag(stat_result)
+        last_modified = formatdate(stat_result.st_mtime, usegmt=True)
+        request_headers = Headers(scope=scope)
+        head = scope["method"].upper() == "HEAD"
+
+        self.headers["etag"] = etag
+        self.headers["last-modified"] = last_modified
+        self.headers["accept-ranges"] = "bytes"
+        self.headers.setdefault("cache-control", CACHE_CONTROL)
+
+        if _not_modified(request_headers, etag, stat_result.st_mtime):
+            del self.headers["content-type"]
+            await self._start(send, 304)
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        ranges = None
+        range_header = request_headers.get("range")
+        if range_header and _range_applies(request_headers, etag, last_modified):
+            ranges = parse_range(range_header, size)
+
+        if ranges == []:
+            self.headers["content-range"] = f"bytes */{size}"
+            self.headers["content-length"] = "0"
+            await self._start(send, 416)
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        if not ranges:
+            self.headers["content-length"] = str(size)
+            await self._start(send, 200)
+            if head:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+            elif "http.response.pathsend" in scope.get("extensions", {}):
+                await send({"type": "http.response.pathsend", "path": str(self.path)})
+            else:
+                await self._send_spans(scope, send, [(0, size, b"")], b"")
+            return
+
+        if len(ranges) == 1:
+            start, end = ranges[0]
+            self.headers["content-range"] = f"bytes {start}-{end}/{size}"
+            self.headers["content-length"] = str(end - start + 1)
+            await self._start(send, 206)
+            if head:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+            else:
+                await self._send_spans(scope, send, [(start, end - start + 1, b"")], b"")
+            return
+
+        boundary = secrets.token_hex(16)
+        spans = []
+        for index, (start, end) in enumerate(ranges):
+            separator = b"" if index == 0 else b"\r\n"
+            part_header = separator + (
+                f"--{boundary}\r\n"
+                f"Content-Type: {self.media_type}\r\n"
+                f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+            ).encode("latin-1")
+            spans.append((start, end - start + 1, part_header))
+        trailer = f"\r\n--{boundary}--\r\n".encode("latin-1")
+        self.headers["content-type"] = f"multipart/byteranges; boundary={boundary}"
+        self.headers["content-length"] = str(
+            sum(len(header) + count for _, count, header in spans) + len(trailer)
+        )
+        await self._start(send, 206)
+        if head:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        else:
+            await self._send_spans(scope, send, spans, trailer)
+
+    async def _start(self, send: Send, status_code: int) -> None:
+        self.status_code = status_code
+        await send({"type": "http.response.start", "status": status_code, "headers": self.raw_headers})
+
+    async def _send_spans(
+        self, scope: Scope, send: Send, spans: list[tuple[int, int, bytes]], trailer: bytes
+    ) -> None:
+        """Send (offset, count, prefix) spans of the file, then `trailer`, ending the body."""
+        zerocopy = "http.response.zerocopysend" in scope.get("extensions", {})
+        file = await anyio.to_thread.run_sync(open, self.path, "rb")
+        try:
+            for offset, count, prefix in spans:
+                if prefix:
+                    await send({"type": "http.response.body", "body": prefix, "more_body": True})
+                if zerocopy:
+                    await send({
+                        "type": "http.response.zerocopysend",
+                        "file": file,
+                        "offset": offset,
+                        "count": count,
+                        "more_body": True,
+                    })
+                    continue
+                end = offset + count
+                while offset < end:
+                    chunk = await anyio.to_thread.run_sync(
+                        os.pread, file.fileno(), min(CHUNK_SIZE, end - offset), offset
+                    )
+                    if not chunk:
+                        raise RuntimeError(f"File at path {self.path} shrank while being sent.")
+                    offset += len(chunk)
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": trailer, "more_body": False})
+        finally:
+            await anyio.to_thread.run_sync(file.close)
+
+
+class MediaStaticFiles(StaticFiles):
+    """StaticFiles serving through MediaFileResponse, so seeking works on the mount too."""
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike[str],
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        return MediaFileResponse(full_path, stat_result=stat_result)
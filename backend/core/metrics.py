@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import Callable
+
+
+# Minimal in-process metrics rendered in the Prometheus text format at /metrics.
+# Values are per worker process; the scraper aggregates across workers.
+_registry: list["_Metric"] = []
+
+# Seconds — tuned for waits that are usually sub-millisecond but can reach the pool timeout
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, description: str) -> None:
+        self.name = name
+        self.description = description
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def samples(self) -> list[tuple[str, float]]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(f"{name} {_format(value)}" for name, value in self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, description: str) -> None:
+        super().__init__(name, description)
+        self._value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def samples(self) -> list[tuple[str, float]]:
+        return [(self.name, self._value)]
+
+
+class Gauge(_Metric):
+    """Either set explicitly or computed at scrape time from `callback`."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, description: str, callback: Callable[[], float] | None = None) -> None:
+        super().__init__(name, description)
+        self._value = 0.0
+        self._callback = callback
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    def samples(self) -> list[tuple[str, float]]:
+        return [(self.name, self._callback() if self._callback else self._value)]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, description)
+        self._buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self._buckets) + 1)  # last slot is +Inf
+        self._sum = 0.0
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._counts[bisect.bisect_left(self._buckets, value)] += 1
+            self._sum += value
+
+    def samples(self) -> list[tuple[str, float]]:
+        samples = []
+        cumulative = 0
+        for bound, count in zip(self._buckets + (float("inf"),), self._counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else _format(bound)
+            samples.append((f'{self.name}_bucket{{le="{le}"}}', cumulative))
+        samples.append((f"{self.name}_sum", self._sum))
+        samples.append((f"{self.name}_count", cumulative))
+        return samples
+
+
+def _format(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render_all() -> str:
+    return "\n".join(metric.render() for metric in _registry) + "\n"
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.cache import TTLCache
+
+
+# Below this many rows an exact count(*) is cheap and more useful than an estimate
+EXACT_COUNT_THRESHOLD = 10_000
+
+_count_cache = TTLCache(ttl_seconds=60, maxsize=1_000)
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque keyset cursor for an ORDER BY (created_at DESC, id DESC) listing."""
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+async def estimate_count(db: AsyncSession, table_name: str) -> int:
+    """Planner row estimate from pg_class — O(1), accurate to the last ANALYZE."""
+    result = await db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": table_name},
+    )
+    return result.scalar() or -1
+
+
+async def cached_count(
+    db: AsyncSession,
+    key: str,
+    count_stmt,
+) -> int:
+    """Exact count(*) shared across requests for a minute."""
+    total = _count_cache.get(key)
+    if total is None:
+        total = (await db.execute(count_stmt)).scalar() or 0
+        _count_cache.set(key, total)
+    return total
+
+
+async def table_total(
+    db: AsyncSession,
+    table_name: str,
+    count_stmt,
+    cache_key: str | None = None,
+) -> tuple[int, bool]:
+    """
+    Total for a paginated listing as (total, is_estimate). Unfiltered listings
+    of large tables use the pg_class estimate; everything else a cached count.
+    """
+    if cache_key is None:
+        estimate = await estimate_count(db, table_name)
+        if estimate >= EXACT_COUNT_THRESHOLD:
+            return estimate, True
+        cache_key = table_name
+    return await cached_count(db, cache_key, count_stmt), False
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any, Callable
+
+from loguru import logger
+
+
+class InvalidationBus:
+    """
+    In-memory publish/subscribe for cache invalidations.
+
+    Stand-in for a shared broker (Redis pub/sub, Postgres NOTIFY): messages only
+    reach subscribers in this worker process, so caches fed by it must also
+    carry a short TTL to bound staleness in the other workers. Swapping in a
+    broker only means replacing `publish` with a network send and feeding
+    received messages to `deliver`.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: dict[str, list[Callable[[Any], None]]] = defaultdict(list)
+
+    def subscribe(self, channel: str, callback: Callable[[Any], None]) -> None:
+        self._subscribers[channel].append(callback)
+
+    def publish(self, channel: str, message: Any) -> None:
+        self.deliver(channel, message)
+
+    def deliver(self, channel: str, message: Any) -> None:
+        for callback in self._subscribers.get(channel, ()):
+            try:
+                callback(message)
+            except Exception as e:
+                logger.error(f"[PubSub] Subscriber on '{channel}' failed: {e}")
+
+
+bus = InvalidationBus()
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from backend.core.config import settings
+
+
+class RateLimitStore:
+    """
+    Token buckets and expiring counters. Implementations must make each call
+    atomic; they are synchronous because every operation is a few microseconds.
+    """
+
+    def take(self, key: str, capacity: float, refill_per_second: float) -> float:
+        """Take one token. Returns 0 when allowed, else seconds until a token is available."""
+        raise NotImplementedError
+
+    def incr(self, key: str, window_seconds: float) -> int:
+        """Increment a counter that resets `window_seconds` after its first hit."""
+        raise NotImplementedError
+
+    def get(self, key: str) -> int:
+        raise NotImplementedError
+
+    def reset(self, key: str) -> None:
+        raise NotImplementedError
+
+
+def _refill(tokens: float, updated_at: float, now: float, capacity: float, rate: float) -> float:
+    return min(capacity, tokens + (now - updated_at) * rate)
+
+
+class InMemoryRateLimitStore(RateLimitStore):
+    """Per-worker store; LRU-bounded so a flood of distinct keys can't grow it without limit."""
+
+    def __init__(self, maxsize: int = 100_000) -> None:
+        self.maxsize = maxsize
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._counters: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _bound(self, data: OrderedDict, key: str) -> None:
+        data.move_to_end(key)
+        while len(data) > self.maxsize:
+            data.popitem(last=False)
+
+    def take(self, key: str, capacity: float, refill_per_second: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = _refill(tokens, updated_at, now, capacity, refill_per_second)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / refill_per_second
+            self._buckets[key] = (tokens, now)
+            self._bound(self._buckets, key)
+            return wait
+
+    def incr(self, key: str, window_seconds: float) -> int:
+        now = time.monotonic()
+        with self._lock:
+            count, expires_at = self._counters.get(key, (0, 0.0))
+            if expires_at <= now:
+                count, expires_at = 0, now + window_seconds
+            count += 1
+            self._counters[key] = (count, expires_at)
+            self._bound(self._counters, key)
+            return count
+
+    def get(self, key: str) -> int:
+        with self._lock:
+            count, expires_at = self._counters.get(key, (0, 0.0))
+            return count if expires_at > time.monotonic() else 0
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._buckets.pop(key, None)
+            self._counters.pop(key, None)
+
+
+class SQLiteRateLimitStore(RateLimitStore):
+    """
+    Host-local store shared by every worker process through one SQLite file.
+    Stand-in for a network store (e.g. Redis) on single-host deployments.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._conn = sqlite3.connect(path, timeout=1.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL, updated_at REAL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS counters (key TEXT PRIMARY KEY, count INTEGER, expires_at REAL)"
+        )
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: float, refill_per_second: float) -> float:
+        # Wall clock: monotonic clocks aren't comparable across processes
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT tokens, updated_at FROM buckets WHERE key = ?", (key,)
+                ).fetchone()
+                tokens, updated_at = row if row else (capacity, now)
+                tokens = _refill(tokens, updated_at, now, capacity, refill_per_second)
+                wait = 0.0
+                if tokens >= 1:
+                    tokens -= 1
+                else:
+                    wait = (1 - tokens) / refill_per_second
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO buckets (key, tokens, updated_at) VALUES (?, ?, ?)",
+                    (key, tokens, now),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return wait
+
+    def incr(self, key: str, window_seconds: float) -> int:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM counters WHERE key = ? AND expires_at <= ?", (key, now))
+                self._conn.execute(
+                    "INSERT INTO counters (key, count, expires_at) VALUES (?, 1, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET count = count + 1",
+                    (key, now + window_seconds),
+                )
+                count = self._conn.execute(
+                    "SELECT count FROM counters WHERE key = ?", (key,)
+                ).fetchone()[0]
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return count
+
+    def get(self, key: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT count FROM counters WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+            return row[0] if row else 0
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM buckets WHERE key = ?", (key,))
+            self._conn.execute("DELETE FROM counters WHERE key = ?", (key,))
+
+
+def _create_store() -> RateLimitStore:
+    if settings.rate_limit_backend == "sqlite":
+        return SQLiteRateLimitStore(settings.rate_limit_sqlite_path)
+    return InMemoryRateLimitStore()
+
+
+store = _create_store()
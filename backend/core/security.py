@@ -1,16 +1,52 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Optional
+from typing import Any, Callable, Optional, TypeVar
 
+from fastapi import HTTPException, status
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 
+from backend.core import metrics
 from backend.core.config import settings
 
 
+T = TypeVar("T")
+
+# Hashes made with other cost parameters still verify, and are flagged for
+# rehash on the next successful login (see verify_and_update_async): passlib
+# compares a stored hash's memory cost and parallelism with the values set
+# here, and its time cost with the min/max rounds, pinned to the same value.
 pwd_context = CryptContext(
     schemes=["argon2"],
-    deprecated="auto"
+    deprecated="auto",
+    argon2__time_cost=settings.argon2_time_cost,
+    argon2__min_rounds=settings.argon2_time_cost,
+    argon2__max_rounds=settings.argon2_time_cost,
+    argon2__memory_cost=settings.argon2_memory_cost_kib,
+    argon2__parallelism=settings.argon2_parallelism,
+)
+
+# argon2-cffi releases the GIL while hashing, so a small thread pool keeps the
+# event loop free without the memory cost of a process pool.
+_hash_pool = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers, thread_name_prefix="argon2"
+)
+
+HASH_QUEUE_DEPTH = metrics.Gauge(
+    "password_hash_pending", "Password hash/verify jobs queued or running in this worker"
 )
+HASH_QUEUE_WAIT = metrics.Histogram(
+    "password_hash_queue_wait_seconds", "Time a hash/verify job waited for a pool thread"
+)
+HASH_DURATION = metrics.Histogram(
+    "password_hash_duration_seconds", "Time spent inside argon2 per hash/verify job"
+)
+HASH_REJECTED = metrics.Counter(
+    "password_hash_rejected_total", "Hash/verify jobs shed because the queue was full"
+)
+_pending = 0
 
 
 def create_access_token(subject: str | int, expires_delta: Optional[timedelta] = None) -> str:
@@ -38,3 +74,46 @@ def get_password_hash(password: str) -> str:
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+
+async def _run_in_hash_pool(fn: Callable[..., T], *args) -> T:
+    """Run an argon2 call on the bounded pool; shed load with 503 once the queue is full."""
+    global _pending
+    if _pending >= settings.password_hash_max_pending:
+        HASH_REJECTED.inc()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in requests right now. Please try again shortly.",
+            headers={"Retry-After": "1"},
+        )
+
+    submitted = time.perf_counter()
+
+    def _timed() -> T:
+        started = time.perf_counter()
+        HASH_QUEUE_WAIT.observe(started - submitted)
+        try:
+            return fn(*args)
+        finally:
+            HASH_DURATION.observe(time.perf_counter() - started)
+
+    _pending += 1
+    HASH_QUEUE_DEPTH.set(_pending)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_pool, _timed)
+    finally:
+        _pending -= 1
+        HASH_QUEUE_DEPTH.set(_pending)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_in_hash_pool(pwd_context.hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_hash_pool(pwd_context.verify, plain_password, hashed_password)
+
+
+async def verify_and_update_async(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """(valid, new_hash) — new_hash is set when the stored hash uses outdated cost parameters."""
+    return await _run_in_hash_pool(pwd_context.verify_and_update, plain_password, hashed_password)
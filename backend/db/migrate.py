@@ -0,0 +1,140 @@
+"""
+Schema management. Workers never create or alter tables: `python -m
+backend.manage migrate` runs once per deploy and the app only checks at
+startup that the database is at the Alembic head.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from loguru import logger
+from sqlalchemy import func, inspect, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from backend.core.config import settings
+from backend.db.base import Base
+from backend.db.session import engine
+# Import models so that metadata is populated
+from backend.models import user, course, activity_log, certificate, enrollment, chat_log, embedding, upload, media_blob  # noqa: F401
+from backend.models.analytics import ANALYTICS_VIEW_DDL
+
+
+# Concurrent `migrate` runs (e.g. one per replica on deploy) queue on this
+# lock; the later ones then find the database already at head
+_MIGRATE_LOCK_KEY = 7_240_313
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+def alembic_config() -> Config:
+    return Config(str(ALEMBIC_INI))
+
+
+def head_revisions() -> set[str]:
+    return set(ScriptDirectory.from_config(alembic_config()).get_heads())
+
+
+def _current_revisions(connection: Connection) -> set[str]:
+    return set(MigrationContext.configure(connection).get_current_heads())
+
+
+def _upgrade(connection: Connection, config: Config) -> bool:
+    """Bring the schema to head on `connection`. Returns True for a fresh database."""
+    # env.py runs on this connection (and inside its transaction) when it is passed in
+    config.attributes["connection"] = connection
+
+    if _current_revisions(connection):
+        command.upgrade(config, "head")
+        return False
+
+    if "users" in inspect(connection).get_table_names():
+        raise RuntimeError(
+            "Tables exist but alembic_version is empty — run `alembic stamp <revision>` "
+            "for the revision this schema matches, then migrate again"
+        )
+
+    # The first revision alters an existing schema, so a fresh database is built
+    # from the models (plus the raw-SQL views) and stamped at head
+    Base.metadata.create_all(connection)
+    for statement in ANALYTICS_VIEW_DDL:
+        connection.exec_driver_sql(statement)
+    command.stamp(config, "head")
+    return True
+
+
+async def seed_admin(session: AsyncSession) -> None:
+    """Create the default admin if no admin exists in the database."""
+    from backend.models.user import User
+    from backend.core.security import get_password_hash
+
+    result = await session.execute(select(User).where(User.role == "admin"))
+    existing_admin = result.scalar_one_or_none()
+    if existing_admin is None:
+        admin = User(
+            email="admin@ltc.com",
+            full_name="admin",
+            hashed_password=get_password_hash("Admin@2026"),
+            role="admin",
+            status="approved",
+            is_active=True,
+            login_attempts=0,
+        )
+        session.add(admin)
+        await session.flush()
+        print("[SEED] Default admin created: admin@ltc.com")
+    else:
+        print("[SEED] Admin already exists — skipping seed.")
+
+
+async def migrate(seed: bool = True) -> None:
+    """
+    Upgrade to head (or build a fresh database), then seed, all in one
+    transaction under an advisory lock: either everything lands or nothing does.
+    """
+    from backend.services.partition_service import PartitionService
+
+    migrate_engine = create_async_engine(settings.database_url, poolclass=NullPool)
+    try:
+        async with migrate_engine.connect() as conn:
+            await conn.execute(select(func.pg_advisory_xact_lock(_MIGRATE_LOCK_KEY)))
+            fresh = await conn.run_sync(_upgrade, alembic_config())
+
+            session = AsyncSession(bind=conn, expire_on_commit=False)
+            if fresh:
+                created = await PartitionService.ensure_future_partitions(session)
+                logger.info(f"[Migrate] Built fresh schema; partitions {created}")
+            if seed:
+                await seed_admin(session)
+            await session.close()
+
+            await conn.commit()
+    finally:
+        await migrate_engine.dispose()
+
+
+async def verify_schema() -> None:
+    """
+    Startup check: one indexed read of alembic_version instead of create_all's
+    per-table introspection. Controlled by `schema_check` (error | warn | off).
+    """
+    if settings.schema_check == "off":
+        return
+    heads = head_revisions()
+    async with engine.connect() as conn:
+        current = await conn.run_sync(_current_revisions)
+    if current == heads:
+        return
+    message = (
+        f"Database schema is at {sorted(current) or 'no revision'}, expected {sorted(heads)} "
+        "— run `python -m backend.manage migrate`"
+    )
+    if settings.schema_check == "warn":
+        logger.warning(message)
+        return
+    raise RuntimeError(message)
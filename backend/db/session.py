@@ -1,15 +1,76 @@
-from sqlalchemy import select
+import time
+
+from loguru import logger
+from sqlalchemy import event, exc, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
+from backend.core import metrics
 from backend.core.config import settings
-from backend.db.base import Base
 
 
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.environment == "development",
-    future=True,
+POOL_CHECKOUT_WAIT = metrics.Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection"
+)
+POOL_CHECKOUT_TIMEOUTS = metrics.Counter(
+    "db_pool_checkout_timeouts_total", "Checkouts that gave up after db_pool_timeout_seconds"
 )
+POOL_CONNECTS = metrics.Counter(
+    "db_pool_connections_opened_total", "New DBAPI connections opened by the pool"
+)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.inc()
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
+def _connect_args() -> dict:
+    return {
+        # Sizes both SQLAlchemy's and asyncpg's prepared statement caches.
+        # Set to 0 behind PgBouncer in transaction mode.
+        "prepared_statement_cache_size": settings.db_prepared_statement_cache_size,
+        "statement_cache_size": settings.db_prepared_statement_cache_size,
+        "server_settings": {"statement_timeout": str(settings.db_statement_timeout_ms)},
+    }
+
+
+def _create_engine(url: str, metric_prefix: str):
+    engine = create_async_engine(
+        url,
+        echo=settings.db_echo,
+        future=True,
+        poolclass=TimedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args=_connect_args(),
+    )
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record) -> None:
+        POOL_CONNECTS.inc()
+
+    pool = engine.sync_engine.pool
+    metrics.Gauge(f"{metric_prefix}_size", "Configured pool size", lambda: pool.size())
+    metrics.Gauge(f"{metric_prefix}_connections_in_use", "Connections checked out of the pool", lambda: pool.checkedout())
+    metrics.Gauge(f"{metric_prefix}_connections_idle", "Connections idle in the pool", lambda: pool.checkedin())
+    metrics.Gauge(f"{metric_prefix}_overflow", "Connections open beyond pool_size", lambda: max(pool.overflow(), 0))
+    return engine
+
+
+engine = _create_engine(settings.database_url, "db_pool")
 
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -17,43 +78,72 @@ AsyncSessionLocal = async_sessionmaker(
     class_=AsyncSession,
 )
 
+# ── Read replica ──
+# Analytics, listings and exports read from the replica when one is configured
+# and it is no more than `replica_max_lag_seconds` behind; otherwise they fall
+# back to the primary.
+read_engine = (
+    _create_engine(settings.database_replica_url, "db_replica_pool")
+    if settings.database_replica_url
+    else None
+)
+
+AsyncReadSessionLocal = (
+    async_sessionmaker(read_engine, expire_on_commit=False, class_=AsyncSession)
+    if read_engine is not None
+    else AsyncSessionLocal
+)
+
+REPLICA_FALLBACKS = metrics.Counter(
+    "db_replica_fallbacks_total", "Read sessions sent to the primary because the replica lagged or failed"
+)
+
+# Replay lag in seconds; 0 when the replica has replayed everything it received
+# (an idle primary would otherwise look like ever-growing lag)
+_REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+_replica_state = {"checked_at": float("-inf"), "healthy": False}
+
+
+async def replica_is_usable() -> bool:
+    """Lag check, cached for `replica_lag_check_interval_seconds` so requests don't pay for it."""
+    if read_engine is None:
+        return False
+    now = time.monotonic()
+    if now - _replica_state["checked_at"] < settings.replica_lag_check_interval_seconds:
+        return _replica_state["healthy"]
+    _replica_state["checked_at"] = now
+    try:
+        async with read_engine.connect() as conn:
+            lag = (await conn.execute(_REPLICA_LAG_SQL)).scalar()
+        healthy = lag is not None and float(lag) <= settings.replica_max_lag_seconds
+        if not healthy:
+            logger.warning(f"[DB] Replica lag {lag}s exceeds {settings.replica_max_lag_seconds}s — reading from primary")
+    except Exception as e:
+        logger.error(f"[DB] Replica unavailable — reading from primary: {e}")
+        healthy = False
+    _replica_state["healthy"] = healthy
+    return healthy
+
+
+async def read_session() -> AsyncSession:
+    """A session on the replica when it is usable, else on the primary. Read-only use only."""
+    if await replica_is_usable():
+        return AsyncReadSessionLocal()
+    if read_engine is not None:
+        REPLICA_FALLBACKS.inc()
+    return AsyncSessionLocal()
+
 
 async def get_db() -> AsyncSession:
     async with AsyncSessionLocal() as session:
         yield session
 
 
-async def seed_admin() -> None:
-    """Create the default admin if no admin exists in the database."""
-    from backend.models.user import User
-    from backend.core.security import get_password_hash
-
-    async with AsyncSessionLocal() as session:
-        result = await session.execute(select(User).where(User.role == "admin"))
-        existing_admin = result.scalar_one_or_none()
-        if existing_admin is None:
-            admin = User(
-                email="admin@ltc.com",
-                full_name="admin",
-                hashed_password=get_password_hash("Admin@2026"),
-                role="admin",
-                status="approved",
-                is_active=True,
-                login_attempts=0,
-            )
-            session.add(admin)
-            await session.commit()
-            print("[SEED] Default admin created: admin@ltc.com")
-        else:
-            print("[SEED] Admin already exists — skipping seed.")
-
-
-async def init_db() -> None:
-    # Import models so that metadata is populated
-    from backend.models import user, course, activity_log, certificate, enrollment, chat_log  # noqa: F401
-
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-
-    # Seed the single admin account
-    await seed_admin()
+async def get_read_db() -> AsyncSession:
+    """Dependency for GET-only analytics and listing endpoints (tolerate replica lag)."""
+    async with await read_session() as session:
+        yield session
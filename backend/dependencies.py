@@ -2,6 +2,8 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.core import auth_cache
+from backend.core.auth_cache import AuthUser
 from backend.core.security import verify_token
 from backend.db.session import get_db
 from backend.models.user import User
@@ -10,10 +12,7 @@ from backend.models.user import User
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db),
-) -> User:
+def _token_user_id(token: str) -> int:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -26,11 +25,10 @@ async def get_current_user(
     user_id = payload.get("sub")
     if user_id is None:
         raise credentials_exception
+    return int(user_id)
 
-    user = await db.get(User, int(user_id))
-    if not user:
-        raise credentials_exception
 
+def _enforce_account_state(user: User | AuthUser) -> None:
     # ── Enforce approval status ──
     if user.status != "approved":
         raise HTTPException(
@@ -44,18 +42,54 @@ async def get_current_user(
             detail="Account has been deactivated.",
         )
 
+
+async def _load_user(db: AsyncSession, user_id: int) -> User:
+    user = await db.get(User, user_id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 
-async def require_role(required_roles: list[str], user: User = Depends(get_current_user)) -> User:
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """Full User row — for endpoints that read profile fields or update the user."""
+    user = await _load_user(db, _token_user_id(token))
+    auth_cache.put(user)
+    _enforce_account_state(user)
+    return user
+
+
+async def get_auth_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> AuthUser:
+    """
+    Cached auth fields only. On a cache hit no query runs (the session never
+    checks out a connection), so hot endpoints should depend on this.
+    """
+    user_id = _token_user_id(token)
+    auth_user = auth_cache.get(user_id)
+    if auth_user is None:
+        auth_user = auth_cache.put(await _load_user(db, user_id))
+    _enforce_account_state(auth_user)
+    return auth_user
+
+
+async def require_role(required_roles: list[str], user: AuthUser = Depends(get_auth_user)) -> AuthUser:
     if user.role not in required_roles:
         raise HTTPException(status_code=403, detail="Insufficient permissions")
     return user
 
 
-async def get_trainer_user(user: User = Depends(get_current_user)) -> User:
+async def get_trainer_user(user: AuthUser = Depends(get_auth_user)) -> AuthUser:
     return await require_role(["trainer", "admin"], user)
 
 
-async def get_admin_user(user: User = Depends(get_current_user)) -> User:
+async def get_admin_user(user: AuthUser = Depends(get_auth_user)) -> AuthUser:
     return await require_role(["admin"], user)
@@ -1,12 +1,23 @@
 import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import PlainTextResponse
 from backend.routes import certificates
 
+from backend.core import background, metrics
 from backend.core.config import settings
+from backend.core.media_response import MediaStaticFiles
 from backend.core.logging_config import configure_logging
-from backend.db.session import init_db
+from backend.db.migrate import verify_schema
+from backend.services.activity_sink import ActivitySink
+from backend.services.analytics_service import AnalyticsService
+from backend.services.certificate_service import CertificateService
+from backend.services.file_service import FileService
+from backend.services.media_store import MediaStore
+from backend.services.partition_service import PartitionService
+from backend.services.resumable_upload_service import ResumableUploadService
+from backend.services.transcode_service import TranscodeService
+from backend.services.warmup_service import WarmupService
 from backend.routes import admin, auth, courses, learning, trainer, uploads, chat, media
 
 
@@ -31,6 +42,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # -----------------------------
@@ -42,7 +54,8 @@ app.add_middleware(
 # uploads/pdfs/...
 # at URL:
 # http://localhost:8000/media/...
-app.mount("/media", StaticFiles(directory="backend/uploads"), name="media")
+# with byte-range (seeking) and ETag support
+app.mount("/media", MediaStaticFiles(directory="backend/uploads"), name="media")
 
 
 # -----------------------------
@@ -50,7 +63,43 @@ app.mount("/media", StaticFiles(directory="backend/uploads"), name="media")
 # -----------------------------
 @app.on_event("startup")
 async def on_startup() -> None:
-    await init_db()
+    await verify_schema()
+    ActivitySink.start()
+    TranscodeService.start()
+    background.run_periodically(
+        "log-partitions",
+        settings.partition_maintenance_interval_seconds,
+        PartitionService.run_maintenance,
+    )
+    background.run_periodically(
+        "expire-uploads",
+        3_600,
+        ResumableUploadService.expire_stale,
+        initial_delay_seconds=60,
+    )
+    background.run_periodically(
+        "media-gc",
+        3_600,
+        MediaStore.collect_garbage,
+        initial_delay_seconds=120,
+    )
+    background.run_periodically(
+        "analytics-rollups",
+        settings.analytics_refresh_interval_seconds,
+        AnalyticsService.refresh_rollups,
+    )
+    if settings.warmup_on_startup:
+        # Kept on app.state so the task isn't garbage-collected mid-run
+        app.state.warmup_task = asyncio.create_task(WarmupService.run())
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    await background.stop_all()
+    await TranscodeService.stop()
+    await ActivitySink.stop()
+    await FileService.aclose()
+    await CertificateService.shutdown()
 
 
 @app.get("/health", tags=["health"])
@@ -58,6 +107,12 @@ async def health_check() -> dict:
     return {"status": "ok", "environment": settings.environment}
 
 
+@app.get("/metrics", tags=["health"], response_class=PlainTextResponse)
+async def metrics_endpoint() -> str:
+    """Prometheus scrape target (pool, queue and worker metrics for this process)."""
+    return metrics.render_all()
+
+
 # -----------------------------
 # ROUTERS
 # -----------------------------
@@ -0,0 +1,76 @@
+"""
+Operational commands, run from the repository root:
+
+    python -m backend.manage migrate
+    python -m backend.manage rerender-certificates --workers 8
+    python -m backend.manage export activities --out ./exports --format parquet
+"""
+import argparse
+import asyncio
+from datetime import datetime
+
+
+def _migrate(args: argparse.Namespace) -> None:
+    from backend.db.migrate import migrate
+
+    asyncio.run(migrate(seed=not args.no_seed))
+
+
+def _export(args: argparse.Namespace) -> None:
+    from backend.services.export_service import ExportService
+
+    columns = [c.strip() for c in args.columns.split(",")] if args.columns else None
+    paths = asyncio.run(
+        ExportService.write_partitioned(
+            args.export_type,
+            args.out,
+            fmt=args.format,
+            start=args.start,
+            end=args.end,
+            columns=columns,
+        )
+    )
+    for path in paths:
+        print(path)
+
+
+def _rerender_certificates(args: argparse.Namespace) -> None:
+    from backend.services.certificate_service import CertificateService
+
+    rendered, failed = asyncio.run(CertificateService.rerender_all(workers=args.workers))
+    print(f"{rendered} certificates rendered, {failed} failed")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m backend.manage")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate = commands.add_parser(
+        "migrate", help="Upgrade the schema to the Alembic head and seed the admin account"
+    )
+    migrate.add_argument("--no-seed", action="store_true", help="Skip seeding the admin account")
+    migrate.set_defaults(func=_migrate)
+
+    export = commands.add_parser(
+        "export", help="Write a month-partitioned Parquet/Arrow dataset of a table"
+    )
+    export.add_argument("export_type", help="users | courses | activities | lesson_progress | chat_logs")
+    export.add_argument("--out", required=True, help="Output directory")
+    export.add_argument("--format", choices=["parquet", "arrow"], default="parquet")
+    export.add_argument("--columns", help="Comma-separated column keys to include")
+    export.add_argument("--start", type=datetime.fromisoformat, help="ISO date/time, inclusive")
+    export.add_argument("--end", type=datetime.fromisoformat, help="ISO date/time, exclusive")
+    export.set_defaults(func=_export)
+
+    rerender = commands.add_parser(
+        "rerender-certificates", help="Regenerate every certificate PDF (after a template change)"
+    )
+    rerender.add_argument("--workers", type=int, help="Render processes (default: CPU count)")
+    rerender.set_defaults(func=_rerender_certificates)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import String, Integer, ForeignKey, DateTime, Text
+from sqlalchemy import String, Integer, ForeignKey, DateTime, Text, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from backend.db.base import Base
@@ -8,8 +8,15 @@ from backend.db.base import Base
 
 class ActivityLog(Base):
     __tablename__ = "activity_logs"
+    # Range-partitioned by month on created_at (see PartitionService), so the
+    # partition key has to be part of the primary key.
+    __table_args__ = (
+        Index("ix_activity_logs_created_at_id", "created_at", "id"),
+        Index("ix_activity_logs_user_created", "user_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, index=True)
     user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id"), nullable=True)
     action: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
     detail: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -18,6 +25,7 @@ class ActivityLog(Base):
     )
     ip_address: Mapped[str | None] = mapped_column(String(50), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow, index=True
+        DateTime(timezone=True), primary_key=True, default=datetime.utcnow,
+        server_default=func.now(), index=True
     )
     user: Mapped["User"] = relationship("User", back_populates="activity_logs")
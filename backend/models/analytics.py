@@ -0,0 +1,88 @@
+from sqlalchemy import Column, Date, Float, Integer, MetaData, String, Table
+
+
+# Materialized views created by Alembic (see the analytics_materialized_views
+# revision). They live on their own MetaData so create_all never tries to
+# create them as tables.
+analytics_metadata = MetaData()
+
+ANALYTICS_VIEWS = (
+    "mv_course_completion",
+    "mv_lesson_difficulty",
+    "mv_enrollment_monthly",
+)
+
+
+course_completion_mv = Table(
+    "mv_course_completion",
+    analytics_metadata,
+    Column("course_id", Integer, primary_key=True),
+    Column("title", String(255)),
+    Column("created_by_id", Integer),
+    Column("avg_completion", Float),
+    Column("students", Integer),
+)
+
+lesson_difficulty_mv = Table(
+    "mv_lesson_difficulty",
+    analytics_metadata,
+    Column("lesson_id", Integer, primary_key=True),
+    Column("title", String(255)),
+    Column("avg_completion", Float),
+    Column("attempts", Integer),
+)
+
+enrollment_monthly_mv = Table(
+    "mv_enrollment_monthly",
+    analytics_metadata,
+    Column("course_id", Integer, primary_key=True),
+    Column("month", Date, primary_key=True),
+    Column("enrollments", Integer),
+)
+
+
+# The current view definitions, for databases built from the models by
+# `manage migrate` rather than by replaying revisions. Revisions keep their
+# own frozen copy: a change here needs a new revision that drops and
+# recreates the view with the new definition. Each view needs a unique index
+# so it can be refreshed CONCURRENTLY.
+ANALYTICS_VIEW_DDL = (
+    """
+    CREATE MATERIALIZED VIEW mv_course_completion AS
+    SELECT c.id AS course_id,
+           c.title,
+           c.created_by_id,
+           coalesce(avg(lp.completion_percentage), 0)::float AS avg_completion,
+           count(DISTINCT lp.user_id) AS students
+    FROM courses c
+    LEFT JOIN modules m ON m.course_id = c.id
+    LEFT JOIN lessons l ON l.module_id = m.id
+    LEFT JOIN lesson_progress lp ON lp.lesson_id = l.id
+    GROUP BY c.id, c.title, c.created_by_id
+    """,
+    "CREATE UNIQUE INDEX ux_mv_course_completion_course ON mv_course_completion (course_id)",
+    "CREATE INDEX ix_mv_course_completion_created_by ON mv_course_completion (created_by_id)",
+    """
+    CREATE MATERIALIZED VIEW mv_lesson_difficulty AS
+    SELECT l.id AS lesson_id,
+           l.title,
+           avg(lp.completion_percentage)::float AS avg_completion,
+           count(lp.id) AS attempts
+    FROM lessons l
+    JOIN lesson_progress lp ON lp.lesson_id = l.id
+    GROUP BY l.id, l.title
+    """,
+    "CREATE UNIQUE INDEX ux_mv_lesson_difficulty_lesson ON mv_lesson_difficulty (lesson_id)",
+    "CREATE INDEX ix_mv_lesson_difficulty_avg ON mv_lesson_difficulty (avg_completion)",
+    """
+    CREATE MATERIALIZED VIEW mv_enrollment_monthly AS
+    SELECT course_id,
+           date_trunc('month', enrolled_at)::date AS month,
+           count(*) AS enrollments
+    FROM enrollments
+    WHERE enrolled_at IS NOT NULL
+    GROUP BY course_id, date_trunc('month', enrolled_at)::date
+    """,
+    "CREATE UNIQUE INDEX ux_mv_enrollment_monthly_course_month ON mv_enrollment_monthly (course_id, month)",
+    "CREATE INDEX ix_mv_enrollment_monthly_month ON mv_enrollment_monthly (month)",
+)
@@ -1,7 +1,7 @@
 from datetime import datetime
 import uuid
 
-from sqlalchemy import String, Integer, ForeignKey, DateTime, Text, Boolean, Float
+from sqlalchemy import String, Integer, ForeignKey, DateTime, Text, Boolean, Float, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.db.base import Base
@@ -13,6 +13,15 @@ def _generate_verification_id() -> str:
 
 class Certificate(Base):
     __tablename__ = "certificates"
+    __table_args__ = (
+        Index("ix_certificates_issued_at_id", "issued_at", "id"),
+        # Covers the public verification lookup, so it is an index-only scan
+        Index(
+            "ix_certificates_verification_covering",
+            "verification_id",
+            postgresql_include=["revoked", "student_name", "course_title", "ai_mastery_score", "issued_at"],
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
 
@@ -33,6 +42,11 @@ class Certificate(Base):
         default=_generate_verification_id,
     )
 
+    # Names as printed on the certificate, copied at issuance
+    student_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
+
+    course_title: Mapped[str | None] = mapped_column(String(255), nullable=True)
+
     ai_mastery_score: Mapped[float | None] = mapped_column(Float, nullable=True)
 
     issued_at: Mapped[datetime] = mapped_column(
@@ -40,4 +54,13 @@ class Certificate(Base):
         default=datetime.utcnow,
     )
 
-    revoked: Mapped[bool] = mapped_column(Boolean, default=False)
\ No newline at end of file
+    revoked: Mapped[bool] = mapped_column(Boolean, default=False)
+
+    # PDF rendering happens after issuance: pending | ready | failed
+    pdf_status: Mapped[str] = mapped_column(
+        String(20), nullable=False, default="pending", server_default="pending"
+    )
+
+    pdf_rendered_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
\ No newline at end of file
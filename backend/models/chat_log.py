@@ -1,20 +1,27 @@
 from __future__ import annotations
 
 import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Index, Integer, String, DateTime, ForeignKey, Text, func
 from sqlalchemy.orm import relationship
 from backend.db.base import Base
 
 
 class ChatLog(Base):
     __tablename__ = "chat_logs"
+    # Range-partitioned by month on created_at (see PartitionService)
+    __table_args__ = (
+        Index("ix_chat_logs_user_created", "user_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     role = Column(String, nullable=False)  # "admin", "trainer", "student"
     message = Column(Text, nullable=False)
     response = Column(Text, nullable=False)
     mode = Column(String, default="internal")  # "internal" or "external"
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    created_at = Column(
+        DateTime, primary_key=True, default=datetime.datetime.utcnow, server_default=func.now()
+    )
 
     user = relationship("User", back_populates="chat_logs")
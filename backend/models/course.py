@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List
 
-from sqlalchemy import String, ForeignKey, DateTime, Text, Integer, Boolean
+from sqlalchemy import String, ForeignKey, DateTime, Text, Integer, Boolean, UniqueConstraint, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from backend.db.base import Base
@@ -61,6 +61,15 @@ class Module(Base):
 
 class Lesson(Base):
     __tablename__ = "lessons"
+    __table_args__ = (
+        # Transcode queue lookups only ever touch the few unfinished jobs
+        Index(
+            "ix_lessons_hls_pending",
+            "hls_status",
+            "id",
+            postgresql_where=text("hls_status IN ('queued', 'processing')"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     module_id: Mapped[int] = mapped_column(
@@ -76,6 +85,13 @@ class Lesson(Base):
     audio_path: Mapped[str | None] = mapped_column(Text, nullable=True)
     pdf_path: Mapped[str | None] = mapped_column(Text, nullable=True)
 
+    # ===== HLS (ADAPTIVE BITRATE) =====
+    # queued → processing → ready | failed; NULL when never transcoded
+    hls_status: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    hls_progress: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    hls_path: Mapped[str | None] = mapped_column(Text, nullable=True)
+    hls_updated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
     # ===== AI / EXTRA FIELDS =====
     transcript: Mapped[str | None] = mapped_column(Text, nullable=True)
     cleaned_transcript: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -108,6 +124,9 @@ class Lesson(Base):
 
 class LessonProgress(Base):
     __tablename__ = "lesson_progress"
+    __table_args__ = (
+        UniqueConstraint("user_id", "lesson_id", name="uq_lesson_progress_user_lesson"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
@@ -17,4 +17,5 @@ class LessonChunk(Base):
     chunk_id: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
     content: Mapped[str] = mapped_column(Text, nullable=False)
     order_index: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
-
+    # Source content hash: a duplicate upload copies these chunks' embeddings
+    content_sha256: Mapped[str | None] = mapped_column(String(64), index=True, nullable=True)
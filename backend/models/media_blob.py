@@ -0,0 +1,43 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, String, DateTime, Text, Integer, Index, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.db.base import Base
+
+
+class MediaBlob(Base):
+    """
+    One stored file per distinct content (SHA-256), shared by every lesson
+    that uploads the same bytes. `ref_count` counts lesson columns pointing
+    at `stored_path`; unreferenced blobs are garbage-collected.
+
+    The knowledge-pipeline output is kept here too, so a duplicate upload
+    reuses it instead of re-running transcription and the LLM agents.
+    """
+
+    __tablename__ = "media_blobs"
+    __table_args__ = (
+        Index("ix_media_blobs_unreferenced", "updated_at", postgresql_where=text("ref_count <= 0")),
+    )
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    stored_path: Mapped[str] = mapped_column(Text, unique=True, nullable=False)
+    category: Mapped[str] = mapped_column(String(20), nullable=False)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    ref_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    # ===== PIPELINE RESULTS (keyed by content) =====
+    pipeline_status: Mapped[str | None] = mapped_column(String(20), nullable=True)  # completed | failed
+    transcript: Mapped[str | None] = mapped_column(Text, nullable=True)
+    cleaned_transcript: Mapped[str | None] = mapped_column(Text, nullable=True)
+    summary: Mapped[str | None] = mapped_column(Text, nullable=True)
+    key_takeaways: Mapped[str | None] = mapped_column(Text, nullable=True)
+    concepts: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow
+    )
@@ -0,0 +1,43 @@
+from datetime import datetime
+import uuid
+
+from sqlalchemy import BigInteger, String, ForeignKey, DateTime, Text, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.db.base import Base
+
+
+def _generate_upload_id() -> str:
+    return uuid.uuid4().hex
+
+
+class UploadSession(Base):
+    """
+    A resumable upload in progress. Bytes land in a partial file at
+    `offset`; the row is the shared source of truth across workers.
+    """
+
+    __tablename__ = "upload_sessions"
+    __table_args__ = (
+        Index("ix_upload_sessions_status_updated", "status", "updated_at"),
+    )
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True, default=_generate_upload_id)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    lesson_id: Mapped[int] = mapped_column(ForeignKey("lessons.id"), nullable=False)
+
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    category: Mapped[str] = mapped_column(String(20), nullable=False)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    offset: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="open")  # open | finalizing | completed
+    sha256: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    stored_path: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow
+    )
@@ -1,6 +1,6 @@
-from datetime import datetime
+from datetime import date, datetime
 
-from sqlalchemy import String, Boolean, DateTime, Integer
+from sqlalchemy import String, Boolean, Date, DateTime, Index, Integer
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.orm import relationship
 
@@ -10,6 +10,9 @@ from backend.db.base import Base
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     email: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
@@ -18,8 +21,10 @@ class User(Base):
     role: Mapped[str] = mapped_column(String(50), nullable=False, default="learner")
     status: Mapped[str] = mapped_column(String(20), nullable=False, default="pending")  # pending | approved | revoked
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
-    login_attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    login_attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)  # failures that led to the last lockout
+    locked_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     current_streak: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_active_date: Mapped[date | None] = mapped_column(Date, nullable=True)  # local date in settings.streak_timezone
     activity_logs: Mapped[list["ActivityLog"]] = relationship("ActivityLog", back_populates="user")
     chat_logs: Mapped[list["ChatLog"]] = relationship("ChatLog", back_populates="user", cascade="all, delete-orphan")
     enrollments: Mapped[list["Enrollment"]] = relationship("Enrollment", back_populates="user", cascade="all, delete-orphan")
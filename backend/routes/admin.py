@@ -1,27 +1,27 @@
 from __future__ import annotations
 
-import csv
-import io
+from datetime import datetime
 
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, BackgroundTasks, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import Request
+from fastapi import Request, Response
 
 
-from backend.db.session import get_db
+from backend.db.session import get_db, get_read_db
+from backend.core.auth_cache import AuthUser
 from backend.dependencies import get_admin_user
-from backend.models.user import User
 from backend.models.course import Course, Module, Lesson
-from backend.models.activity_log import ActivityLog
 from backend.core.config import settings
 from backend.services.admin_service import AdminService
 from backend.services.activity_log_service import ActivityLogService
 from backend.services.analytics_service import AnalyticsService
 from backend.services.certificate_service import CertificateService
-from backend.services.file_service import FileService
+from backend.services.export_service import EXPORT_FORMATS, ExportService
+from backend.services.media_store import MediaStore
 from backend.services.knowledge_pipeline_service import KnowledgePipelineService
+from backend.services.transcode_service import TranscodeService
 from backend.schemas.admin import (
     AdminStats,
     PaginatedUsers,
@@ -37,7 +37,7 @@ router = APIRouter(dependencies=[Depends(get_admin_user)])
 
 # ━━━━━━━━━━━━━━━━━━━━ Dashboard Stats ━━━━━━━━━━━━━━━━━━━━
 @router.get("/stats", response_model=AdminStats)
-async def get_stats(db: AsyncSession = Depends(get_db)):
+async def get_stats(db: AsyncSession = Depends(get_read_db)):
     return await AdminService.get_stats(db)
 
 
@@ -47,9 +47,10 @@ async def list_users(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     role: str | None = Query(None),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
     db: AsyncSession = Depends(get_db),
 ):
-    return await AdminService.list_users(db, page, page_size, role)
+    return await AdminService.list_users(db, page, page_size, role, cursor)
 
 
 @router.post("/users/{user_id}/toggle-active")
@@ -65,7 +66,7 @@ async def reset_user_password(
 
 
 @router.get("/users/{user_id}/activity")
-async def get_user_activity(user_id: int, db: AsyncSession = Depends(get_db)):
+async def get_user_activity(user_id: int, db: AsyncSession = Depends(get_read_db)):
     return await ActivityLogService.get_user_activity(db, user_id)
 
 
@@ -73,7 +74,7 @@ async def get_user_activity(user_id: int, db: AsyncSession = Depends(get_db)):
 @router.post("/users/{user_id}/approve")
 async def approve_user(
     user_id: int,
-    admin: User = Depends(get_admin_user),
+    admin: AuthUser = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     return await AdminService.approve_user(db, user_id, admin.id)
@@ -82,7 +83,7 @@ async def approve_user(
 @router.post("/users/{user_id}/revoke")
 async def revoke_user(
     user_id: int,
-    admin: User = Depends(get_admin_user),
+    admin: AuthUser = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     return await AdminService.revoke_user(db, user_id, admin.id)
@@ -92,7 +93,7 @@ async def revoke_user(
 async def change_user_role(
     user_id: int,
     payload: ChangeRoleRequest,
-    admin: User = Depends(get_admin_user),
+    admin: AuthUser = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     return await AdminService.change_user_role(db, user_id, payload.role, admin.id)
@@ -101,29 +102,36 @@ async def change_user_role(
 # ━━━━━━━━━━━━━━━━━━━━ Activity Log ━━━━━━━━━━━━━━━━━━━━━━━
 @router.get("/activities")
 async def list_activities(
-    limit: int = Query(50, ge=1, le=200), db: AsyncSession = Depends(get_db)
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None, description="X-Next-Cursor from the previous page"),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    return await ActivityLogService.get_recent(db, limit)
+    # Body stays a plain list for existing clients; the cursor travels in a header
+    items, next_cursor = await ActivityLogService.get_recent_page(db, limit, cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
 
 
 # ━━━━━━━━━━━━━━━━━━━━ Analytics ━━━━━━━━━━━━━━━━━━━━━━━━━━
 @router.get("/analytics/completion")
-async def analytics_completion(db: AsyncSession = Depends(get_db)):
+async def analytics_completion(db: AsyncSession = Depends(get_read_db)):
     return await AnalyticsService.get_course_completion_rates(db)
 
 
 @router.get("/analytics/difficult-topics")
-async def analytics_difficult_topics(db: AsyncSession = Depends(get_db)):
+async def analytics_difficult_topics(db: AsyncSession = Depends(get_read_db)):
     return await AnalyticsService.get_difficult_topics(db)
 
 
 @router.get("/analytics/enrollment-trend")
-async def analytics_enrollment_trend(db: AsyncSession = Depends(get_db)):
+async def analytics_enrollment_trend(db: AsyncSession = Depends(get_read_db)):
     return await AnalyticsService.get_enrollment_trend(db)
 
 
 @router.get("/analytics/registrations")
-async def analytics_registrations(db: AsyncSession = Depends(get_db)):
+async def analytics_registrations(db: AsyncSession = Depends(get_read_db)):
     return await AnalyticsService.get_recent_registrations(db)
 
 
@@ -132,9 +140,10 @@ async def analytics_registrations(db: AsyncSession = Depends(get_db)):
 async def list_certificates(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
     db: AsyncSession = Depends(get_db),
 ):
-    return await CertificateService.list_certificates(db, page, page_size)
+    return await CertificateService.list_certificates(db, page, page_size, cursor)
 
 
 @router.post("/certificates/{cert_id}/revoke")
@@ -144,7 +153,7 @@ async def revoke_certificate(cert_id: int, db: AsyncSession = Depends(get_db)):
 
 # ━━━━━━━━━━━━━━━━━━━━ Course CRUD ━━━━━━━━━━━━━━━━━━━━━━━━
 @router.get("/courses")
-async def list_courses(db: AsyncSession = Depends(get_db)):
+async def list_courses(db: AsyncSession = Depends(get_read_db)):
     from sqlalchemy.orm import selectinload
     stmt = (
         select(Course)
@@ -193,15 +202,14 @@ async def list_courses(db: AsyncSession = Depends(get_db)):
 @router.post("/courses")
 async def create_course(
     payload: CourseCreateAdmin,
-    admin: User = Depends(get_admin_user),
+    admin: AuthUser = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     course = Course(title=payload.title, description=payload.description, created_by_id=admin.id)
     db.add(course)
     await db.commit()
     await db.refresh(course)
-    db.add(ActivityLog(user_id=admin.id, action="course_created", detail=course.title, related_course_id=course.id))
-    await db.commit()
+    await ActivityLogService.log_activity(db, admin.id, "course_created", course.title, course.id)
     return {"id": course.id, "title": course.title}
 
 
@@ -226,6 +234,7 @@ async def delete_course(course_id: int, db: AsyncSession = Depends(get_db)):
     course = await db.get(Course, course_id)
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
+    await MediaStore.release_course(db, course_id)
     await db.delete(course)
     await db.commit()
     return {"status": "deleted", "id": course_id}
@@ -235,7 +244,7 @@ async def delete_course(course_id: int, db: AsyncSession = Depends(get_db)):
 async def create_module(
     course_id: int,
     payload: ModuleCreateAdmin,
-    admin: User = Depends(get_admin_user),
+    admin: AuthUser = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     course = await db.get(Course, course_id)
@@ -245,8 +254,7 @@ async def create_module(
     db.add(module)
     await db.commit()
     await db.refresh(module)
-    db.add(ActivityLog(user_id=admin.id, action="module_created", detail=module.title, related_course_id=course_id))
-    await db.commit()
+    await ActivityLogService.log_activity(db, admin.id, "module_created", module.title, course_id)
     return {"id": module.id, "title": module.title, "course_id": course_id}
 
 
@@ -257,7 +265,7 @@ async def upload_module_video(
     background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     request: Request = None, 
-    admin: User = Depends(get_admin_user),
+    admin: AuthUser = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     if request:
@@ -275,21 +283,16 @@ async def upload_module_video(
         await db.commit()
         await db.refresh(lesson)
 
-    file_path = await FileService.save_upload_file(
-        file=file,
-        category="videos"
-    )
-    lesson.video_path = file_path
+    blob = await MediaStore.ingest_upload(db, file, "videos")
+    file_path = blob.stored_path
+    await MediaStore.attach(db, lesson, "video_path", blob)
     lesson.transcript_status = "processing"
     await db.commit()
 
-    db.add(ActivityLog(
-        user_id=admin.id,
-        action="video_uploaded",
-        detail=f"Video uploaded for module: {module.title}",
-        related_course_id=module.course_id,
-    ))
-    await db.commit()
+    await ActivityLogService.log_activity(
+        db, admin.id, "video_uploaded", f"Video uploaded for module: {module.title}", module.course_id
+    )
+    await TranscodeService.enqueue(lesson.id)
 
     # Trigger async transcript generation
     background_tasks.add_task(KnowledgePipelineService.process_lesson_recording, lesson.id, file_path)
@@ -303,7 +306,7 @@ async def upload_module_pdf(
     background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     request: Request = None, 
-    admin: User = Depends(get_admin_user),
+    admin: AuthUser = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     if request:
@@ -312,10 +315,8 @@ async def upload_module_pdf(
     if not module:
         raise HTTPException(status_code=404, detail="Module not found")
 
-    file_path = await FileService.save_upload_file(
-        file=file,
-        category="pdfs"
-    )
+    blob = await MediaStore.ingest_upload(db, file, "pdfs")
+    file_path = blob.stored_path
 
     # Store PDF url on the lesson
     result = await db.execute(select(Lesson).where(Lesson.module_id == module_id).limit(1))
@@ -326,17 +327,13 @@ async def upload_module_pdf(
         await db.commit()
         await db.refresh(lesson)
 
-    lesson.pdf_path = file_path
+    await MediaStore.attach(db, lesson, "pdf_path", blob)
     lesson.transcript_status = "processing"
     await db.commit()
 
-    db.add(ActivityLog(
-        user_id=admin.id,
-        action="pdf_uploaded",
-        detail=f"PDF uploaded for module: {module.title}",
-        related_course_id=module.course_id,
-    ))
-    await db.commit()
+    await ActivityLogService.log_activity(
+        db, admin.id, "pdf_uploaded", f"PDF uploaded for module: {module.title}", module.course_id
+    )
 
     # Trigger async PDF processing (text extraction + AI pipeline)
     background_tasks.add_task(KnowledgePipelineService.process_lesson_recording, lesson.id, file_path)
@@ -348,7 +345,7 @@ async def upload_module_pdf(
 @router.post("/courses/{course_id}/publish")
 async def publish_course(
     course_id: int,
-    admin: User = Depends(get_admin_user),
+    admin: AuthUser = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Validates every module has at least 1 video AND 1 PDF before publishing."""
@@ -381,51 +378,37 @@ async def publish_course(
     course.is_published = True
     await db.commit()
 
-    db.add(ActivityLog(
-        user_id=admin.id,
-        action="course_published",
-        detail=f"Course '{course.title}' published",
-        related_course_id=course.id,
-    ))
-    await db.commit()
+    await ActivityLogService.log_activity(
+        db, admin.id, "course_published", f"Course '{course.title}' published", course.id
+    )
 
     return {"status": "published", "course_id": course_id, "title": course.title}
 
 
 # ━━━━━━━━━━━━━━━━━━━━ Export ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 @router.get("/export/{export_type}")
-async def export_report(export_type: str, db: AsyncSession = Depends(get_db)):
-    """Export CSV: users | courses | activities"""
-    output = io.StringIO()
-    writer = csv.writer(output)
-
-    if export_type == "users":
-        writer.writerow(["ID", "Name", "Email", "Role", "Status", "Active", "Last Login", "Joined"])
-        users = (await db.execute(select(User).order_by(User.id))).scalars().all()
-        for u in users:
-            writer.writerow([
-                u.id, u.full_name, u.email, u.role, u.status, u.is_active,
-                u.last_login.isoformat() if u.last_login else "",
-                u.created_at.isoformat() if u.created_at else "",
-            ])
-    elif export_type == "courses":
-        writer.writerow(["ID", "Title", "Description", "Published", "Created By", "Created At"])
-        courses = (await db.execute(select(Course).order_by(Course.id))).scalars().all()
-        for c in courses:
-            writer.writerow([c.id, c.title, c.description or "", c.is_published, c.created_by_id, c.created_at.isoformat() if c.created_at else ""])
-    elif export_type == "activities":
-        writer.writerow(["ID", "Action", "Detail", "Course ID", "Timestamp"])
-        activities = (
-            await db.execute(select(ActivityLog).order_by(ActivityLog.created_at.desc()).limit(500))
-        ).scalars().all()
-        for a in activities:
-            writer.writerow([a.id, a.action, a.detail or "", a.related_course_id or "", a.created_at.isoformat() if a.created_at else ""])
-    else:
-        raise HTTPException(status_code=400, detail="Invalid export type. Use: users, courses, activities")
-
-    output.seek(0)
+async def export_report(
+    export_type: str,
+    format: str = Query("csv", pattern="^(csv|parquet|arrow)$"),
+    columns: str | None = Query(None, description="Comma-separated column keys to include, e.g. id,action,created_at"),
+    start: datetime | None = Query(None, description="Only rows created at or after this time"),
+    end: datetime | None = Query(None, description="Only rows created before this time"),
+    gzip: bool = Query(False, description="Gzip the CSV body (Content-Encoding: gzip)"),
+):
+    """
+    Export users | courses | activities | lesson_progress | chat_logs — streamed, uncapped.
+    format=parquet|arrow writes typed columnar data in row-group batches.
+    """
+    column_keys = [c.strip() for c in columns.split(",") if c.strip()] if columns else None
+    ExportService.validate(export_type, format, column_keys)
+
+    media_type, ext = EXPORT_FORMATS[format]
+    headers = {"Content-Disposition": f"attachment; filename={export_type}_report.{ext}"}
+    gzip = gzip and format == "csv"  # columnar formats are compressed internally
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
     return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv",
-        headers={"Content-Disposition": f"attachment; filename={export_type}_report.csv"},
+        ExportService.stream(export_type, format, start, end, column_keys, gzip=gzip),
+        media_type=media_type,
+        headers=headers,
     )
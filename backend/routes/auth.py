@@ -6,6 +6,7 @@ from backend.db.session import get_db
 from backend.schemas.user import UserCreate, UserOut, Token, ChangePassword, ProfileUpdate
 from backend.services.auth_service import AuthService
 from backend.services.activity_log_service import ActivityLogService
+from backend.services.login_guard import client_ip
 from backend.dependencies import get_current_user
 from backend.models.user import User
 
@@ -24,8 +25,9 @@ async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: AsyncSession = Depends(get_db),
 ) -> Token:
-    ip = request.client.host if request.client else None
-    return await AuthService.login(db, form_data.username, form_data.password, ip_address=ip)
+    return await AuthService.login(
+        db, form_data.username, form_data.password, ip_address=client_ip(request)
+    )
 
 
 @router.get("/me", response_model=UserOut)
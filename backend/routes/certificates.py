@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
+from backend.core.auth_cache import AuthUser
+from backend.core.media_response import MediaFileResponse
 from backend.db.session import get_db
+from backend.dependencies import get_auth_user
 from backend.models.certificate import Certificate
-from backend.models.user import User
-from backend.models.course import Course
+from backend.services.certificate_service import CertificateService
 
 router = APIRouter()
 
@@ -17,36 +18,58 @@ router = APIRouter()
 @router.get("/verify/{verification_id}")
 async def verify_certificate(
     verification_id: str,
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
 
-    stmt = (
-        select(Certificate, User.full_name, Course.title)
-        .join(User, User.id == Certificate.user_id)
-        .join(Course, Course.id == Certificate.course_id)
-        .where(Certificate.verification_id == verification_id)
+    # Misses read the primary: a lagging replica could still show a just
+    # revoked certificate as valid, and that answer would then be cached
+    result = await CertificateService.verify(db, verification_id)
+
+    headers = {
+        "Cache-Control": f"public, max-age={result.max_age}",
+        "ETag": result.etag,
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and result.etag in {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}:
+        return Response(status_code=304, headers=headers)
+
+    return Response(
+        content=result.body,
+        status_code=result.status_code,
+        media_type="application/json",
+        headers=headers,
     )
 
-    result = await db.execute(stmt)
-    row = result.first()
-
-    if not row:
-        raise HTTPException(status_code=404, detail="Invalid certificate")
-
-    cert, student_name, course_title = row
-
-    if cert.revoked:
-        return {
-            "valid": False,
-            "reason": "Certificate revoked",
-            "verification_id": verification_id,
-        }
-
-    return {
-        "valid": True,
-        "verification_id": cert.verification_id,
-        "student_name": student_name,
-        "course_title": course_title,
-        "ai_mastery_score": cert.ai_mastery_score,
-        "issued_at": cert.issued_at,
-    }
\ No newline at end of file
+
+# =========================================================
+# 📄 CERTIFICATE PDF DOWNLOAD (OWNER OR ADMIN)
+# =========================================================
+
+@router.get("/{cert_id}/pdf")
+async def download_certificate(
+    cert_id: int,
+    current_user: AuthUser = Depends(get_auth_user),
+    db: AsyncSession = Depends(get_db),
+):
+
+    cert = await db.get(Certificate, cert_id)
+
+    if not cert or (cert.user_id != current_user.id and current_user.role != "admin"):
+        raise HTTPException(status_code=404, detail="Certificate not found")
+
+    if cert.revoked and current_user.role != "admin":
+        raise HTTPException(status_code=410, detail="Certificate revoked")
+
+    # Rollback expires the instance, so keep plain values for after it
+    verification_id, pdf_status = cert.verification_id, cert.pdf_status
+
+    # Release the connection before a possible render on the pool
+    await db.rollback()
+    path = await CertificateService.ensure_pdf(cert_id, verification_id, pdf_status)
+
+    return MediaFileResponse(
+        path,
+        media_type="application/pdf",
+        headers={"Content-Disposition": f'attachment; filename="certificate_{verification_id}.pdf"'},
+    )
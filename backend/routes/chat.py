@@ -5,7 +5,8 @@ from pydantic import BaseModel
 from backend.db.session import get_db
 from backend.models.user import User
 from backend.services.chat_service import ChatService
-from backend.dependencies import get_current_user
+from backend.core.auth_cache import AuthUser
+from backend.dependencies import get_auth_user, get_current_user
 
 router = APIRouter()
 
@@ -27,7 +28,7 @@ async def chat_message(
 
 @router.get("/history")
 async def chat_history(
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_auth_user),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -4,9 +4,8 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.db.session import get_db
-from backend.dependencies import get_current_user, get_trainer_user
-from backend.models.activity_log import ActivityLog
-from backend.models.user import User
+from backend.core.auth_cache import AuthUser
+from backend.dependencies import get_auth_user, get_trainer_user
 from backend.schemas.course import (
     CourseCreate,
     CourseOut,
@@ -16,6 +15,7 @@ from backend.schemas.course import (
     LessonOut,
     LessonUpdateProgress,
 )
+from backend.services.activity_log_service import ActivityLogService
 from backend.services.course_service import CourseService
 
 
@@ -25,7 +25,7 @@ router = APIRouter()
 @router.post("/courses", response_model=CourseOut)
 async def create_course(
     payload: CourseCreate,
-    trainer: User = Depends(get_trainer_user),
+    trainer: AuthUser = Depends(get_trainer_user),
     db: AsyncSession = Depends(get_db),
 ) -> CourseOut:
     return await CourseService.create_course(db, trainer.id, payload)
@@ -33,7 +33,7 @@ async def create_course(
 
 @router.get("/courses", response_model=List[CourseOut])
 async def list_courses(
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_auth_user),
     db: AsyncSession = Depends(get_db),
 ) -> List[CourseOut]:
     # Pass the full user object so the service can apply role-based filtering
@@ -42,7 +42,7 @@ async def list_courses(
 
 @router.get("/courses/my-courses", response_model=List[CourseOut])
 async def list_my_courses(
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_auth_user),
     db: AsyncSession = Depends(get_db),
 ) -> List[CourseOut]:
     return await CourseService.list_my_courses(db, current_user.id)
@@ -51,7 +51,7 @@ async def list_my_courses(
 @router.get("/courses/{course_id}", response_model=CourseOut)
 async def get_course(
     course_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_auth_user),
     db: AsyncSession = Depends(get_db),
 ) -> CourseOut:
     return await CourseService.get_course(db, course_id, current_user.id)
@@ -60,7 +60,7 @@ async def get_course(
 @router.post("/courses/{course_id}/enroll", response_model=List[CourseOut])
 async def enroll_in_course(
     course_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_auth_user),
     db: AsyncSession = Depends(get_db),
 ) -> List[CourseOut]:
     """
@@ -72,14 +72,9 @@ async def enroll_in_course(
 
     # Log the enrollment activity (only on first enrollment)
     if newly_enrolled:
-        log = ActivityLog(
-            user_id=current_user.id,
-            action="enrolled",
-            detail=f"Enrolled in course {course_id}",
-            related_course_id=course_id,
+        await ActivityLogService.log_activity(
+            db, current_user.id, "enrolled", f"Enrolled in course {course_id}", course_id
         )
-        db.add(log)
-        await db.commit()
 
     # Return full enrolled course list so the frontend can update state immediately
     return await CourseService.list_my_courses(db, current_user.id)
@@ -88,7 +83,7 @@ async def enroll_in_course(
 @router.post("/modules", response_model=ModuleOut)
 async def create_module(
     payload: ModuleCreate,
-    trainer: User = Depends(get_trainer_user),
+    trainer: AuthUser = Depends(get_trainer_user),
     db: AsyncSession = Depends(get_db),
 ) -> ModuleOut:
     return await CourseService.create_module(db, payload)
@@ -97,7 +92,7 @@ async def create_module(
 @router.post("/lessons", response_model=LessonOut)
 async def create_lesson(
     payload: LessonCreate,
-    trainer: User = Depends(get_trainer_user),
+    trainer: AuthUser = Depends(get_trainer_user),
     db: AsyncSession = Depends(get_db),
 ) -> LessonOut:
     return await CourseService.create_lesson(db, payload)
@@ -106,7 +101,7 @@ async def create_lesson(
 @router.get("/lessons/{lesson_id}", response_model=LessonOut)
 async def get_lesson(
     lesson_id: int,
-    _: User = Depends(get_current_user),
+    _: AuthUser = Depends(get_auth_user),
     db: AsyncSession = Depends(get_db),
 ) -> LessonOut:
     lesson = await CourseService.get_lesson(db, lesson_id)
@@ -117,7 +112,7 @@ async def get_lesson(
 async def update_lesson_progress(
     lesson_id: int,
     payload: LessonUpdateProgress,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_auth_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict:
     await CourseService.update_lesson_progress(db, current_user.id, lesson_id, payload)
@@ -1,19 +1,22 @@
-from datetime import datetime, date, timedelta
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import selectinload
 
 from backend.db.session import get_db
-from backend.dependencies import get_current_user
+from backend.core import auth_cache
+from backend.core.auth_cache import AuthUser
+from backend.dependencies import get_auth_user, get_current_user
 from backend.models.user import User
 from backend.models.course import Course, Module, Lesson, LessonProgress
 from backend.models.enrollment import Enrollment
-from backend.models.activity_log import ActivityLog
+from backend.services.activity_log_service import ActivityLogService
 from backend.schemas.course import LessonUpdateProgress
 from backend.services.certificate_service import CertificateService
+from backend.services.streak_service import StreakService
 from backend.models.certificate import Certificate
 
 router = APIRouter()
@@ -26,55 +29,58 @@ router = APIRouter()
 @router.post("/progress")
 async def update_progress(
     payload: LessonUpdateProgress,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_auth_user),
     db: AsyncSession = Depends(get_db),
 ):
 
-    # 1️⃣ Find lesson
-    lesson = await db.get(Lesson, payload.lesson_id)
-    if not lesson:
+    # 1️⃣ Find lesson (title + owning course in one round trip)
+    lesson_row = (
+        await db.execute(
+            select(Lesson.title, Module.course_id)
+            .join(Module, Module.id == Lesson.module_id)
+            .where(Lesson.id == payload.lesson_id)
+        )
+    ).first()
+    if not lesson_row:
         raise HTTPException(status_code=404, detail="Lesson not found")
-
-    # 2️⃣ UPSERT progress
-    stmt = select(LessonProgress).where(
-        LessonProgress.lesson_id == payload.lesson_id,
-        LessonProgress.user_id == current_user.id,
+    lesson_title, course_id = lesson_row
+
+    # 2️⃣ UPSERT progress — single INSERT ... ON CONFLICT DO UPDATE, so
+    #    concurrent heartbeats from two tabs can never create duplicate rows
+    stmt = pg_insert(LessonProgress).values(
+        lesson_id=payload.lesson_id,
+        user_id=current_user.id,
+        completion_percentage=payload.completion_percentage,
+        last_position_seconds=payload.last_position_seconds,
+        is_completed=payload.is_completed,
+        last_accessed=func.now(),
     )
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_lesson_progress_user_lesson",
+        set_={
+            "completion_percentage": stmt.excluded.completion_percentage,
+            "last_position_seconds": stmt.excluded.last_position_seconds,
+            "is_completed": stmt.excluded.is_completed,
+            "last_accessed": func.now(),
+        },
+    ).returning(LessonProgress.id)
 
-    result = await db.execute(stmt)
-    progress = result.scalar_one_or_none()
-
-    if progress:
-        progress.completion_percentage = payload.completion_percentage
-        progress.last_position_seconds = payload.last_position_seconds
-        progress.is_completed = payload.is_completed
-        progress.updated_at = datetime.utcnow()
-    else:
-        progress = LessonProgress(
-            lesson_id=payload.lesson_id,
-            user_id=current_user.id,
-            completion_percentage=payload.completion_percentage,
-            last_position_seconds=payload.last_position_seconds,
-            is_completed=payload.is_completed,
-        )
-        db.add(progress)
+    await db.execute(stmt)
 
+    # Streak is maintained incrementally in the same transaction
+    _, streak_updated = await StreakService.record_activity(db, current_user)
     await db.commit()
+    if streak_updated:
+        # The cached auth state carries the streak; reload it on the next request
+        auth_cache.invalidate(current_user.id)
 
     # 3️⃣ If lesson completed → log activity
     if payload.is_completed:
-        db.add(
-            ActivityLog(
-                user_id=current_user.id,
-                action="completed",
-                detail=f"Completed lesson {lesson.title}"
-            )
+        await ActivityLogService.log_activity(
+            db, current_user.id, "completed", f"Completed lesson {lesson_title}"
         )
-        await db.commit()
 
     # 4️⃣ 🔥 CHECK COURSE COMPLETION
-    course_id = lesson.module.course_id
-
     total_stmt = select(func.count(Lesson.id)).join(Module).where(
         Module.course_id == course_id
     )
@@ -115,7 +121,7 @@ async def update_progress(
 @router.get("/progress/{lesson_id}")
 async def get_progress(
     lesson_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_auth_user),
     db: AsyncSession = Depends(get_db),
 ):
 
@@ -141,40 +147,6 @@ async def get_progress(
     }
 
 
-# =========================================================
-# 🔥 STREAK CALCULATION
-# =========================================================
-
-async def calculate_streak(db: AsyncSession, user_id: int) -> int:
-
-    today = date.today()
-
-    stmt = (
-        select(func.date(LessonProgress.updated_at))
-        .where(LessonProgress.user_id == user_id)
-        .group_by(func.date(LessonProgress.updated_at))
-        .order_by(desc(func.date(LessonProgress.updated_at)))
-    )
-
-    result = await db.execute(stmt)
-    activity_days = [r[0] for r in result.all()]
-
-    if not activity_days:
-        return 0
-
-    streak = 0
-    current_day = today
-
-    for day in activity_days:
-        if day == current_day or day == current_day - timedelta(days=1):
-            streak += 1
-            current_day = day
-        else:
-            break
-
-    return streak
-
-
 # =========================================================
 # 🔥 DASHBOARD
 # =========================================================
@@ -228,7 +200,7 @@ async def get_dashboard(
             "total_lessons": total_lessons,
         })
 
-    streak = await calculate_streak(db, current_user.id)
+    streak = StreakService.get_streak(current_user)
 
     return {
         "user": {
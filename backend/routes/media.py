@@ -1,9 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import FileResponse
 from pathlib import Path
 import os
-from backend.dependencies import get_current_user
-from backend.models.user import User
+import stat
+
+import anyio
+
+from backend.core.auth_cache import AuthUser
+from backend.core.media_response import MediaFileResponse
+from backend.dependencies import get_auth_user
 
 router = APIRouter()
 
@@ -12,11 +16,12 @@ BASE_UPLOAD_DIR = Path("backend/uploads")
 @router.get("/media/{file_path:path}")
 async def get_media_file(
     file_path: str,
-    current_user: User = Depends(get_current_user)
+    current_user: AuthUser = Depends(get_auth_user)
 ):
     """
     Serve uploaded media files (videos/pdfs) securely.
-    Requires authentication.
+    Requires authentication. Supports byte ranges (video seeking) and
+    ETag / If-None-Match / If-Range revalidation.
     """
     # Sanitize path to prevent directory traversal
     safe_path = os.path.normpath(file_path)
@@ -24,8 +29,12 @@ async def get_media_file(
          raise HTTPException(status_code=403, detail="Invalid file path")
 
     full_path = BASE_UPLOAD_DIR / safe_path
-    
-    if not full_path.exists() or not full_path.is_file():
+
+    try:
+        stat_result = await anyio.to_thread.run_sync(os.stat, full_path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise HTTPException(status_code=404, detail="File not found")
+    if not stat.S_ISREG(stat_result.st_mode):
         raise HTTPException(status_code=404, detail="File not found")
 
-    return FileResponse(full_path)
+    return MediaFileResponse(full_path, stat_result=stat_result)
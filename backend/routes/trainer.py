@@ -8,14 +8,15 @@ from sqlalchemy import select, func
 from fastapi import Query
 
 
-from backend.db.session import get_db
+from backend.db.session import get_db, get_read_db
+from backend.core.auth_cache import AuthUser
 from backend.dependencies import get_trainer_user
-from backend.models.user import User
 from backend.models.course import Course, Module, Lesson
 from backend.services.trainer_service import TrainerService
 from backend.services.activity_log_service import ActivityLogService
-from backend.services.file_service import FileService
+from backend.services.media_store import MediaStore
 from backend.services.knowledge_pipeline_service import KnowledgePipelineService
+from backend.services.transcode_service import TranscodeService
 from backend.core.config import settings
 
 router = APIRouter()
@@ -40,8 +41,8 @@ class ModuleCreate(BaseModel):
 # ━━━━━━━━━━━━━━━━━━━━ Dashboard Stats ━━━━━━━━━━━━━━━━━━━━
 @router.get("/stats")
 async def get_stats(
-    user: User = Depends(get_trainer_user),
-    db: AsyncSession = Depends(get_db),
+    user: AuthUser = Depends(get_trainer_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     return await TrainerService.get_stats(db, user.id)
 
@@ -49,7 +50,7 @@ async def get_stats(
 # ━━━━━━━━━━━━━━━━━━━━ Courses ━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 @router.get("/courses")
 async def get_courses(
-    user: User = Depends(get_trainer_user),
+    user: AuthUser = Depends(get_trainer_user),
     db: AsyncSession = Depends(get_db),
 ):
     return await TrainerService.get_courses(db, user.id)
@@ -58,7 +59,7 @@ async def get_courses(
 @router.post("/courses")
 async def create_course(
     payload: CourseCreate,
-    user: User = Depends(get_trainer_user),
+    user: AuthUser = Depends(get_trainer_user),
     db: AsyncSession = Depends(get_db),
 ):
     course = Course(title=payload.title, description=payload.description, created_by_id=user.id)
@@ -73,7 +74,7 @@ async def create_course(
 async def update_course(
     course_id: int,
     payload: CourseUpdate,
-    user: User = Depends(get_trainer_user),
+    user: AuthUser = Depends(get_trainer_user),
     db: AsyncSession = Depends(get_db),
 ):
     course = await db.get(Course, course_id)
@@ -93,7 +94,7 @@ async def update_course(
 @router.delete("/courses/{course_id}")
 async def delete_course(
     course_id: int,
-    user: User = Depends(get_trainer_user),
+    user: AuthUser = Depends(get_trainer_user),
     db: AsyncSession = Depends(get_db),
 ):
     course = await db.get(Course, course_id)
@@ -101,6 +102,7 @@ async def delete_course(
         raise HTTPException(404, "Course not found")
     if course.created_by_id != user.id and user.role != "admin":
         raise HTTPException(403, "Not your course")
+    await MediaStore.release_course(db, course_id)
     await db.delete(course)
     await db.commit()
     await ActivityLogService.log_activity(db, user.id, "course_deleted", f"Deleted course: {course.title}")
@@ -112,7 +114,7 @@ async def delete_course(
 async def create_module(
     course_id: int,
     payload: ModuleCreate,
-    user: User = Depends(get_trainer_user),
+    user: AuthUser = Depends(get_trainer_user),
     db: AsyncSession = Depends(get_db),
 ):
     course = await db.get(Course, course_id)
@@ -144,7 +146,7 @@ async def upload_video(
     module_id: int,
     background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    user: User = Depends(get_trainer_user),
+    user: AuthUser = Depends(get_trainer_user),
     db: AsyncSession = Depends(get_db),
 ):
     mod = await db.get(Module, module_id)
@@ -154,11 +156,9 @@ async def upload_video(
     if course.created_by_id != user.id and user.role != "admin":
         raise HTTPException(403, "Not your course")
 
-    # Use correct service method: save_upload_file
-    file_path = await FileService.save_upload_file(
-        file=file,
-        category="videos"
-    )
+    # Stored by content hash: re-uploading the same recording costs nothing
+    blob = await MediaStore.ingest_upload(db, file, "videos")
+    file_path = blob.stored_path
 
     lesson = (await db.execute(
         select(Lesson).where(Lesson.module_id == module_id).limit(1)
@@ -170,11 +170,12 @@ async def upload_video(
         await db.commit()
         await db.refresh(lesson)
 
-    lesson.video_path = file_path
+    await MediaStore.attach(db, lesson, "video_path", blob)
     lesson.transcript_status = "processing"
     await db.commit()
 
     await ActivityLogService.log_activity(db, user.id, "video_uploaded", f"Video uploaded for module: {mod.title}", course.id)
+    await TranscodeService.enqueue(lesson.id)
 
     # Correct method for pipeline is process_lesson_recording, NOT process_lesson
     background_tasks.add_task(KnowledgePipelineService.process_lesson_recording, lesson.id, file_path)
@@ -186,7 +187,7 @@ async def upload_video(
 async def upload_pdf(
     module_id: int,
     file: UploadFile = File(...),
-    user: User = Depends(get_trainer_user),
+    user: AuthUser = Depends(get_trainer_user),
     db: AsyncSession = Depends(get_db),
 ):
     mod = await db.get(Module, module_id)
@@ -196,11 +197,9 @@ async def upload_pdf(
     if course.created_by_id != user.id and user.role != "admin":
         raise HTTPException(403, "Not your course")
 
-    # Use correct service method: save_upload_file
-    file_path = await FileService.save_upload_file(
-        file=file,
-        category="pdfs"
-    )
+    # Stored by content hash: re-uploading the same document costs nothing
+    blob = await MediaStore.ingest_upload(db, file, "pdfs")
+    file_path = blob.stored_path
 
     lesson = (await db.execute(
         select(Lesson).where(Lesson.module_id == module_id).limit(1)
@@ -212,7 +211,7 @@ async def upload_pdf(
         await db.commit()
         await db.refresh(lesson)
 
-    lesson.pdf_path = file_path
+    await MediaStore.attach(db, lesson, "pdf_path", blob)
     await db.commit()
 
     await ActivityLogService.log_activity(db, user.id, "pdf_uploaded", f"PDF uploaded for module: {mod.title}", course.id)
@@ -223,7 +222,7 @@ async def upload_pdf(
 @router.post("/courses/{course_id}/publish")
 async def publish_course(
     course_id: int,
-    user: User = Depends(get_trainer_user),
+    user: AuthUser = Depends(get_trainer_user),
     db: AsyncSession = Depends(get_db),
 ):
     course = await db.get(Course, course_id)
@@ -263,8 +262,8 @@ async def publish_course(
 # ━━━━━━━━━━━━━━━━━━━━ Students ━━━━━━━━━━━━━━━━━━━━━━━━━━
 @router.get("/students")
 async def get_students(
-    user: User = Depends(get_trainer_user),
-    db: AsyncSession = Depends(get_db),
+    user: AuthUser = Depends(get_trainer_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     return await TrainerService.get_students(db, user.id)
 
@@ -272,16 +271,16 @@ async def get_students(
 # ━━━━━━━━━━━━━━━━━━━━ Analytics ━━━━━━━━━━━━━━━━━━━━━━━━━━
 @router.get("/analytics/completion")
 async def completion_rates(
-    user: User = Depends(get_trainer_user),
-    db: AsyncSession = Depends(get_db),
+    user: AuthUser = Depends(get_trainer_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     return await TrainerService.get_completion_rates(db, user.id)
 
 
 @router.get("/analytics/enrollment-trend")
 async def enrollment_trend(
-    user: User = Depends(get_trainer_user),
-    db: AsyncSession = Depends(get_db),
+    user: AuthUser = Depends(get_trainer_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     return await TrainerService.get_enrollment_trend(db, user.id)
 
@@ -290,7 +289,7 @@ async def enrollment_trend(
 @router.get("/activities")
 async def get_activities(
     limit: int = Query(30, ge=1, le=100),
-    user: User = Depends(get_trainer_user),
-    db: AsyncSession = Depends(get_db),
+    user: AuthUser = Depends(get_trainer_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     return await TrainerService.get_activities(db, user.id, limit)
@@ -1,12 +1,16 @@
-from fastapi import APIRouter, Depends, UploadFile, File, BackgroundTasks, HTTPException
+from fastapi import APIRouter, Depends, UploadFile, File, BackgroundTasks, HTTPException, Header, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.db.session import get_db
-from backend.dependencies import get_current_user
-from backend.models.user import User
+from backend.core.auth_cache import AuthUser
+from backend.dependencies import get_auth_user
 from backend.models.course import Lesson
-from backend.services.file_service import FileService
+from backend.schemas.upload import UploadFinalize, UploadSessionCreate
+from backend.services.file_service import UPLOAD_CATEGORIES
 from backend.services.knowledge_pipeline_service import KnowledgePipelineService
+from backend.services.media_store import MediaStore
+from backend.services.resumable_upload_service import ResumableUploadService
+from backend.services.transcode_service import TranscodeService
 
 
 router = APIRouter()
@@ -17,7 +21,7 @@ async def upload_lesson_file(
     lesson_id: int,
     background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_auth_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict:
 
@@ -32,34 +36,22 @@ async def upload_lesson_file(
     ext = file.filename.split(".")[-1].lower()
 
     # 🎯 Decide file type
-    if ext in ["mp4", "mov", "avi"]:
-        category = "videos"
-        field_name = "video_url"
-
-    elif ext in ["mp3", "wav"]:
-        category = "audio"
-        field_name = "audio_url"
-
-    elif ext in ["pdf"]:
-        category = "pdfs"
-        field_name = "pdf_url"
-
-    else:
+    if ext not in UPLOAD_CATEGORIES:
         raise HTTPException(status_code=400, detail="Unsupported file type")
+    category, field_name = UPLOAD_CATEGORIES[ext]
 
-    # 📁 Save file using FileService
-    stored_path = await FileService.save_upload_file(
-        file=file,
-        category=category
-    )
+    # 📁 Store by content hash (identical files are stored once)
+    blob = await MediaStore.ingest_upload(db, file, category)
+    stored_path = blob.stored_path
 
     # 🗂 Update correct DB column dynamically
-    setattr(lesson, field_name, stored_path)
+    await MediaStore.attach(db, lesson, field_name, blob)
 
     await db.commit()
 
-    # 🔥 If video uploaded → trigger AI pipeline
+    # 🔥 If video uploaded → package it for streaming and trigger AI pipeline
     if category == "videos":
+        await TranscodeService.enqueue(lesson_id)
         background_tasks.add_task(
             KnowledgePipelineService.process_lesson_recording,
             lesson_id,
@@ -70,4 +62,127 @@ async def upload_lesson_file(
         "status": "uploaded",
         "file_type": category,
         "stored_path": stored_path
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/lessons/{lesson_id}/hls")
+async def get_hls_status(
+    lesson_id: int,
+    current_user: AuthUser = Depends(get_auth_user),
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    """Progress of the HLS packaging job for a lesson's video."""
+    lesson = await db.get(Lesson, lesson_id)
+    if not lesson:
+        raise HTTPException(status_code=404, detail="Lesson not found")
+
+    return {
+        "lesson_id": lesson.id,
+        "status": lesson.hls_status,
+        "progress": lesson.hls_progress,
+        "playlist": lesson.hls_path,
+    }
+
+
+# ━━━━━━━━━━━━━━━━━━━━ Resumable uploads ━━━━━━━━━━━━━━━━━━━━━
+# create → PATCH chunks (Upload-Offset, optional Upload-Checksum) → finalize.
+# HEAD tells a client where to resume after a dropped connection.
+
+def _require_uploader(current_user: AuthUser) -> None:
+    if current_user.role not in ["admin", "trainer"]:
+        raise HTTPException(status_code=403, detail="Not authorized to upload")
+
+
+@router.post("/sessions", status_code=201)
+async def create_upload_session(
+    payload: UploadSessionCreate,
+    response: Response,
+    current_user: AuthUser = Depends(get_auth_user),
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    _require_uploader(current_user)
+    session = await ResumableUploadService.create(
+        db, current_user, payload.lesson_id, payload.filename, payload.size
+    )
+    response.headers["Location"] = f"/api/uploads/sessions/{session.id}"
+    response.headers["Upload-Offset"] = "0"
+    return {"upload_id": session.id, "offset": 0, "size": session.size}
+
+
+@router.head("/sessions/{upload_id}")
+async def get_upload_offset(
+    upload_id: str,
+    current_user: AuthUser = Depends(get_auth_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    session = await ResumableUploadService.get_owned(db, upload_id, current_user)
+    return Response(
+        status_code=200,
+        headers={
+            "Upload-Offset": str(session.offset),
+            "Upload-Length": str(session.size),
+            "Cache-Control": "no-store",
+        },
+    )
+
+
+@router.patch("/sessions/{upload_id}", status_code=204)
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(..., ge=0),
+    upload_checksum: str | None = Header(None),
+    current_user: AuthUser = Depends(get_auth_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    if request.headers.get("content-type") != "application/offset+octet-stream":
+        raise HTTPException(status_code=415, detail="Content-Type must be application/offset+octet-stream")
+
+    offset = await ResumableUploadService.append(
+        db, upload_id, current_user, upload_offset, upload_checksum, request.stream()
+    )
+    return Response(status_code=204, headers={"Upload-Offset": str(offset)})
+
+
+@router.post("/sessions/{upload_id}/finalize")
+async def finalize_upload(
+    upload_id: str,
+    background_tasks: BackgroundTasks,
+    payload: UploadFinalize | None = None,
+    current_user: AuthUser = Depends(get_auth_user),
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    session = await ResumableUploadService.finalize(
+        db, upload_id, current_user, payload.sha256 if payload else None
+    )
+
+    # 🔥 Pipeline only runs once the whole file is in place
+    if session.category in ("videos", "pdfs"):
+        lesson = await db.get(Lesson, session.lesson_id)
+        if lesson is not None:
+            lesson.transcript_status = "processing"
+            await db.commit()
+        background_tasks.add_task(
+            KnowledgePipelineService.process_lesson_recording,
+            session.lesson_id,
+            session.stored_path,
+        )
+    if session.category == "videos":
+        await TranscodeService.enqueue(session.lesson_id)
+
+    return {
+        "status": "uploaded",
+        "file_type": session.category,
+        "stored_path": session.stored_path,
+        "sha256": session.sha256,
+    }
+
+
+@router.delete("/sessions/{upload_id}", status_code=204)
+async def abort_upload(
+    upload_id: str,
+    current_user: AuthUser = Depends(get_auth_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    await ResumableUploadService.abort(db, upload_id, current_user)
+    return Response(status_code=204)
@@ -51,8 +51,10 @@ class UserListItem(BaseModel):
 class PaginatedUsers(BaseModel):
     users: list[UserListItem]
     total: int
+    total_is_estimate: bool = False
     page: int
     page_size: int
+    next_cursor: Optional[str] = None  # opaque keyset cursor for the next page
 
 class ChangeRoleRequest(BaseModel):
     role: str  # learner | trainer
@@ -78,6 +80,7 @@ class CertificateOut(BaseModel):
     issued_at: Optional[str] = None
     revoked: bool
     certificate_url: Optional[str] = None
+    pdf_status: str = "pending"
     student_name: str
     student_email: str
     course_title: str
@@ -85,8 +88,10 @@ class CertificateOut(BaseModel):
 class PaginatedCertificates(BaseModel):
     certificates: list[CertificateOut]
     total: int
+    total_is_estimate: bool = False
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
 
 
 # ── Analytics ──────────────────────────────────────────
@@ -62,6 +62,11 @@ class LessonOut(LessonBase):
     processed: bool = False
     created_at: datetime
 
+    # Adaptive-bitrate renditions (hls_path is the master playlist, served by /api/media)
+    hls_status: Optional[str] = None
+    hls_progress: Optional[int] = 0
+    hls_path: Optional[str] = None
+
     # 🔥 ADDITIONAL PROGRESS INFO (SAFE FOR FRONTEND)
     completion_percentage: Optional[int] = 0
     is_completed: Optional[bool] = False
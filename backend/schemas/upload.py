@@ -0,0 +1,13 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class UploadSessionCreate(BaseModel):
+    lesson_id: int = Field(..., gt=0)
+    filename: str = Field(..., min_length=1, max_length=255)
+    size: int = Field(..., gt=0)
+
+
+class UploadFinalize(BaseModel):
+    # Optional whole-file check; the server computes the hash while streaming
+    sha256: Optional[str] = Field(None, min_length=64, max_length=64)
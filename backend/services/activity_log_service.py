@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
+from backend.core.pagination import decode_cursor, encode_cursor
 from backend.models.activity_log import ActivityLog
 from backend.models.user import User
+from backend.services.activity_sink import ActivitySink
 
 
 class ActivityLogService:
@@ -17,19 +19,35 @@ class ActivityLogService:
         detail: str | None = None,
         related_course_id: int | None = None,
         ip_address: str | None = None,
+        critical: bool = False,
     ) -> None:
-        entry = ActivityLog(
+        """
+        Record an activity. By default the row is handed to the batched
+        ActivitySink and written off the request path. `critical=True` (audit
+        trail) adds it to `db` and commits before returning.
+        """
+        if not critical:
+            await ActivitySink.submit(user_id, action, detail, related_course_id, ip_address)
+            return
+        db.add(ActivityLog(
             user_id=user_id,
             action=action,
             detail=detail,
             related_course_id=related_course_id,
             ip_address=ip_address,
-        )
-        db.add(entry)
+        ))
         await db.commit()
 
     @staticmethod
     async def get_recent(db: AsyncSession, limit: int = 50) -> list[dict]:
+        items, _ = await ActivityLogService.get_recent_page(db, limit)
+        return items
+
+    @staticmethod
+    async def get_recent_page(
+        db: AsyncSession, limit: int = 50, cursor: str | None = None
+    ) -> tuple[list[dict], str | None]:
+        """Newest-first activity feed with keyset pagination on (created_at, id)."""
         stmt = (
             select(
                 ActivityLog.id,
@@ -42,11 +60,22 @@ class ActivityLogService:
                 User.role.label("user_role"),
             )
             .outerjoin(User, User.id == ActivityLog.user_id)
-            .order_by(desc(ActivityLog.created_at))
-            .limit(limit)
+            .order_by(desc(ActivityLog.created_at), desc(ActivityLog.id))
+            .limit(limit + 1)
         )
+        if cursor:
+            created_at, log_id = decode_cursor(cursor)
+            stmt = stmt.where(tuple_(ActivityLog.created_at, ActivityLog.id) < (created_at, log_id))
+
         rows = (await db.execute(stmt)).all()
-        return [
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = (
+            encode_cursor(rows[-1].created_at, rows[-1].id)
+            if has_more and rows[-1].created_at
+            else None
+        )
+        items = [
             {
                 "id": r.id,
                 "action": r.action,
@@ -59,6 +88,7 @@ class ActivityLogService:
             }
             for r in rows
         ]
+        return items, next_cursor
 
     @staticmethod
     async def get_user_activity(db: AsyncSession, user_id: int, limit: int = 30) -> list[dict]:
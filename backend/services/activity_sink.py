@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+
+from loguru import logger
+from sqlalchemy import insert
+
+from backend.core import metrics
+from backend.core.config import settings
+from backend.db.session import AsyncSessionLocal
+from backend.models.activity_log import ActivityLog
+
+
+class ActivitySink:
+    """
+    Per-worker buffer for activity log rows. Requests enqueue and return; a
+    background task bulk-inserts whatever accumulated every flush interval
+    (or as soon as a batch fills). When the queue is full, producers wait up to
+    `activity_log_enqueue_timeout_seconds` (backpressure) and then write
+    synchronously rather than drop an entry.
+    """
+
+    _queue: asyncio.Queue | None = None
+    _task: asyncio.Task | None = None
+    _writing: asyncio.Future | None = None
+
+    @classmethod
+    def start(cls) -> None:
+        if cls._task is not None:
+            return
+        cls._queue = asyncio.Queue(maxsize=settings.activity_log_queue_size)
+        cls._task = asyncio.create_task(cls._run(), name="activity-sink")
+        logger.info("[ActivitySink] Started")
+
+    @classmethod
+    async def stop(cls) -> None:
+        """Stop the drainer and flush everything still queued."""
+        if cls._task is None:
+            return
+        cls._task.cancel()
+        await asyncio.gather(cls._task, return_exceptions=True)
+        cls._task = None
+        if cls._writing is not None:
+            await asyncio.gather(cls._writing, return_exceptions=True)
+
+        remaining = cls._take_all()
+        if remaining:
+            await cls._write(remaining)
+        logger.info(f"[ActivitySink] Stopped — flushed {len(remaining)} pending entries")
+
+    @classmethod
+    def queue_depth(cls) -> int:
+        return cls._queue.qsize() if cls._queue is not None else 0
+
+    @classmethod
+    async def submit(
+        cls,
+        user_id: int | None,
+        action: str,
+        detail: str | None = None,
+        related_course_id: int | None = None,
+        ip_address: str | None = None,
+    ) -> None:
+        entry = {
+            "user_id": user_id,
+            "action": action,
+            "detail": detail,
+            "related_course_id": related_course_id,
+            "ip_address": ip_address,
+            # Stamped now, not at flush time, so ordering reflects the request
+            "created_at": datetime.now(timezone.utc),
+        }
+        if cls._task is None:
+            # Not running inside the app (scripts, one-off commands)
+            await cls._write([entry])
+            return
+        try:
+            await asyncio.wait_for(
+                cls._queue.put(entry),
+                timeout=settings.activity_log_enqueue_timeout_seconds,
+            )
+        except asyncio.TimeoutError:
+            logger.warning("[ActivitySink] Queue full — writing entry synchronously")
+            await cls._write([entry])
+
+    @classmethod
+    def _take_all(cls) -> list[dict]:
+        entries = []
+        while cls._queue is not None and not cls._queue.empty():
+            entries.append(cls._queue.get_nowait())
+        return entries
+
+    @classmethod
+    async def _run(cls) -> None:
+        interval = settings.activity_log_flush_interval_ms / 1000
+        batch_size = settings.activity_log_batch_size
+        while True:
+            # Block until there is something to write, then gather more until
+            # the batch is full or the flush interval has passed
+            batch = []
+            try:
+                batch.append(await cls._queue.get())
+                deadline = asyncio.get_running_loop().time() + interval
+                while len(batch) < batch_size:
+                    timeout = deadline - asyncio.get_running_loop().time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(cls._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                # Entries already taken off the queue are only in `batch`;
+                # write them before stopping, or stop() would never see them
+                if batch:
+                    cls._writing = asyncio.ensure_future(cls._write(batch))
+                    await asyncio.shield(cls._writing)
+                raise
+            # Shielded so shutdown never interrupts a half-written batch;
+            # stop() waits for it before flushing the rest of the queue
+            cls._writing = asyncio.ensure_future(cls._write(batch))
+            await asyncio.shield(cls._writing)
+
+    @staticmethod
+    async def _write(entries: list[dict]) -> None:
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(insert(ActivityLog), entries)
+                await db.commit()
+        except Exception as e:
+            logger.error(f"[ActivitySink] Failed to write {len(entries)} activity entries: {e}")
+
+
+metrics.Gauge("activity_log_queue_depth", "Activity entries waiting to be written", ActivitySink.queue_depth)
@@ -1,11 +1,18 @@
 from fastapi import HTTPException
-from sqlalchemy import func, select, case, desc
+from sqlalchemy import JSON, func, literal_column, select, case, desc, true, tuple_
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.core.security import get_password_hash
+from backend.core import auth_cache
+from backend.core.cache import StaleWhileRevalidateCache
+from backend.core.config import settings
+from backend.core.pagination import decode_cursor, encode_cursor, table_total
+from backend.core.security import get_password_hash_async
+from backend.db.session import read_session
 from backend.models.user import User
 from backend.models.course import Course, Module, Lesson, LessonProgress
 from backend.models.activity_log import ActivityLog
+from backend.services.login_guard import LoginGuard
 from backend.schemas.admin import (
     AdminStats,
     RoleCount,
@@ -16,64 +23,80 @@ from backend.schemas.admin import (
 )
 
 
+_stats_cache = StaleWhileRevalidateCache(
+    ttl_seconds=settings.admin_stats_cache_ttl_seconds,
+    stale_seconds=settings.admin_stats_cache_stale_seconds,
+)
+
+
+def _json_array(subquery_stmt):
+    """Scalar JSON-array subquery that yields [] instead of NULL for no rows."""
+    return func.coalesce(
+        subquery_stmt.scalar_subquery(), literal_column("'[]'::json"), type_=JSON
+    )
+
+
 class AdminService:
     @staticmethod
     async def get_stats(db: AsyncSession) -> AdminStats:
-        # Total counts
-        total_users = (await db.execute(select(func.count(User.id)))).scalar() or 0
-        total_courses = (await db.execute(select(func.count(Course.id)))).scalar() or 0
-        total_modules = (await db.execute(select(func.count(Module.id)))).scalar() or 0
-        total_lessons = (await db.execute(select(func.count(Lesson.id)))).scalar() or 0
-
-        # Active users
-        active_users = (
-            await db.execute(
-                select(func.count(User.id)).where(User.is_active == True)
-            )
-        ).scalar() or 0
+        """
+        Dashboard stats, served from a short-TTL cache. Once the TTL lapses the
+        stale value is still returned while a background task recomputes it.
+        """
+        return await _stats_cache.get_or_load(
+            "admin_stats",
+            loader=lambda: AdminService._compute_stats(db),
+            refresher=AdminService._refresh_stats,
+        )
 
-        # Average completion rate
-        avg_completion = (
-            await db.execute(select(func.avg(LessonProgress.completion_percentage)))
-        ).scalar() or 0.0
+    @staticmethod
+    async def _refresh_stats() -> AdminStats:
+        # Background refresh outlives the request, so it needs its own session
+        async with await read_session() as session:
+            return await AdminService._compute_stats(session)
 
-        # Processed / unprocessed lessons
-        processed_lessons = (
-            await db.execute(
-                select(func.count(Lesson.id)).where(Lesson.processed == True)
-            )
-        ).scalar() or 0
-        unprocessed_lessons = total_lessons - processed_lessons
+    @staticmethod
+    async def _compute_stats(db: AsyncSession) -> AdminStats:
+        # ── Statement 1: every scalar KPI in one row ──
+        user_counts = select(
+            func.count(User.id).label("total_users"),
+            func.count(User.id).filter(User.is_active == True).label("active_users"),
+        ).subquery()
+        lesson_counts = select(
+            func.count(Lesson.id).label("total_lessons"),
+            func.count(Lesson.id).filter(Lesson.processed == True).label("processed_lessons"),
+        ).subquery()
 
-        # Role distribution
-        role_rows = (
-            await db.execute(
-                select(User.role, func.count(User.id))
-                .group_by(User.role)
+        counts_stmt = (
+            select(
+                user_counts.c.total_users,
+                user_counts.c.active_users,
+                lesson_counts.c.total_lessons,
+                lesson_counts.c.processed_lessons,
+                select(func.count(Course.id)).scalar_subquery().label("total_courses"),
+                select(func.count(Module.id)).scalar_subquery().label("total_modules"),
+                select(func.avg(LessonProgress.completion_percentage))
+                .scalar_subquery()
+                .label("avg_completion"),
             )
-        ).all()
-        role_distribution = [RoleCount(role=r, count=c) for r, c in role_rows]
+            .select_from(user_counts)
+            .join(lesson_counts, true())
+        )
+        counts = (await db.execute(counts_stmt)).one()
 
-        # Recent users (last 20)
-        recent_stmt = (
-            select(User)
+        # ── Statement 2: the list widgets, each aggregated to a JSON array ──
+        roles = (
+            select(User.role.label("role"), func.count(User.id).label("count"))
+            .group_by(User.role)
+            .subquery()
+        )
+        recent = (
+            select(User.id, User.full_name, User.email, User.role, User.created_at)
             .order_by(desc(User.created_at))
             .limit(20)
+            .subquery()
         )
-        recent_result = (await db.execute(recent_stmt)).scalars().all()
-        recent_users = [
-            RecentUser(
-                id=u.id,
-                full_name=u.full_name,
-                email=u.email,
-                role=u.role,
-                created_at=u.created_at.isoformat() if u.created_at else None,
-            )
-            for u in recent_result
-        ]
-
-        # Top courses by enrollment
-        top_stmt = (
+        top = (
             select(
                 Course.id,
                 Course.title,
@@ -86,45 +109,117 @@ class AdminService:
             .group_by(Course.id, Course.title)
             .order_by(desc("enrolled_count"))
             .limit(10)
+            .subquery()
         )
-        top_rows = (await db.execute(top_stmt)).all()
-        top_courses = [
-            TopCourse(
-                id=row.id,
-                title=row.title,
-                enrolled_count=row.enrolled_count,
-                avg_completion=round(float(row.avg_completion), 1),
-            )
-            for row in top_rows
-        ]
+        lists_stmt = select(
+            _json_array(
+                select(
+                    func.json_agg(func.json_build_object("role", roles.c.role, "count", roles.c.count))
+                )
+            ).label("role_distribution"),
+            _json_array(
+                select(
+                    func.json_agg(
+                        aggregate_order_by(
+                            func.json_build_object(
+                                "id", recent.c.id,
+                                "full_name", recent.c.full_name,
+                                "email", recent.c.email,
+                                "role", recent.c.role,
+                                "created_at", recent.c.created_at,
+                            ),
+                            recent.c.created_at.desc(),
+                        )
+                    )
+                )
+            ).label("recent_users"),
+            _json_array(
+                select(
+                    func.json_agg(
+                        aggregate_order_by(
+                            func.json_build_object(
+                                "id", top.c.id,
+                                "title", top.c.title,
+                                "enrolled_count", top.c.enrolled_count,
+                                "avg_completion", top.c.avg_completion,
+                            ),
+                            top.c.enrolled_count.desc(),
+                        )
+                    )
+                )
+            ).label("top_courses"),
+        )
+        lists = (await db.execute(lists_stmt)).one()
+
+        total_lessons = counts.total_lessons or 0
+        processed_lessons = counts.processed_lessons or 0
 
         return AdminStats(
-            total_users=total_users,
-            total_courses=total_courses,
-            total_modules=total_modules,
+            total_users=counts.total_users or 0,
+            total_courses=counts.total_courses or 0,
+            total_modules=counts.total_modules or 0,
             total_lessons=total_lessons,
-            avg_completion_rate=round(float(avg_completion), 1),
-            active_users=active_users,
+            avg_completion_rate=round(float(counts.avg_completion or 0.0), 1),
+            active_users=counts.active_users or 0,
             processed_lessons=processed_lessons,
-            unprocessed_lessons=unprocessed_lessons,
-            role_distribution=role_distribution,
-            recent_users=recent_users,
-            top_courses=top_courses,
+            unprocessed_lessons=total_lessons - processed_lessons,
+            role_distribution=[RoleCount(**r) for r in lists.role_distribution],
+            recent_users=[
+                RecentUser(
+                    id=u["id"],
+                    full_name=u["full_name"],
+                    email=u["email"],
+                    role=u["role"],
+                    created_at=u["created_at"],  # already ISO-8601 from json_build_object
+                )
+                for u in lists.recent_users
+            ],
+            top_courses=[
+                TopCourse(
+                    id=c["id"],
+                    title=c["title"],
+                    enrolled_count=c["enrolled_count"],
+                    avg_completion=round(float(c["avg_completion"]), 1),
+                )
+                for c in lists.top_courses
+            ],
         )
 
     @staticmethod
     async def list_users(
-        db: AsyncSession, page: int = 1, page_size: int = 20, role: str | None = None
+        db: AsyncSession,
+        page: int = 1,
+        page_size: int = 20,
+        role: str | None = None,
+        cursor: str | None = None,
     ) -> PaginatedUsers:
-        base = select(func.count(User.id))
-        if role:
-            base = base.where(User.role == role)
-        total = (await db.execute(base)).scalar() or 0
-        offset = (page - 1) * page_size
-        stmt = select(User).order_by(desc(User.created_at)).offset(offset).limit(page_size)
+        """
+        Keyset pagination on (created_at, id). Pass the previous response's
+        `next_cursor`; `page` is only honoured without a cursor (legacy clients).
+        """
+        stmt = select(User).order_by(desc(User.created_at), desc(User.id)).limit(page_size + 1)
+        count_stmt = select(func.count(User.id))
         if role:
             stmt = stmt.where(User.role == role)
-        result = (await db.execute(stmt)).scalars().all()
+            count_stmt = count_stmt.where(User.role == role)
+        if cursor:
+            created_at, user_id = decode_cursor(cursor)
+            stmt = stmt.where(tuple_(User.created_at, User.id) < (created_at, user_id))
+        elif page > 1:
+            stmt = stmt.offset((page - 1) * page_size)
+
+        rows = (await db.execute(stmt)).scalars().all()
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        next_cursor = (
+            encode_cursor(rows[-1].created_at, rows[-1].id)
+            if has_more and rows[-1].created_at
+            else None
+        )
+
+        total, is_estimate = await table_total(
+            db, "users", count_stmt, cache_key=f"users:role={role}" if role else None
+        )
         users = [
             UserListItem(
                 id=u.id,
@@ -137,9 +232,16 @@ class AdminService:
                 last_login=u.last_login.isoformat() if u.last_login else None,
                 created_at=u.created_at.isoformat() if u.created_at else None,
             )
-            for u in result
+            for u in rows
         ]
-        return PaginatedUsers(users=users, total=total, page=page, page_size=page_size)
+        return PaginatedUsers(
+            users=users,
+            total=total,
+            total_is_estimate=is_estimate,
+            page=page,
+            page_size=page_size,
+            next_cursor=next_cursor,
+        )
 
     @staticmethod
     async def toggle_user_active(db: AsyncSession, user_id: int) -> UserListItem:
@@ -147,14 +249,15 @@ class AdminService:
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         user.is_active = not user.is_active
-        await db.commit()
-        await db.refresh(user)
+        # Audit trail — written in the same transaction as the change
         db.add(ActivityLog(
             user_id=user_id,
             action="user_toggled",
             detail=f"User {'activated' if user.is_active else 'deactivated'}",
         ))
         await db.commit()
+        auth_cache.invalidate(user_id)
+        await db.refresh(user)
         return UserListItem(
             id=user.id,
             full_name=user.full_name,
@@ -172,8 +275,12 @@ class AdminService:
         user = await db.get(User, user_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
-        user.hashed_password = get_password_hash(new_password)
-        await db.commit()
+        user.hashed_password = await get_password_hash_async(new_password)
+        # A reset also lifts any login lockout
+        user.login_attempts = 0
+        user.locked_until = None
+        LoginGuard.clear(user.email)
+        # Audit trail — written in the same transaction as the change
         db.add(ActivityLog(
             user_id=user_id,
             action="password_reset",
@@ -191,14 +298,15 @@ class AdminService:
         if user.role == "admin":
             raise HTTPException(status_code=400, detail="Cannot modify admin status")
         user.status = "approved"
-        await db.commit()
-        await db.refresh(user)
+        # Audit trail — written in the same transaction as the change
         db.add(ActivityLog(
             user_id=admin_id,
             action="user_approved",
             detail=f"Admin approved {user.full_name} ({user.email})",
         ))
         await db.commit()
+        auth_cache.invalidate(user_id)
+        await db.refresh(user)
         return UserListItem(
             id=user.id, full_name=user.full_name, email=user.email,
             role=user.role, status=user.status, is_active=user.is_active,
@@ -215,14 +323,15 @@ class AdminService:
         if user.role == "admin":
             raise HTTPException(status_code=400, detail="Cannot revoke admin account")
         user.status = "revoked"
-        await db.commit()
-        await db.refresh(user)
+        # Audit trail — written in the same transaction as the change
         db.add(ActivityLog(
             user_id=admin_id,
             action="user_revoked",
             detail=f"Admin revoked {user.full_name} ({user.email})",
         ))
         await db.commit()
+        auth_cache.invalidate(user_id)
+        await db.refresh(user)
         return UserListItem(
             id=user.id, full_name=user.full_name, email=user.email,
             role=user.role, status=user.status, is_active=user.is_active,
@@ -242,14 +351,15 @@ class AdminService:
             raise HTTPException(status_code=400, detail="Cannot change admin's role")
         old_role = user.role
         user.role = new_role
-        await db.commit()
-        await db.refresh(user)
+        # Audit trail — written in the same transaction as the change
         db.add(ActivityLog(
             user_id=admin_id,
             action="role_changed",
             detail=f"Changed {user.full_name} role from {old_role} to {new_role}",
         ))
         await db.commit()
+        auth_cache.invalidate(user_id)
+        await db.refresh(user)
         return UserListItem(
             id=user.id, full_name=user.full_name, email=user.email,
             role=user.role, status=user.status, is_active=user.is_active,
@@ -1,34 +1,59 @@
 from __future__ import annotations
 
-from sqlalchemy import select, func, desc, extract, case
+from loguru import logger
+from sqlalchemy import select, func, desc, extract, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.db.session import AsyncSessionLocal
+from backend.models.analytics import (
+    ANALYTICS_VIEWS,
+    course_completion_mv,
+    enrollment_monthly_mv,
+    lesson_difficulty_mv,
+)
 from backend.models.user import User
-from backend.models.course import Course, Module, Lesson, LessonProgress
-from backend.models.enrollment import Enrollment
+
+
+# Arbitrary constant shared by all workers so only one refreshes at a time
+_REFRESH_LOCK_KEY = 7_240_311
+
+MONTH_NAMES = ["", "Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
 
 
 class AnalyticsService:
+    """
+    Course/lesson/enrollment analytics read from the materialized views in
+    backend.models.analytics, so requests never aggregate the raw progress or
+    enrollment tables. Figures lag by at most one refresh interval.
+    """
+
+    @staticmethod
+    async def refresh_rollups() -> None:
+        """Refresh every analytics view concurrently (readers are never blocked)."""
+        async with AsyncSessionLocal() as db:
+            locked = (
+                await db.execute(select(func.pg_try_advisory_xact_lock(_REFRESH_LOCK_KEY)))
+            ).scalar()
+            if not locked:
+                logger.debug("Analytics refresh already running in another worker — skipping")
+                return
+            for view in ANALYTICS_VIEWS:
+                await db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}"))
+            await db.commit()
+            logger.info("Refreshed analytics rollups")
+
     @staticmethod
-    async def get_course_completion_rates(db: AsyncSession) -> list[dict]:
+    async def get_course_completion_rates(db: AsyncSession, trainer_id: int | None = None) -> list[dict]:
         """Real completion % per course based on lesson progress."""
-        stmt = (
-            select(
-                Course.id,
-                Course.title,
-                func.coalesce(func.avg(LessonProgress.completion_percentage), 0).label("avg_completion"),
-                func.count(func.distinct(LessonProgress.user_id)).label("students"),
-            )
-            .outerjoin(Module, Module.course_id == Course.id)
-            .outerjoin(Lesson, Lesson.module_id == Module.id)
-            .outerjoin(LessonProgress, LessonProgress.lesson_id == Lesson.id)
-            .group_by(Course.id, Course.title)
-            .order_by(desc("avg_completion"))
-        )
+        mv = course_completion_mv
+        stmt = select(mv.c.course_id, mv.c.title, mv.c.avg_completion, mv.c.students)
+        if trainer_id is not None:
+            stmt = stmt.where(mv.c.created_by_id == trainer_id)
+        stmt = stmt.order_by(desc(mv.c.avg_completion))
         rows = (await db.execute(stmt)).all()
         return [
             {
-                "id": r.id,
+                "id": r.course_id,
                 "name": r.title,
                 "completion": round(float(r.avg_completion), 1),
                 "students": r.students,
@@ -39,16 +64,10 @@ class AnalyticsService:
     @staticmethod
     async def get_difficult_topics(db: AsyncSession) -> list[dict]:
         """Topics where students struggle most — based on lesson progress data."""
+        mv = lesson_difficulty_mv
         stmt = (
-            select(
-                Lesson.title,
-                func.coalesce(func.avg(LessonProgress.completion_percentage), 0).label("avg_completion"),
-                func.count(LessonProgress.id).label("attempts"),
-            )
-            .outerjoin(LessonProgress, LessonProgress.lesson_id == Lesson.id)
-            .group_by(Lesson.id, Lesson.title)
-            .having(func.count(LessonProgress.id) > 0)
-            .order_by(func.avg(LessonProgress.completion_percentage).asc())
+            select(mv.c.title, mv.c.avg_completion, mv.c.attempts)
+            .order_by(mv.c.avg_completion.asc())
             .limit(10)
         )
         rows = (await db.execute(stmt)).all()
@@ -62,36 +81,38 @@ class AnalyticsService:
         ]
 
     @staticmethod
-    async def get_enrollment_trend(db: AsyncSession) -> list[dict]:
-        """Monthly enrollment counts from the enrollments table."""
+    async def get_enrollment_trend(db: AsyncSession, course_ids: list[int] | None = None) -> list[dict]:
+        """Monthly enrollment counts, optionally restricted to some courses."""
+        mv = enrollment_monthly_mv
         stmt = (
+            select(mv.c.month, func.sum(mv.c.enrollments).label("count"))
+            .group_by(mv.c.month)
+            .order_by(mv.c.month)
+            .limit(12)
+        )
+        if course_ids is not None:
+            stmt = stmt.where(mv.c.course_id.in_(course_ids))
+        rows = (await db.execute(stmt)).all()
+        if rows:
+            return [{"month": MONTH_NAMES[r.month.month], "users": int(r.count)} for r in rows]
+
+        if course_ids is not None:
+            return []
+
+        # Fallback: use user registration dates if no enrollments yet
+        stmt2 = (
             select(
-                extract("year", Enrollment.enrolled_at).label("year"),
-                extract("month", Enrollment.enrolled_at).label("month"),
-                func.count(Enrollment.id).label("count"),
+                extract("year", User.created_at).label("year"),
+                extract("month", User.created_at).label("month"),
+                func.count(User.id).label("count"),
             )
             .group_by("year", "month")
             .order_by("year", "month")
             .limit(12)
         )
-        rows = (await db.execute(stmt)).all()
-        month_names = ["", "Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
-        if not rows:
-            # Fallback: use user registration dates if no enrollments yet
-            stmt2 = (
-                select(
-                    extract("year", User.created_at).label("year"),
-                    extract("month", User.created_at).label("month"),
-                    func.count(User.id).label("count"),
-                )
-                .group_by("year", "month")
-                .order_by("year", "month")
-                .limit(12)
-            )
-            rows = (await db.execute(stmt2)).all()
-
+        rows = (await db.execute(stmt2)).all()
         return [
-            {"month": month_names[int(r.month)] if 1 <= int(r.month) <= 12 else str(int(r.month)), "users": r.count}
+            {"month": MONTH_NAMES[int(r.month)] if 1 <= int(r.month) <= 12 else str(int(r.month)), "users": r.count}
             for r in rows
         ]
 
@@ -1,14 +1,22 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.core.security import get_password_hash, verify_password, create_access_token
+from backend.core.config import settings
+from backend.core.security import (
+    create_access_token,
+    get_password_hash_async,
+    verify_and_update_async,
+    verify_password_async,
+)
 from backend.models.user import User
 from backend.models.activity_log import ActivityLog
 from backend.schemas.user import UserCreate, UserOut, Token
+from backend.services.activity_log_service import ActivityLogService
+from backend.services.login_guard import LoginGuard
 
 
 class AuthService:
@@ -30,7 +38,7 @@ class AuthService:
         user = User(
             email=payload.email,
             full_name=payload.full_name,
-            hashed_password=get_password_hash(payload.password),
+            hashed_password=await get_password_hash_async(payload.password),
             role=payload.role,
             status="pending",
             is_active=True,
@@ -41,12 +49,9 @@ class AuthService:
         await db.refresh(user)
 
         # Log registration activity
-        db.add(ActivityLog(
-            user_id=user.id,
-            action="user_registered",
-            detail=f"{user.full_name} registered as {user.role} (pending approval)",
-        ))
-        await db.commit()
+        await ActivityLogService.log_activity(
+            db, user.id, "user_registered", f"{user.full_name} registered as {user.role} (pending approval)"
+        )
 
         return UserOut.model_validate(user)
 
@@ -54,36 +59,53 @@ class AuthService:
     async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
         result = await db.execute(select(User).where(User.email == email))
         user = result.scalar_one_or_none()
-        if not user or not verify_password(password, user.hashed_password):
+        if not user or not await verify_password_async(password, user.hashed_password):
             return None
         return user
 
     @staticmethod
     async def login(db: AsyncSession, email: str, password: str, ip_address: str | None = None) -> Token:
-        # ── Find user first to track login attempts ──
+        # ── Rate limits (in memory — no database or argon2 work when exceeded) ──
+        LoginGuard.check(ip_address, email)
+
         result = await db.execute(select(User).where(User.email == email))
         user = result.scalar_one_or_none()
 
         if not user:
+            LoginGuard.record_failure(email)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        # ── Increment login attempts ──
-        user.login_attempts = (user.login_attempts or 0) + 1
-        await db.commit()
+        # ── Persisted lockout (survives restarts, shared by all workers) ──
+        now = datetime.now(timezone.utc)
+        if user.locked_until and user.locked_until > now:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Account temporarily locked after repeated failed logins. Please try again later.",
+                headers={"Retry-After": str(int((user.locked_until - now).total_seconds()) + 1)},
+            )
 
-        # ── Verify password ──
-        if not verify_password(password, user.hashed_password):
-            db.add(ActivityLog(
-                user_id=user.id,
-                action="login_failed",
-                detail=f"Failed login attempt #{user.login_attempts}",
-                ip_address=ip_address,
-            ))
-            await db.commit()
+        # ── Verify password (off the event loop; flags outdated argon2 parameters) ──
+        valid, new_hash = await verify_and_update_async(password, user.hashed_password)
+        if not valid:
+            failures = LoginGuard.record_failure(email)
+            if LoginGuard.reached_lockout(failures):
+                # Only the lockout itself touches the users row
+                user.login_attempts = failures
+                user.locked_until = now + timedelta(minutes=settings.login_lockout_minutes)
+                await db.commit()
+                await ActivityLogService.log_activity(
+                    db, user.id, "account_locked",
+                    f"Locked for {settings.login_lockout_minutes} min after {failures} failed logins",
+                    ip_address=ip_address, critical=True,
+                )
+            else:
+                await ActivityLogService.log_activity(
+                    db, user.id, "login_failed", f"Failed login attempt #{failures}", ip_address=ip_address
+                )
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
@@ -92,26 +114,18 @@ class AuthService:
 
         # ── Check approval status ──
         if user.status == "pending":
-            db.add(ActivityLog(
-                user_id=user.id,
-                action="login_blocked",
-                detail="Login blocked — account pending approval",
-                ip_address=ip_address,
-            ))
-            await db.commit()
+            await ActivityLogService.log_activity(
+                db, user.id, "login_blocked", "Login blocked — account pending approval", ip_address=ip_address
+            )
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Your account is pending admin approval. Please wait for approval before logging in.",
             )
 
         if user.status == "revoked":
-            db.add(ActivityLog(
-                user_id=user.id,
-                action="login_blocked",
-                detail="Login blocked — account revoked",
-                ip_address=ip_address,
-            ))
-            await db.commit()
+            await ActivityLogService.log_activity(
+                db, user.id, "login_blocked", "Login blocked — account revoked", ip_address=ip_address
+            )
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Your account has been revoked. Contact the administrator.",
@@ -125,18 +139,19 @@ class AuthService:
             )
 
         # ── Success — update last_login, reset login attempts ──
-        user.last_login = datetime.now(timezone.utc)
+        LoginGuard.clear(email)
+        user.last_login = now
         user.login_attempts = 0
+        user.locked_until = None
+        if new_hash:
+            # Rehash on login so cost changes roll out as users sign in
+            user.hashed_password = new_hash
         await db.commit()
 
         # Log successful login
-        db.add(ActivityLog(
-            user_id=user.id,
-            action="login_success",
-            detail=f"{user.full_name} logged in",
-            ip_address=ip_address,
-        ))
-        await db.commit()
+        await ActivityLogService.log_activity(
+            db, user.id, "login_success", f"{user.full_name} logged in", ip_address=ip_address
+        )
 
         access_token = create_access_token(subject=user.id)
         return Token(access_token=access_token)
@@ -149,12 +164,11 @@ class AuthService:
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
 
-        if not verify_password(current_password, user.hashed_password):
+        if not await verify_password_async(current_password, user.hashed_password):
             raise HTTPException(status_code=400, detail="Current password is incorrect")
 
-        user.hashed_password = get_password_hash(new_password)
-        await db.commit()
-
+        user.hashed_password = await get_password_hash_async(new_password)
+        # Audit trail — written in the same transaction as the change
         db.add(ActivityLog(
             user_id=user.id,
             action="password_changed",
@@ -184,11 +198,8 @@ class AuthService:
         await db.commit()
         await db.refresh(user)
 
-        db.add(ActivityLog(
-            user_id=user.id,
-            action="profile_updated",
-            detail=f"{user.full_name} updated their profile",
-        ))
-        await db.commit()
+        await ActivityLogService.log_activity(
+            db, user.id, "profile_updated", f"{user.full_name} updated their profile"
+        )
 
         return UserOut.model_validate(user)
@@ -1,17 +1,22 @@
 import asyncio
+from functools import lru_cache
 from typing import List
 
 from loguru import logger
-from openai import AzureOpenAI
 
 from backend.core.config import settings
 
 
-_client = AzureOpenAI(
-    azure_endpoint=str(settings.azure_openai_endpoint),
-    api_key=settings.azure_openai_key,
-    api_version="2024-02-01",
-)
+@lru_cache(maxsize=1)
+def get_client():
+    """The AzureOpenAI client, created (and the openai SDK imported) on first use."""
+    from openai import AzureOpenAI
+
+    return AzureOpenAI(
+        azure_endpoint=str(settings.azure_openai_endpoint),
+        api_key=settings.azure_openai_key,
+        api_version="2024-02-01",
+    )
 
 
 class AzureOpenAIService:
@@ -23,7 +28,7 @@ class AzureOpenAIService:
     ) -> str:
         def _call() -> str:
             logger.debug("Calling Azure OpenAI chat completion")
-            response = _client.chat.completions.create(
+            response = get_client().chat.completions.create(
                 model=settings.azure_openai_deployment,
                 messages=messages,
                 temperature=temperature,
@@ -38,7 +43,7 @@ class AzureOpenAIService:
     async def embed_texts(texts: List[str]) -> List[List[float]]:
         def _call() -> List[List[float]]:
             logger.debug(f"Calling Azure OpenAI embeddings for {len(texts)} texts")
-            response = _client.embeddings.create(
+            response = get_client().embeddings.create(
                 model=settings.azure_openai_embedding_deployment,
                 input=texts,
             )
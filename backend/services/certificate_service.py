@@ -1,27 +1,123 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
+import multiprocessing
 import os
 import uuid
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
 
 from fastapi import HTTPException
-from sqlalchemy import select, func, desc
+from loguru import logger
+from sqlalchemy import select, func, desc, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
 
+from backend.core.cache import TTLCache
+from backend.core.config import settings
+from backend.core.pagination import decode_cursor, encode_cursor, table_total
+from backend.core.pubsub import bus
+from backend.db.session import AsyncSessionLocal
 from backend.models.certificate import Certificate
 from backend.models.user import User
 from backend.models.course import Course
+from backend.services.certificate_template import get_template
 
 
 MEDIA_CERT_PATH = "backend/media/certificates"
 
+# Bulk re-render: certificates loaded and submitted to the pool per round
+_RERENDER_BATCH = 500
+
+# Rendering pool (spawned, not forked: the parent runs an event loop and
+# threads) and the issuance render tasks in flight
+_pool: ProcessPoolExecutor | None = None
+_tasks: set[asyncio.Task] = set()
+
+VERIFY_INVALIDATION_CHANNEL = "certificates:verify"
+
+
+@dataclass(frozen=True, slots=True)
+class VerificationResult:
+    """A public verification response, encoded once and served from the cache."""
+
+    status_code: int
+    body: bytes
+    etag: str
+    max_age: int
+
+    @classmethod
+    def build(cls, status_code: int, payload: dict, max_age: int) -> "VerificationResult":
+        body = json.dumps(payload, separators=(",", ":")).encode()
+        return cls(status_code, body, f'"{hashlib.sha1(body).hexdigest()}"', max_age)
+
+
+# verification_id -> VerificationResult, unknown ids included (negative
+# caching) so a flood of bad links stays off the database too
+_verify_cache = TTLCache(ttl_seconds=settings.certificate_verify_ttl_seconds, maxsize=100_000)
+bus.subscribe(VERIFY_INVALIDATION_CHANNEL, _verify_cache.invalidate)
+
+
+def _pdf_path(verification_id: str) -> Path:
+    return Path(MEDIA_CERT_PATH) / f"cert_{verification_id}.pdf"
+
+
+def _render_fields():
+    """Columns a render job needs, in render_certificate's argument order."""
+    return (
+        Certificate.verification_id,
+        User.full_name,
+        Course.title,
+        Certificate.ai_mastery_score,
+        Certificate.issued_at,
+    )
+
+
+def render_certificate(
+    verification_id: str,
+    user_name: str,
+    course_title: str,
+    ai_mastery_score: float | None,
+    issued_at: datetime | None,
+) -> str:
+    """Process-pool entry point: write the certificate PDF atomically and return its path."""
+    file_path = _pdf_path(verification_id)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    partial = file_path.with_name(f"{file_path.name}.{os.getpid()}.partial")
+    try:
+        CertificateService._generate_pdf(
+            file_path=str(partial),
+            user_name=user_name,
+            course_title=course_title,
+            verification_id=verification_id,
+            ai_mastery_score=ai_mastery_score,
+            issued_at=issued_at or datetime.now(timezone.utc),
+        )
+        # A lazy render on download and the queued one may race; either copy is complete
+        os.replace(partial, file_path)
+    finally:
+        partial.unlink(missing_ok=True)
+    return str(file_path)
+
+
+def _executor() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=max(1, settings.certificate_render_workers),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
 
 class CertificateService:
 
     # ==============================
-    # AUTO ISSUE + PDF GENERATION
+    # AUTO ISSUE (PDF RENDERED IN THE BACKGROUND)
     # ==============================
     @staticmethod
     async def issue_certificate(
@@ -41,7 +137,7 @@ class CertificateService:
         if existing:
             return existing
 
-        # 2️⃣ Fetch user & course
+        # 2️⃣ Check user & course exist
         user = await db.get(User, user_id)
         course = await db.get(Course, course_id)
 
@@ -50,37 +146,160 @@ class CertificateService:
 
         # 3️⃣ Generate verification ID
         verification_id = uuid.uuid4().hex[:12].upper()
-        file_name = f"cert_{verification_id}.pdf"
-        os.makedirs(MEDIA_CERT_PATH, exist_ok=True)
-        file_path = os.path.join(MEDIA_CERT_PATH, file_name)
 
-        # 4️⃣ Generate PDF
-        CertificateService._generate_pdf(
-            file_path=file_path,
-            user_name=user.full_name,
-            course_title=course.title,
-            verification_id=verification_id,
-            ai_mastery_score=ai_mastery_score,
-        )
-
-        # 5️⃣ Save DB record
+        # 4️⃣ Save DB record — the PDF is drawn later, off the request
         cert = Certificate(
             user_id=user_id,
             course_id=course_id,
-            certificate_url=f"certificates/{file_name}",
+            certificate_url=f"certificates/{_pdf_path(verification_id).name}",
             verification_id=verification_id,
+            student_name=user.full_name,
+            course_title=course.title,
             ai_mastery_score=ai_mastery_score,
+            issued_at=datetime.now(timezone.utc),
+            pdf_status="pending",
         )
 
         db.add(cert)
         await db.commit()
         await db.refresh(cert)
+        # Drop a negative entry in case the id was looked up before it existed
+        bus.publish(VERIFY_INVALIDATION_CHANNEL, verification_id)
+
+        # 5️⃣ Queue rendering on the process pool
+        CertificateService.schedule_render(cert.id)
 
         return cert
 
     # ==============================
-    # PDF GENERATION
+    # PDF RENDERING
     # ==============================
+    @staticmethod
+    def schedule_render(cert_id: int) -> None:
+        task = asyncio.create_task(CertificateService.render(cert_id))
+        _tasks.add(task)
+        task.add_done_callback(_tasks.discard)
+
+    @staticmethod
+    async def render(cert_id: int) -> bool:
+        """Render one certificate on the process pool and record the outcome."""
+        global _pool
+        async with AsyncSessionLocal() as db:
+            fields = (
+                await db.execute(
+                    select(*_render_fields())
+                    .join(User, User.id == Certificate.user_id)
+                    .join(Course, Course.id == Certificate.course_id)
+                    .where(Certificate.id == cert_id)
+                )
+            ).first()
+        if fields is None:
+            return False
+
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(_executor(), render_certificate, *fields)
+            ok = True
+        except BrokenProcessPool:
+            logger.error(f"[Certificates] Render pool died while rendering certificate {cert_id}")
+            _pool = None  # replaced on next use
+            ok = False
+        except Exception as e:
+            logger.error(f"[Certificates] Failed to render certificate {cert_id}: {e}")
+            ok = False
+
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(Certificate)
+                .where(Certificate.id == cert_id)
+                .values(
+                    pdf_status="ready" if ok else "failed",
+                    pdf_rendered_at=datetime.now(timezone.utc) if ok else None,
+                )
+            )
+            await db.commit()
+        return ok
+
+    @staticmethod
+    async def ensure_pdf(cert_id: int, verification_id: str, pdf_status: str) -> Path:
+        """The certificate's PDF, rendered now if the queued render has not produced it."""
+        path = _pdf_path(verification_id)
+        if pdf_status == "ready" and await asyncio.to_thread(path.is_file):
+            return path
+        if not await CertificateService.render(cert_id):
+            raise HTTPException(status_code=503, detail="Certificate could not be generated")
+        return path
+
+    @staticmethod
+    async def rerender_all(workers: int | None = None) -> tuple[int, int]:
+        """
+        Regenerate every certificate PDF (e.g. after a template change) on a
+        dedicated pool of `workers` processes. Returns (rendered, failed).
+        """
+        rendered = failed = 0
+        last_id = 0
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            while True:
+                async with AsyncSessionLocal() as db:
+                    rows = (
+                        await db.execute(
+                            select(Certificate.id, *_render_fields())
+                            .join(User, User.id == Certificate.user_id)
+                            .join(Course, Course.id == Certificate.course_id)
+                            .where(Certificate.id > last_id)
+                            .order_by(Certificate.id)
+                            .limit(_RERENDER_BATCH)
+                        )
+                    ).all()
+                if not rows:
+                    break
+                last_id = rows[-1].id
+
+                results = await asyncio.gather(
+                    *(loop.run_in_executor(pool, render_certificate, *row[1:]) for row in rows),
+                    return_exceptions=True,
+                )
+                ok_ids, failed_ids = [], []
+                for row, result in zip(rows, results):
+                    if isinstance(result, BaseException):
+                        logger.error(f"[Certificates] Failed to render certificate {row.id}: {result}")
+                        failed_ids.append(row.id)
+                    else:
+                        ok_ids.append(row.id)
+
+                async with AsyncSessionLocal() as db:
+                    if ok_ids:
+                        await db.execute(
+                            update(Certificate)
+                            .where(Certificate.id.in_(ok_ids))
+                            .values(pdf_status="ready", pdf_rendered_at=datetime.now(timezone.utc))
+                        )
+                    if failed_ids:
+                        await db.execute(
+                            update(Certificate)
+                            .where(Certificate.id.in_(failed_ids))
+                            .values(pdf_status="failed", pdf_rendered_at=None)
+                        )
+                    await db.commit()
+                rendered += len(ok_ids)
+                failed += len(failed_ids)
+                logger.info(f"[Certificates] Re-rendered {rendered} certificates ({failed} failed)")
+        return rendered, failed
+
+    @staticmethod
+    async def shutdown() -> None:
+        """Wait for queued renders, then stop the pool (application shutdown)."""
+        global _pool
+        if _tasks:
+            await asyncio.gather(*_tasks, return_exceptions=True)
+        if _pool is not None:
+            await asyncio.to_thread(_pool.shutdown)
+            _pool = None
+
     @staticmethod
     def _generate_pdf(
         file_path: str,
@@ -88,61 +307,26 @@ class CertificateService:
         course_title: str,
         verification_id: str,
         ai_mastery_score: float | None,
+        issued_at: datetime,
     ):
-        c = canvas.Canvas(file_path, pagesize=A4)
-        width, height = A4
-
-        c.setFont("Helvetica-Bold", 30)
-        c.drawCentredString(width / 2, height - 120, "Certificate of Completion")
-
-        c.setFont("Helvetica", 18)
-        c.drawCentredString(width / 2, height - 200, "This certifies that")
-
-        c.setFont("Helvetica-Bold", 26)
-        c.drawCentredString(width / 2, height - 240, user_name)
-
-        c.setFont("Helvetica", 18)
-        c.drawCentredString(width / 2, height - 290, "has successfully completed")
-
-        c.setFont("Helvetica-Bold", 22)
-        c.drawCentredString(width / 2, height - 330, course_title)
-
-        if ai_mastery_score:
-            c.setFont("Helvetica", 16)
-            c.drawCentredString(
-                width / 2,
-                height - 380,
-                f"AI Mastery Score: {round(ai_mastery_score, 2)}%"
-            )
-
-        c.setFont("Helvetica", 14)
-        c.drawCentredString(
-            width / 2,
-            height - 420,
-            f"Issued on {datetime.utcnow().strftime('%d %B %Y')}"
-        )
-
-        c.setFont("Helvetica-Oblique", 10)
-        c.drawCentredString(
-            width / 2,
-            height - 460,
-            f"Verification ID: {verification_id}"
+        # Static layout and font metrics are compiled once per worker process
+        get_template().render(
+            file_path=file_path,
+            user_name=user_name,
+            course_title=course_title,
+            verification_id=verification_id,
+            ai_mastery_score=ai_mastery_score,
+            issued_at=issued_at,
         )
 
-        c.save()
-
     # ==============================
     # LIST (ADMIN PANEL)
     # ==============================
     @staticmethod
     async def list_certificates(
-        db: AsyncSession, page: int = 1, page_size: int = 20
+        db: AsyncSession, page: int = 1, page_size: int = 20, cursor: str | None = None
     ) -> dict:
 
-        total = (await db.execute(select(func.count(Certificate.id)))).scalar() or 0
-
-        offset = (page - 1) * page_size
-
         stmt = (
             select(
                 Certificate.id,
@@ -151,18 +335,36 @@ class CertificateService:
                 Certificate.issued_at,
                 Certificate.revoked,
                 Certificate.certificate_url,
+                Certificate.pdf_status,
                 User.full_name.label("student_name"),
                 User.email.label("student_email"),
                 Course.title.label("course_title"),
             )
             .join(User, User.id == Certificate.user_id)
             .join(Course, Course.id == Certificate.course_id)
-            .order_by(desc(Certificate.issued_at))
-            .offset(offset)
-            .limit(page_size)
+            .order_by(desc(Certificate.issued_at), desc(Certificate.id))
+            .limit(page_size + 1)
         )
 
+        # Keyset on (issued_at, id); OFFSET only for legacy page-number clients
+        if cursor:
+            issued_at, cert_id = decode_cursor(cursor)
+            stmt = stmt.where(tuple_(Certificate.issued_at, Certificate.id) < (issued_at, cert_id))
+        elif page > 1:
+            stmt = stmt.offset((page - 1) * page_size)
+
         rows = (await db.execute(stmt)).all()
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        next_cursor = (
+            encode_cursor(rows[-1].issued_at, rows[-1].id)
+            if has_more and rows[-1].issued_at
+            else None
+        )
+
+        total, is_estimate = await table_total(
+            db, "certificates", select(func.count(Certificate.id))
+        )
 
         items = [
             {
@@ -172,6 +374,7 @@ class CertificateService:
                 "issued_at": r.issued_at.isoformat() if r.issued_at else None,
                 "revoked": r.revoked,
                 "certificate_url": r.certificate_url,
+                "pdf_status": r.pdf_status,
                 "student_name": r.student_name,
                 "student_email": r.student_email,
                 "course_title": r.course_title,
@@ -182,10 +385,66 @@ class CertificateService:
         return {
             "certificates": items,
             "total": total,
+            "total_is_estimate": is_estimate,
             "page": page,
             "page_size": page_size,
+            "next_cursor": next_cursor,
         }
 
+    # ==============================
+    # PUBLIC VERIFICATION (CACHED)
+    # ==============================
+    @staticmethod
+    async def verify(db: AsyncSession, verification_id: str) -> VerificationResult:
+        cached = _verify_cache.get(verification_id)
+        if cached is not None:
+            return cached
+
+        row = None
+        # Longer than the column can hold: cannot exist, and not worth a cache slot
+        if len(verification_id) <= 20:
+            # Every selected column is in ix_certificates_verification_covering
+            row = (
+                await db.execute(
+                    select(
+                        Certificate.verification_id,
+                        Certificate.revoked,
+                        Certificate.student_name,
+                        Certificate.course_title,
+                        Certificate.ai_mastery_score,
+                        Certificate.issued_at,
+                    ).where(Certificate.verification_id == verification_id)
+                )
+            ).first()
+
+        if row is None:
+            result = VerificationResult.build(
+                404, {"detail": "Invalid certificate"}, settings.certificate_verify_negative_ttl_seconds
+            )
+        elif row.revoked:
+            result = VerificationResult.build(
+                200,
+                {"valid": False, "reason": "Certificate revoked", "verification_id": verification_id},
+                settings.certificate_verify_ttl_seconds,
+            )
+        else:
+            result = VerificationResult.build(
+                200,
+                {
+                    "valid": True,
+                    "verification_id": row.verification_id,
+                    "student_name": row.student_name,
+                    "course_title": row.course_title,
+                    "ai_mastery_score": row.ai_mastery_score,
+                    "issued_at": row.issued_at.isoformat() if row.issued_at else None,
+                },
+                settings.certificate_verify_ttl_seconds,
+            )
+
+        if len(verification_id) <= 20:
+            _verify_cache.set(verification_id, result, ttl_seconds=result.max_age)
+        return result
+
     # ==============================
     # REVOKE
     # ==============================
@@ -199,5 +458,6 @@ class CertificateService:
 
         cert.revoked = True
         await db.commit()
+        bus.publish(VERIFY_INVALIDATION_CHANNEL, cert.verification_id)
 
         return {"status": "revoked", "id": cert_id}
\ No newline at end of file
@@ -0,0 +1,169 @@
+"""
+Certificate page layout, compiled once per process.
+
+Everything that is the same on every certificate is serialized to PDF bytes
+the first time a certificate is drawn: the catalog, the standard fonts, and
+the static text (headings and connecting lines) as a compressed form
+XObject. A certificate is then those bytes plus a small page stream placing
+the form and its variable fields — name, course, score, date and
+verification id — and the cross-reference table.
+
+reportlab is used for font metrics only. The fonts are the standard
+Helvetica faces with WinAnsiEncoding, so characters outside cp1252 become
+"?" (reportlab drew them as a missing-glyph box).
+"""
+from __future__ import annotations
+
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+
+
+@dataclass(frozen=True)
+class TextLine:
+    font: str
+    size: float
+    y_from_top: float
+
+
+# Static text, centred on the page
+STATIC_LINES: tuple[tuple[TextLine, str], ...] = (
+    (TextLine("Helvetica-Bold", 30, 120), "Certificate of Completion"),
+    (TextLine("Helvetica", 18, 200), "This certifies that"),
+    (TextLine("Helvetica", 18, 290), "has successfully completed"),
+)
+
+# Variable fields, centred on the page
+NAME = TextLine("Helvetica-Bold", 26, 240)
+COURSE = TextLine("Helvetica-Bold", 22, 330)
+SCORE = TextLine("Helvetica", 16, 380)
+ISSUED = TextLine("Helvetica", 14, 420)
+VERIFICATION = TextLine("Helvetica-Oblique", 10, 460)
+
+# Object numbers. All but the page content stream are serialized once;
+# fonts follow from _FIRST_FONT
+_CATALOG, _PAGES, _PAGE, _RESOURCES, _INFO, _FORM, _CONTENTS = range(1, 8)
+_FIRST_FONT = 8
+
+
+def _pdf_string(raw: bytes) -> bytes:
+    escaped = raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)").replace(b"\r", b"\\r")
+    return b"(" + escaped + b")"
+
+
+def _stream(dictionary: bytes, data: bytes) -> bytes:
+    """A stream object body; `dictionary` is given without its closing `>>`."""
+    return dictionary + b" /Length %d >>\nstream\n" % len(data) + data + b"\nendstream"
+
+
+class CertificateTemplate:
+    """The A4 certificate with its static PDF objects and font metrics pre-computed."""
+
+    def __init__(self) -> None:
+        from reportlab.lib.pagesizes import A4
+        from reportlab.pdfbase import pdfmetrics
+
+        self.width, self.height = A4
+        lines = (*(line for line, _ in STATIC_LINES), NAME, COURSE, SCORE, ISSUED, VERIFICATION)
+        fonts = tuple(dict.fromkeys(line.font for line in lines))
+        self._metrics = {name: pdfmetrics.getFont(name) for name in fonts}
+        self._resource_names = {name: b"/F%d" % (i + 1) for i, name in enumerate(fonts)}
+
+        media_box = b"[0 0 %.4f %.4f]" % (self.width, self.height)
+        font_refs = b" ".join(
+            b"%s %d 0 R" % (self._resource_names[name], _FIRST_FONT + i) for i, name in enumerate(fonts)
+        )
+        static_ops = b"\n".join(self._text_op(line, text) for line, text in STATIC_LINES)
+        objects = {
+            _CATALOG: b"<< /Type /Catalog /Pages %d 0 R >>" % _PAGES,
+            _PAGES: b"<< /Type /Pages /Kids [%d 0 R] /Count 1 >>" % _PAGE,
+            _PAGE: (
+                b"<< /Type /Page /Parent %d 0 R /MediaBox %s /Resources %d 0 R /Contents %d 0 R >>"
+                % (_PAGES, media_box, _RESOURCES, _CONTENTS)
+            ),
+            _RESOURCES: (
+                b"<< /ProcSet [/PDF /Text] /Font << %s >> /XObject << /Layout %d 0 R >> >>"
+                % (font_refs, _FORM)
+            ),
+            _INFO: b"<< /Title (Certificate of Completion) >>",
+            _FORM: _stream(
+                b"<< /Type /XObject /Subtype /Form /BBox %s /Resources %d 0 R /Filter /FlateDecode"
+                % (media_box, _RESOURCES),
+                zlib.compress(static_ops, 9),
+            ),
+        }
+        for i, name in enumerate(fonts):
+            objects[_FIRST_FONT + i] = (
+                b"<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>" % name.encode()
+            )
+
+        prefix = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._offsets = {}
+        for number in sorted(objects):
+            self._offsets[number] = len(prefix)
+            prefix += b"%d 0 obj\n%s\nendobj\n" % (number, objects[number])
+        self._prefix = bytes(prefix)
+        self._xref_head = b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 2)
+        self._xref_before = b"".join(b"%010d 00000 n \n" % self._offsets[n] for n in range(1, _CONTENTS))
+        self._xref_after = b"".join(
+            b"%010d 00000 n \n" % self._offsets[n] for n in range(_CONTENTS + 1, len(objects) + 2)
+        )
+        self._trailer = b"trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n" % (
+            len(objects) + 2, _CATALOG, _INFO
+        )
+
+    def _text_op(self, line: TextLine, text: str) -> bytes:
+        raw = text.encode("cp1252", errors="replace")
+        width = self._metrics[line.font].stringWidth(raw.decode("cp1252"), line.size)
+        x, y = (self.width - width) / 2, self.height - line.y_from_top
+        return b"BT %s %g Tf 1 0 0 1 %.2f %.2f Tm %s Tj ET" % (
+            self._resource_names[line.font], line.size, x, y, _pdf_string(raw)
+        )
+
+    def build(
+        self,
+        user_name: str,
+        course_title: str,
+        verification_id: str,
+        ai_mastery_score: float | None,
+        issued_at: datetime,
+    ) -> bytes:
+        """The certificate PDF: the pre-serialized prefix, this page's stream and the xref."""
+        ops = [b"q /Layout Do Q", self._text_op(NAME, user_name), self._text_op(COURSE, course_title)]
+        if ai_mastery_score:
+            ops.append(self._text_op(SCORE, f"AI Mastery Score: {round(ai_mastery_score, 2)}%"))
+        ops.append(self._text_op(ISSUED, f"Issued on {issued_at.strftime('%d %B %Y')}"))
+        ops.append(self._text_op(VERIFICATION, f"Verification ID: {verification_id}"))
+
+        contents_offset = len(self._prefix)
+        contents = b"%d 0 obj\n%s\nendobj\n" % (_CONTENTS, _stream(b"<<", b"\n".join(ops)))
+        return b"".join((
+            self._prefix,
+            contents,
+            self._xref_head,
+            self._xref_before,
+            b"%010d 00000 n \n" % contents_offset,
+            self._xref_after,
+            self._trailer,
+            b"%d\n%%%%EOF\n" % (contents_offset + len(contents)),
+        ))
+
+    def render(
+        self,
+        file_path: str,
+        user_name: str,
+        course_title: str,
+        verification_id: str,
+        ai_mastery_score: float | None,
+        issued_at: datetime,
+    ) -> None:
+        data = self.build(user_name, course_title, verification_id, ai_mastery_score, issued_at)
+        with open(file_path, "wb") as f:
+            f.write(data)
+
+
+@lru_cache(maxsize=1)
+def get_template() -> CertificateTemplate:
+    """The compiled template (one per process, so once per render worker)."""
+    return CertificateTemplate()
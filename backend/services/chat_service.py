@@ -142,5 +142,6 @@ class ChatService:
 
     @staticmethod
     async def get_history(db: AsyncSession, user_id: int, limit: int = 50) -> list[ChatLog]:
-        stmt = select(ChatLog).where(ChatLog.user_id == user_id).order_by(ChatLog.created_at.asc()).limit(limit)
-        return (await db.execute(stmt)).scalars().all()
+        # Newest `limit` messages via the (user_id, created_at) index, returned oldest first
+        stmt = select(ChatLog).where(ChatLog.user_id == user_id).order_by(ChatLog.created_at.desc()).limit(limit)
+        return list(reversed((await db.execute(stmt)).scalars().all()))
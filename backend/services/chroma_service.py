@@ -1,18 +1,29 @@
 from __future__ import annotations
 
 import asyncio
-from typing import List, Tuple
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Tuple
 
-import chromadb
-from chromadb.api.types import Documents, Embeddings, QueryResult
 from loguru import logger
 
 from backend.core.config import settings
 from backend.services.azure_openai_service import AzureOpenAIService
 
+if TYPE_CHECKING:
+    from chromadb.api.types import QueryResult
 
-_client = chromadb.PersistentClient(path=settings.chroma_db_dir)
-_collection = _client.get_or_create_collection(name=settings.chroma_collection_name)
+
+@lru_cache(maxsize=1)
+def get_collection():
+    """Open the persistent Chroma store on first use rather than at import time."""
+    import chromadb
+
+    client = chromadb.PersistentClient(path=settings.chroma_db_dir)
+    return client.get_or_create_collection(name=settings.chroma_collection_name)
+
+
+def _delete_lesson_chunks(collection, lesson_id: int) -> None:
+    collection.delete(where={"lesson_id": str(lesson_id)})
 
 
 class ChromaService:
@@ -22,20 +33,24 @@ class ChromaService:
         chunks: List[str],
     ) -> List[str]:
         """
-        Store chunks in Chroma with Azure OpenAI embeddings and return their IDs.
+        Store chunks in Chroma with Azure OpenAI embeddings and return their IDs,
+        replacing any chunks the lesson had before.
         """
-        if not chunks:
-            return []
-
-        embeddings = await AzureOpenAIService.embed_texts(chunks)
+        embeddings = await AzureOpenAIService.embed_texts(chunks) if chunks else []
         ids = [f"lesson-{lesson_id}-chunk-{i}" for i in range(len(chunks))]
 
         def _add() -> None:
+            collection = get_collection()
+            # The previous file's chunks share these ids (which `add` would
+            # skip) and may outnumber the new ones
+            _delete_lesson_chunks(collection, lesson_id)
+            if not chunks:
+                return
             logger.info(f"Adding {len(chunks)} chunks to Chroma for lesson {lesson_id}")
-            _collection.add(
+            collection.add(
                 ids=ids,
-                documents=Documents(chunks),
-                embeddings=Embeddings(embeddings),
+                documents=list(chunks),
+                embeddings=list(embeddings),
                 metadatas=[{"lesson_id": str(lesson_id), "chunk_index": i} for i in range(len(chunks))],
             )
 
@@ -43,6 +58,41 @@ class ChromaService:
         await loop.run_in_executor(None, _add)
         return ids
 
+    @staticmethod
+    async def copy_lesson_chunks(source_ids: List[str], lesson_id: int) -> List[str] | None:
+        """
+        Re-file already embedded chunks under another lesson, reusing their
+        vectors (no embedding calls), in place of the lesson's previous
+        chunks. None if any source chunk is missing.
+        """
+
+        def _copy() -> List[str] | None:
+            collection = get_collection()
+            if not source_ids:
+                _delete_lesson_chunks(collection, lesson_id)
+                return []
+            source = collection.get(ids=source_ids, include=["documents", "embeddings"])
+            found = {
+                cid: (doc, emb)
+                for cid, doc, emb in zip(source["ids"], source["documents"], source["embeddings"])
+            }
+            if len(found) != len(source_ids):
+                return None
+            ids = [f"lesson-{lesson_id}-chunk-{i}" for i in range(len(source_ids))]
+            # Fetched first: the source may be this lesson's own chunks
+            _delete_lesson_chunks(collection, lesson_id)
+            logger.info(f"Copying {len(ids)} embedded chunks to lesson {lesson_id}")
+            collection.upsert(
+                ids=ids,
+                documents=[found[cid][0] for cid in source_ids],
+                embeddings=[list(found[cid][1]) for cid in source_ids],
+                metadatas=[{"lesson_id": str(lesson_id), "chunk_index": i} for i in range(len(ids))],
+            )
+            return ids
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, _copy)
+
     @staticmethod
     async def query(
         lesson_id: int | None,
@@ -56,10 +106,10 @@ class ChromaService:
 
         query_embedding = (await AzureOpenAIService.embed_texts([question]))[0]
 
-        def _query() -> QueryResult:
+        def _query() -> "QueryResult":
             logger.info(f"Querying Chroma{' for lesson ' + str(lesson_id) if lesson_id else ' globally'}")
             where_filter = {"lesson_id": str(lesson_id)} if lesson_id else None
-            return _collection.query(
+            return get_collection().query(
                 query_embeddings=[query_embedding],
                 n_results=top_k,
                 where=where_filter,
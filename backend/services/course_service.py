@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.models.course import Course, Module, Lesson, LessonProgress
 from backend.models.enrollment import Enrollment
+from backend.core.auth_cache import AuthUser
 from backend.models.user import User
 from backend.schemas.course import (
     CourseCreate,
@@ -59,7 +60,7 @@ class CourseService:
     # ================= LIST COURSES =================
     @staticmethod
     async def list_courses(
-        db: AsyncSession, current_user: User
+        db: AsyncSession, current_user: User | AuthUser
     ) -> List[CourseOut]:
 
         base_options = [
@@ -0,0 +1,389 @@
+from __future__ import annotations
+
+import csv
+import io
+import os
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator
+
+from fastapi import HTTPException
+from loguru import logger
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, Select, select
+from sqlalchemy.sql.elements import ColumnElement
+
+from backend.db.session import read_session
+from backend.models.activity_log import ActivityLog
+from backend.models.chat_log import ChatLog
+from backend.models.course import Course, LessonProgress
+from backend.models.user import User
+
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 2_000
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    columns: list[tuple[str, ColumnElement]]  # (header, column)
+    date_column: ColumnElement  # used for the start/end range filter
+    order_by: list[ColumnElement]
+
+
+EXPORTS: dict[str, ExportSpec] = {
+    "users": ExportSpec(
+        columns=[
+            ("ID", User.id),
+            ("Name", User.full_name),
+            ("Email", User.email),
+            ("Role", User.role),
+            ("Status", User.status),
+            ("Active", User.is_active),
+            ("Last Login", User.last_login),
+            ("Joined", User.created_at),
+        ],
+        date_column=User.created_at,
+        order_by=[User.id],
+    ),
+    "courses": ExportSpec(
+        columns=[
+            ("ID", Course.id),
+            ("Title", Course.title),
+            ("Description", Course.description),
+            ("Published", Course.is_published),
+            ("Created By", Course.created_by_id),
+            ("Created At", Course.created_at),
+        ],
+        date_column=Course.created_at,
+        order_by=[Course.id],
+    ),
+    "activities": ExportSpec(
+        columns=[
+            ("ID", ActivityLog.id),
+            ("Action", ActivityLog.action),
+            ("Detail", ActivityLog.detail),
+            ("Course ID", ActivityLog.related_course_id),
+            ("Timestamp", ActivityLog.created_at),
+        ],
+        date_column=ActivityLog.created_at,
+        order_by=[ActivityLog.created_at.desc(), ActivityLog.id.desc()],
+    ),
+    "lesson_progress": ExportSpec(
+        columns=[
+            ("ID", LessonProgress.id),
+            ("User ID", LessonProgress.user_id),
+            ("Lesson ID", LessonProgress.lesson_id),
+            ("Completion %", LessonProgress.completion_percentage),
+            ("Last Position (s)", LessonProgress.last_position_seconds),
+            ("Completed", LessonProgress.is_completed),
+            ("Last Accessed", LessonProgress.last_accessed),
+        ],
+        date_column=LessonProgress.last_accessed,
+        order_by=[LessonProgress.id],
+    ),
+    "chat_logs": ExportSpec(
+        columns=[
+            ("ID", ChatLog.id),
+            ("User ID", ChatLog.user_id),
+            ("Role", ChatLog.role),
+            ("Message", ChatLog.message),
+            ("Response", ChatLog.response),
+            ("Mode", ChatLog.mode),
+            ("Timestamp", ChatLog.created_at),
+        ],
+        date_column=ChatLog.created_at,
+        order_by=[ChatLog.id],
+    ),
+}
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+# Rows buffered into one Parquet row group / Arrow record batch
+COLUMNAR_ROW_GROUP_SIZE = 64_000
+
+
+def _project(spec: ExportSpec, columns: list[str] | None) -> ExportSpec:
+    """Restrict a spec to the requested column keys (e.g. ["id", "created_at"])."""
+    if not columns:
+        return spec
+    by_key = {col.key: (header, col) for header, col in spec.columns}
+    unknown = [c for c in columns if c not in by_key]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown column(s): {', '.join(unknown)}. Available: {', '.join(by_key)}",
+        )
+    return ExportSpec(
+        columns=[by_key[c] for c in columns],
+        date_column=spec.date_column,
+        order_by=spec.order_by,
+    )
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+        return pyarrow
+    except ImportError:
+        raise HTTPException(
+            status_code=501,
+            detail="Columnar export needs the pyarrow package. Run: pip install pyarrow",
+        )
+
+
+def _arrow_schema(pa, spec: ExportSpec):
+    fields = []
+    for _, col in spec.columns:
+        sa_type = col.type
+        if isinstance(sa_type, Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(sa_type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(sa_type, Float):
+            arrow_type = pa.float64()
+        elif isinstance(sa_type, DateTime):
+            arrow_type = pa.timestamp("us", tz="UTC" if sa_type.timezone else None)
+        elif isinstance(sa_type, Date):
+            arrow_type = pa.date32()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(col.key, arrow_type))
+    return pa.schema(fields)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object whose contents are drained after every batch."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class ExportService:
+    """
+    Streams admin reports straight from a server-side cursor. Only one batch
+    of rows is held in memory at a time, whatever the table size.
+    """
+
+    @staticmethod
+    def get_spec(export_type: str, columns: list[str] | None = None) -> ExportSpec:
+        spec = EXPORTS.get(export_type)
+        if spec is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid export type. Use: {', '.join(EXPORTS)}",
+            )
+        return _project(spec, columns)
+
+    @staticmethod
+    def validate(export_type: str, fmt: str, columns: list[str] | None = None) -> None:
+        """Raise the HTTP error up front — once streaming starts it can't be reported."""
+        ExportService.get_spec(export_type, columns)
+        if fmt != "csv":
+            _require_pyarrow()
+
+    @staticmethod
+    def build_query(
+        spec: ExportSpec, start: datetime | None = None, end: datetime | None = None
+    ) -> Select:
+        stmt = select(*(col for _, col in spec.columns)).order_by(*spec.order_by)
+        if start is not None:
+            stmt = stmt.where(spec.date_column >= start)
+        if end is not None:
+            stmt = stmt.where(spec.date_column < end)
+        return stmt
+
+    @staticmethod
+    async def stream_rows(stmt: Select) -> AsyncIterator[list[tuple]]:
+        """Yield result batches from a server-side cursor."""
+        # The request's session is closed once the endpoint returns, before the
+        # response body is streamed, so the export owns its own (replica) session.
+        async with await read_session() as db:
+            result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            async for partition in result.partitions():
+                yield [tuple(row) for row in partition]
+
+    @staticmethod
+    def stream(
+        export_type: str,
+        fmt: str = "csv",
+        start: datetime | None = None,
+        end: datetime | None = None,
+        columns: list[str] | None = None,
+        gzip: bool = False,
+    ) -> AsyncIterator[bytes]:
+        if fmt == "csv":
+            return ExportService.stream_csv(export_type, start, end, columns, gzip=gzip)
+        return ExportService.stream_columnar(export_type, fmt, start, end, columns)
+
+    @staticmethod
+    async def stream_csv(
+        export_type: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        columns: list[str] | None = None,
+        gzip: bool = False,
+    ) -> AsyncIterator[bytes]:
+        spec = ExportService.get_spec(export_type, columns)
+        stmt = ExportService.build_query(spec, start, end)
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if gzip else None
+
+        def _drain() -> bytes:
+            data = buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate(0)
+            return compressor.compress(data) if compressor else data
+
+        writer.writerow([header for header, _ in spec.columns])
+        yield _drain()
+
+        async for batch in ExportService.stream_rows(stmt):
+            writer.writerows([_csv_value(v) for v in row] for row in batch)
+            chunk = _drain()
+            if chunk:
+                yield chunk
+
+        if compressor:
+            yield compressor.flush()
+
+    @staticmethod
+    async def stream_columnar(
+        export_type: str,
+        fmt: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        columns: list[str] | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Typed Parquet or Arrow IPC stream, one row group per COLUMNAR_ROW_GROUP_SIZE rows."""
+        pa = _require_pyarrow()
+        spec = ExportService.get_spec(export_type, columns)
+        stmt = ExportService.build_query(spec, start, end)
+        schema = _arrow_schema(pa, spec)
+
+        sink = _ChunkSink()
+        writer = ExportService._open_writer(pa, fmt, sink, schema)
+        pending: list[tuple] = []
+
+        async for batch in ExportService.stream_rows(stmt):
+            pending.extend(batch)
+            if len(pending) >= COLUMNAR_ROW_GROUP_SIZE:
+                writer.write_table(_to_table(pa, schema, pending))
+                pending.clear()
+                yield sink.drain()
+
+        if pending:
+            writer.write_table(_to_table(pa, schema, pending))
+        writer.close()
+        yield sink.drain()
+
+    @staticmethod
+    def _open_writer(pa, fmt: str, sink, schema):
+        if fmt == "parquet":
+            return pa.parquet.ParquetWriter(sink, schema, compression="zstd")
+        return pa.ipc.new_stream(sink, schema)
+
+    @staticmethod
+    async def write_partitioned(
+        export_type: str,
+        out_dir: str,
+        fmt: str = "parquet",
+        start: datetime | None = None,
+        end: datetime | None = None,
+        columns: list[str] | None = None,
+    ) -> list[str]:
+        """
+        Write a Hive-style dataset partitioned by month of the export's date
+        column: <out_dir>/<export_type>/month=YYYY-MM/part-0.<ext>.
+        Returns the paths written.
+        """
+        pa = _require_pyarrow()
+        spec = ExportService.get_spec(export_type, columns)
+        # Read in date order so each partition is written exactly once
+        date_key = spec.date_column.key
+        stmt = (
+            ExportService.build_query(spec, start, end)
+            .add_columns(spec.date_column.label("_partition_date"))
+            .order_by(None)
+            .order_by(spec.date_column.asc())
+        )
+        schema = _arrow_schema(pa, spec)
+        ext = EXPORT_FORMATS[fmt][1]
+
+        written: list[str] = []
+        writer = None
+        handle = None
+        current_month: str | None = None
+        pending: list[tuple] = []
+
+        def _flush() -> None:
+            if pending:
+                writer.write_table(_to_table(pa, schema, pending))
+                pending.clear()
+
+        async for batch in ExportService.stream_rows(stmt):
+            for *row, partition_date in batch:
+                month = partition_date.strftime("%Y-%m") if partition_date else "__null__"
+                if month != current_month:
+                    if writer is not None:
+                        _flush()
+                        writer.close()
+                        handle.close()
+                    directory = os.path.join(out_dir, export_type, f"month={month}")
+                    os.makedirs(directory, exist_ok=True)
+                    path = os.path.join(directory, f"part-0.{ext}")
+                    handle = pa.OSFile(path, "wb")
+                    writer = ExportService._open_writer(pa, fmt, handle, schema)
+                    written.append(path)
+                    current_month = month
+                pending.append(tuple(row))
+                if len(pending) >= COLUMNAR_ROW_GROUP_SIZE:
+                    _flush()
+
+        if writer is not None:
+            _flush()
+            writer.close()
+            handle.close()
+        logger.info(f"[Export] Wrote {len(written)} {date_key} partition(s) of {export_type} to {out_dir}")
+        return written
+
+
+def _to_table(pa, schema, rows: list[tuple]):
+    columns = list(zip(*rows)) if rows else [[] for _ in schema]
+    return pa.Table.from_arrays(
+        [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+        schema=schema,
+    )
@@ -1,17 +1,32 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import os
 import shutil
+import time
 import uuid
 from abc import ABC, abstractmethod
 from pathlib import Path
 
+import httpx
 from fastapi import UploadFile
 from loguru import logger
 
 from backend.core.config import settings
 
 
+# Upload extension -> (storage category, Lesson column)
+UPLOAD_CATEGORIES = {
+    "mp4": ("videos", "video_path"),
+    "mov": ("videos", "video_path"),
+    "avi": ("videos", "video_path"),
+    "mp3": ("audio", "audio_path"),
+    "wav": ("audio", "audio_path"),
+    "pdf": ("pdfs", "pdf_path"),
+}
+
+
 # ─── Abstract base ───────────────────────────────────────────────────────────
 
 class StorageBackend(ABC):
@@ -20,6 +35,16 @@ class StorageBackend(ABC):
         """Save a file and return its accessible path/URL string."""
         ...
 
+    @abstractmethod
+    async def save_path(self, path: Path, category: str, filename: str, key: str | None = None) -> str:
+        """
+        Take ownership of a complete file already on local disk (e.g. a
+        finished resumable upload). `key` (the content hash) names the stored
+        object; without it a random name is used. The file is consumed on
+        success and left in place if storing fails, so the caller can retry.
+        """
+        ...
+
 
 # ─── Local storage ────────────────────────────────────────────────────────────
 
@@ -38,8 +63,8 @@ class LocalStorageBackend(StorageBackend):
         target_path = target_dir / filename
 
         try:
-            with target_path.open("wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
+            # Off the event loop: large uploads would otherwise stall the worker
+            await asyncio.to_thread(self._copy, file.file, target_path)
             relative_path = f"uploads/{category}/{filename}"
             logger.info(f"[LocalStorage] Saved {file.filename} → {relative_path}")
             return relative_path
@@ -47,48 +72,158 @@ class LocalStorageBackend(StorageBackend):
             logger.error(f"[LocalStorage] Failed to save file: {e}")
             raise
 
+    @staticmethod
+    def _copy(source, target_path: Path) -> None:
+        with target_path.open("wb") as buffer:
+            shutil.copyfileobj(source, buffer, 1024 * 1024)
+
+    async def save_path(self, path: Path, category: str, filename: str, key: str | None = None) -> str:
+        target_dir = self._get_target_dir(category)
+        target_name = f"{key or uuid.uuid4()}{Path(filename).suffix.lower()}"
+        # Same filesystem as the partial file, so this is a rename, not a copy
+        await asyncio.to_thread(os.replace, path, target_dir / target_name)
+        relative_path = f"uploads/{category}/{target_name}"
+        logger.info(f"[LocalStorage] Stored {filename} → {relative_path}")
+        return relative_path
+
 
 # ─── Cloudinary storage ───────────────────────────────────────────────────────
 
 class CloudinaryStorageBackend(StorageBackend):
+    """
+    Signed uploads to the Cloudinary REST API over a shared httpx client.
+
+    Files go up from disk in `cloudinary_chunk_bytes` pieces (Cloudinary's
+    chunked upload protocol: one X-Unique-Upload-Id, a Content-Range per
+    chunk), so at most `cloudinary_upload_concurrency` chunks are in memory
+    and nothing blocks the event loop. Every chunk except the last goes up
+    concurrently; the last is sent once they are all stored, and its
+    response carries the asset. Transport errors, 429 and 5xx are retried.
+    """
+
+    _RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
     def __init__(self) -> None:
-        try:
-            import cloudinary
-            import cloudinary.uploader
-            cloudinary.config(
-                cloud_name=settings.cloudinary_cloud_name,
-                api_key=settings.cloudinary_api_key,
-                api_secret=settings.cloudinary_api_secret,
-            )
-            self._uploader = cloudinary.uploader
-        except ImportError:
+        if not (
+            settings.cloudinary_cloud_name
+            and settings.cloudinary_api_key
+            and settings.cloudinary_api_secret
+        ):
             raise RuntimeError(
-                "cloudinary package is not installed. "
-                "Run: pip install cloudinary"
+                "STORAGE_TYPE=cloud needs CLOUDINARY_CLOUD_NAME, "
+                "CLOUDINARY_API_KEY and CLOUDINARY_API_SECRET"
             )
+        concurrency = max(1, settings.cloudinary_upload_concurrency)
+        self._upload_url = (
+            f"{settings.cloudinary_api_base.rstrip('/')}/v1_1/"
+            f"{settings.cloudinary_cloud_name}/auto/upload"
+        )
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.cloudinary_timeout_seconds, connect=10.0),
+            limits=httpx.Limits(max_connections=concurrency),
+        )
+        # Shared by every upload in the process: bounds chunks in flight (and in memory)
+        self._slots = asyncio.Semaphore(concurrency)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
 
     async def save(self, file: UploadFile, category: str) -> str:
+        # Spool to disk first so the upload is chunked like any other file
+        FileService.STAGING_DIR.mkdir(parents=True, exist_ok=True)
+        staging = FileService.STAGING_DIR / uuid.uuid4().hex
         try:
-            content = await file.read()
-            result = self._uploader.upload(
-                content,
-                folder=f"lms/{category}",
-                resource_type="auto",
-            )
+            await asyncio.to_thread(LocalStorageBackend._copy, file.file, staging)
+        except Exception:
+            await asyncio.to_thread(staging.unlink, True)
+            raise
+        try:
+            return await self.save_path(staging, category, file.filename or staging.name)
+        except Exception:
+            await asyncio.to_thread(staging.unlink, True)
+            raise
+
+    async def save_path(self, path: Path, category: str, filename: str, key: str | None = None) -> str:
+        try:
+            params = {"folder": f"lms/{category}"}
+            if key:
+                params.update(public_id=key, overwrite="false")
+            result = await self._upload(path, filename, self._sign(params))
             url: str = result["secure_url"]
-            logger.info(f"[CloudinaryStorage] Uploaded {file.filename} → {url}")
-            return url
         except Exception as e:
             logger.error(f"[CloudinaryStorage] Failed to upload file: {e}")
             raise
+        # Only once stored: a failed upload leaves the file for a retry
+        await asyncio.to_thread(path.unlink, True)
+        logger.info(f"[CloudinaryStorage] Uploaded {filename} → {url}")
+        return url
+
+    @staticmethod
+    def _sign(params: dict[str, str]) -> dict[str, str]:
+        signed = {**params, "timestamp": str(int(time.time()))}
+        payload = "&".join(f"{name}={signed[name]}" for name in sorted(signed))
+        signed["signature"] = hashlib.sha1(
+            (payload + settings.cloudinary_api_secret).encode()
+        ).hexdigest()
+        signed["api_key"] = settings.cloudinary_api_key
+        return signed
+
+    async def _upload(self, path: Path, filename: str, form: dict[str, str]) -> dict:
+        size = (await asyncio.to_thread(path.stat)).st_size
+        chunk_bytes = max(settings.cloudinary_chunk_bytes, 5 * 1024 ** 2)  # Cloudinary's minimum
+        spans = [(start, min(start + chunk_bytes, size)) for start in range(0, size, chunk_bytes)] or [(0, 0)]
+        upload_id = uuid.uuid4().hex
+
+        fd = await asyncio.to_thread(os.open, path, os.O_RDONLY)
+        try:
+            async with asyncio.TaskGroup() as group:
+                for start, end in spans[:-1]:
+                    group.create_task(self._send_chunk(fd, start, end, size, upload_id, filename, form))
+            start, end = spans[-1]
+            return await self._send_chunk(fd, start, end, size, upload_id, filename, form)
+        finally:
+            await asyncio.to_thread(os.close, fd)
+
+    async def _send_chunk(
+        self, fd: int, start: int, end: int, size: int, upload_id: str, filename: str, form: dict[str, str]
+    ) -> dict:
+        headers = {"X-Unique-Upload-Id": upload_id}
+        if size:
+            headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+        async with self._slots:
+            data = await asyncio.to_thread(os.pread, fd, end - start, start)
+            for attempt in range(settings.cloudinary_max_retries + 1):
+                if attempt:
+                    await asyncio.sleep(min(2 ** (attempt - 1), 30))
+                last_attempt = attempt >= settings.cloudinary_max_retries
+                try:
+                    response = await self._client.post(
+                        self._upload_url, data=form, files={"file": (filename, data)}, headers=headers
+                    )
+                except httpx.TransportError as e:
+                    if last_attempt:
+                        raise
+                    logger.warning(f"[CloudinaryStorage] Chunk {start}-{end} failed ({e}); retrying")
+                    continue
+                if response.status_code in self._RETRY_STATUSES and not last_attempt:
+                    logger.warning(f"[CloudinaryStorage] Chunk {start}-{end} got {response.status_code}; retrying")
+                    continue
+                response.raise_for_status()
+                return response.json()
 
 
 # ─── FileService facade ───────────────────────────────────────────────────────
 
+_backend: StorageBackend | None = None
+
+
 def _get_storage_backend() -> StorageBackend:
-    if settings.storage_type == "cloud":
-        return CloudinaryStorageBackend()
-    return LocalStorageBackend()
+    # One instance per process, so the cloud backend's HTTP connections and
+    # upload slots are shared by every request
+    global _backend
+    if _backend is None:
+        _backend = CloudinaryStorageBackend() if settings.storage_type == "cloud" else LocalStorageBackend()
+    return _backend
 
 
 class FileService:
@@ -101,6 +236,9 @@ class FileService:
 
     # Keep BASE_DIR for backward compat (used in media route for serving)
     BASE_DIR = Path("backend/uploads")
+    # Uploads in flight: next to (not inside, so never served) the uploads
+    # tree, so moving a finished file into storage is a rename
+    STAGING_DIR = Path("backend/upload_partial")
 
     @classmethod
     def _get_target_dir(cls, category: str) -> Path:
@@ -109,6 +247,13 @@ class FileService:
         target_dir.mkdir(parents=True, exist_ok=True)
         return target_dir
 
+    @classmethod
+    def local_path(cls, stored_path: str) -> Path | None:
+        """Disk location of a locally stored upload ("uploads/..."); None for cloud URLs."""
+        if not stored_path or not stored_path.startswith("uploads/"):
+            return None
+        return cls.BASE_DIR.parent / stored_path
+
     @classmethod
     async def save_upload_file(cls, file: UploadFile, category: str) -> str:
         """
@@ -117,3 +262,17 @@ class FileService:
         """
         backend = _get_storage_backend()
         return await backend.save(file, category)
+
+    @classmethod
+    async def save_local_file(cls, path: Path, category: str, filename: str, key: str | None = None) -> str:
+        """Move a complete file on local disk into storage and return its path or URL."""
+        backend = _get_storage_backend()
+        return await backend.save_path(path, category, filename, key)
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """Release the storage backend's connections (application shutdown)."""
+        global _backend
+        if isinstance(_backend, CloudinaryStorageBackend):
+            await _backend.aclose()
+        _backend = None
@@ -3,15 +3,19 @@ from __future__ import annotations
 from typing import List
 
 from loguru import logger
+from sqlalchemy import delete, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.db.session import AsyncSessionLocal
 from backend.models.course import Lesson
 from backend.models.embedding import LessonChunk
+from backend.models.media_blob import MediaBlob
 from backend.services.chroma_service import ChromaService
+from backend.services.media_store import MediaStore
 from backend.services.speech_service import SpeechService
-import fitz  # PyMuPDF
-from ai_agents.knowledge_processing import run_knowledge_processing_pipeline, chunk_text
+
+
+_RESULT_FIELDS = ("transcript", "cleaned_transcript", "summary", "key_takeaways", "concepts")
 
 
 class KnowledgePipelineService:
@@ -20,6 +24,8 @@ class KnowledgePipelineService:
         """
         Extract text from a PDF file using PyMuPDF.
         """
+        import fitz  # PyMuPDF — imported on first PDF
+
         text = ""
         try:
             # fitz.open is blocking, but for small-medium PDFs it's usually fast enough.
@@ -33,6 +39,67 @@ class KnowledgePipelineService:
             logger.error(f"Failed to extract text from PDF {file_path}: {e}")
             return ""
 
+    @staticmethod
+    async def reuse_results(db: AsyncSession, lesson: Lesson, blob: MediaBlob) -> bool:
+        """
+        Fill a lesson from the pipeline output already produced for the same
+        content: transcript and insights from the blob, chunks and embeddings
+        copied from a lesson that processed it. False when nothing is reusable.
+        """
+        already_chunked = (
+            await db.execute(
+                select(LessonChunk.id)
+                .where(LessonChunk.lesson_id == lesson.id, LessonChunk.content_sha256 == blob.sha256)
+                .limit(1)
+            )
+        ).first() is not None
+        if already_chunked:
+            # Same file uploaded to the same lesson again: its chunks stand
+            for field in _RESULT_FIELDS:
+                setattr(lesson, field, getattr(blob, field))
+            lesson.processed = True
+            lesson.transcript_status = "completed"
+            await db.commit()
+            return True
+
+        source_lesson_id = (
+            await db.execute(
+                select(func.min(LessonChunk.lesson_id)).where(LessonChunk.content_sha256 == blob.sha256)
+            )
+        ).scalar()
+        if source_lesson_id is None:
+            return False
+        source_chunks = (
+            await db.execute(
+                select(LessonChunk)
+                .where(LessonChunk.lesson_id == source_lesson_id, LessonChunk.content_sha256 == blob.sha256)
+                .order_by(LessonChunk.order_index)
+            )
+        ).scalars().all()
+        ids = await ChromaService.copy_lesson_chunks([c.chunk_id for c in source_chunks], lesson.id)
+        if ids is None:
+            return False
+
+        # Chunks of the lesson's previous file use the same chunk ids
+        await db.execute(delete(LessonChunk).where(LessonChunk.lesson_id == lesson.id))
+        for field in _RESULT_FIELDS:
+            setattr(lesson, field, getattr(blob, field))
+        for idx, (cid, chunk) in enumerate(zip(ids, source_chunks)):
+            db.add(
+                LessonChunk(
+                    lesson_id=lesson.id,
+                    chunk_id=cid,
+                    content=chunk.content,
+                    order_index=idx,
+                    content_sha256=blob.sha256,
+                )
+            )
+        lesson.processed = True
+        lesson.transcript_status = "completed"
+        await db.commit()
+        logger.info(f"Reused pipeline results of {blob.sha256[:12]} for lesson {lesson.id}")
+        return True
+
     @staticmethod
     async def process_lesson_recording(lesson_id: int, file_path: str) -> None:
         """
@@ -49,6 +116,22 @@ class KnowledgePipelineService:
                 logger.error(f"Lesson {lesson_id} not found for pipeline")
                 return
 
+            # Same bytes already processed (for this or another lesson): no
+            # transcription, LLM or embedding calls
+            blob = await MediaStore.find_by_path(db, file_path)
+            if blob is not None and blob.pipeline_status == "completed":
+                try:
+                    if await KnowledgePipelineService.reuse_results(db, lesson, blob):
+                        return
+                except Exception as e:
+                    logger.error(f"Reusing pipeline results failed for lesson {lesson_id}: {e}")
+                    await db.rollback()
+                    await db.execute(
+                        update(Lesson).where(Lesson.id == lesson_id).values(transcript_status="failed")
+                    )
+                    await db.commit()
+                    return
+
             # Determine processing type based on file extension
             ext = file_path.lower().split('.')[-1]
             content = ""
@@ -72,6 +155,9 @@ class KnowledgePipelineService:
             await db.refresh(lesson)
 
             try:
+                # Deferred: importing the agents pulls in CrewAI
+                from ai_agents.knowledge_processing import run_knowledge_processing_pipeline, chunk_text
+
                 # Use transcription/content as the basis for AI insights
                 result = await run_knowledge_processing_pipeline(content)
 
@@ -84,6 +170,8 @@ class KnowledgePipelineService:
                 chunks: List[str] = chunk_text(result.cleaned_transcript or content)
                 ids = await ChromaService.add_lesson_chunks(lesson.id, chunks)
 
+                # Chunks of the lesson's previous file use the same chunk ids
+                await db.execute(delete(LessonChunk).where(LessonChunk.lesson_id == lesson.id))
                 for idx, (cid, text) in enumerate(zip(ids, chunks)):
                     db.add(
                         LessonChunk(
@@ -91,9 +179,15 @@ class KnowledgePipelineService:
                             chunk_id=cid,
                             content=text,
                             order_index=idx,
+                            content_sha256=blob.sha256 if blob is not None else None,
                         )
                     )
 
+                if blob is not None:
+                    for field in _RESULT_FIELDS:
+                        setattr(blob, field, getattr(lesson, field))
+                    blob.pipeline_status = "completed"
+
                 lesson.processed = True
                 lesson.transcript_status = "completed"
                 await db.commit()
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import ipaddress
+import math
+from functools import lru_cache
+
+from fastapi import HTTPException, Request, status
+
+from backend.core.config import settings
+from backend.core.rate_limit import store
+
+
+@lru_cache(maxsize=1)
+def _trusted_networks(spec: str) -> tuple[ipaddress.IPv4Network | ipaddress.IPv6Network, ...]:
+    return tuple(ipaddress.ip_network(item.strip(), strict=False) for item in spec.split(",") if item.strip())
+
+
+def _is_trusted(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in _trusted_networks(settings.trusted_proxies))
+
+
+def client_ip(request: Request) -> str | None:
+    """
+    The address a request came from. When the peer is one of
+    `trusted_proxies`, X-Forwarded-For is read right to left, skipping
+    trusted hops, so the first untrusted entry is taken as the client.
+    Entries further left were written by the client itself and are ignored.
+    """
+    peer = request.client.host if request.client else None
+    if peer is None or not _is_trusted(peer):
+        return peer
+    forwarded = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    for hop in reversed(forwarded):
+        if not _is_trusted(hop):
+            return hop
+    return forwarded[0] if forwarded else peer
+
+
+def _email_key(email: str) -> str:
+    return email.strip().lower()
+
+
+def _too_many(retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many login attempts. Please try again later.",
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+class LoginGuard:
+    """
+    Login throttling kept out of Postgres: token buckets per IP and per email,
+    plus a failed-attempt counter per email, all in the rate-limit store.
+    Only the resulting lockout is written to the users row.
+    """
+
+    @staticmethod
+    def check(ip_address: str | None, email: str) -> None:
+        """Reject before any database or argon2 work when a limit is exceeded."""
+        email = _email_key(email)
+        if store.get(f"login:fail:{email}") >= settings.login_max_failures:
+            raise _too_many(settings.login_failure_window_minutes * 60)
+        if ip_address:
+            wait = store.take(
+                f"login:ip:{ip_address}",
+                settings.login_ip_burst,
+                settings.login_ip_per_minute / 60,
+            )
+            if wait:
+                raise _too_many(wait)
+        wait = store.take(
+            f"login:email:{email}",
+            settings.login_email_burst,
+            settings.login_email_per_minute / 60,
+        )
+        if wait:
+            raise _too_many(wait)
+
+    @staticmethod
+    def record_failure(email: str) -> int:
+        """Count a failed attempt; returns the failures within the current window."""
+        return store.incr(
+            f"login:fail:{_email_key(email)}", settings.login_failure_window_minutes * 60
+        )
+
+    @staticmethod
+    def reached_lockout(failures: int) -> bool:
+        return failures >= settings.login_max_failures
+
+    @staticmethod
+    def clear(email: str) -> None:
+        email = _email_key(email)
+        store.reset(f"login:fail:{email}")
+        store.reset(f"login:email:{email}")
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import shutil
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from fastapi import UploadFile
+from loguru import logger
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core import metrics
+from backend.core.config import settings
+from backend.db.session import AsyncSessionLocal
+from backend.models.course import Lesson, Module
+from backend.models.media_blob import MediaBlob
+from backend.services.file_service import FileService
+
+
+_COPY_BLOCK_BYTES = 1024 * 1024
+
+DEDUP_HITS = metrics.Counter("media_dedup_hits_total", "Uploads whose content was already stored")
+DEDUP_BYTES = metrics.Counter("media_dedup_bytes_total", "Bytes not stored again thanks to deduplication")
+
+
+def _spool(source, target: Path) -> tuple[str, int]:
+    """Copy an upload to `target`, hashing it in the same pass."""
+    hasher = hashlib.sha256()
+    size = 0
+    with target.open("wb") as out:
+        while block := source.read(_COPY_BLOCK_BYTES):
+            hasher.update(block)
+            out.write(block)
+            size += len(block)
+    return hasher.hexdigest(), size
+
+
+class MediaStore:
+    """
+    Content-addressed storage: files are stored once per SHA-256 (computed
+    while the upload streams to disk) and shared by every lesson that
+    uploads the same bytes, with a reference count kept on the blob.
+    """
+
+    @staticmethod
+    async def ingest_upload(db: AsyncSession, file: UploadFile, category: str) -> MediaBlob:
+        FileService.STAGING_DIR.mkdir(parents=True, exist_ok=True)
+        staging = FileService.STAGING_DIR / uuid.uuid4().hex
+        try:
+            sha256, size = await asyncio.to_thread(_spool, file.file, staging)
+        except Exception:
+            await asyncio.to_thread(staging.unlink, True)
+            raise
+        try:
+            return await MediaStore.ingest_file(db, staging, category, file.filename or "", sha256, size)
+        except Exception:
+            # Unlike a resumable upload's partial file, nothing can retry this one
+            await asyncio.to_thread(staging.unlink, True)
+            raise
+
+    @staticmethod
+    async def ingest_file(
+        db: AsyncSession, path: Path, category: str, filename: str, sha256: str, size: int
+    ) -> MediaBlob:
+        """Store a complete local file under its hash, or drop it if that content is already stored."""
+        # Touching updated_at keeps the garbage collector off a blob that is
+        # about to be attached again (and waits out a delete in progress)
+        blob = (
+            await db.execute(
+                update(MediaBlob)
+                .where(MediaBlob.sha256 == sha256)
+                .values(updated_at=datetime.now(timezone.utc))
+                .returning(MediaBlob)
+            )
+        ).scalar_one_or_none()
+        if blob is not None:
+            await asyncio.to_thread(path.unlink, True)
+            DEDUP_HITS.inc()
+            DEDUP_BYTES.inc(size)
+            logger.info(f"[MediaStore] {filename} duplicates {blob.stored_path} — not stored again")
+            return blob
+
+        stored_path = await FileService.save_local_file(path, category, filename, key=sha256)
+        # Two uploads of the same new content can race here; both land on the
+        # same hash-named file and the second insert is a no-op
+        await db.execute(
+            pg_insert(MediaBlob)
+            .values(
+                sha256=sha256,
+                stored_path=stored_path,
+                category=category,
+                size=size,
+                ref_count=0,
+                created_at=datetime.now(timezone.utc),
+                updated_at=datetime.now(timezone.utc),
+            )
+            .on_conflict_do_nothing(index_elements=["sha256"])
+        )
+        await db.flush()
+        return await db.get(MediaBlob, sha256, populate_existing=True)
+
+    @staticmethod
+    async def attach(db: AsyncSession, lesson: Lesson, column: str, blob: MediaBlob) -> None:
+        """Point `lesson.<column>` at the blob, moving the reference from the previous file. Caller commits."""
+        previous = getattr(lesson, column)
+        if previous == blob.stored_path:
+            return
+        setattr(lesson, column, blob.stored_path)
+        now = datetime.now(timezone.utc)
+        if column == "video_path":
+            # The renditions belong to the previous video; enqueueing the new
+            # one (when HLS is on) packages it again
+            lesson.hls_status, lesson.hls_path, lesson.hls_progress = None, None, 0
+            lesson.hls_updated_at = now
+        await db.execute(
+            update(MediaBlob)
+            .where(MediaBlob.sha256 == blob.sha256)
+            .values(ref_count=MediaBlob.ref_count + 1, updated_at=now)
+        )
+        if previous:
+            await db.execute(
+                update(MediaBlob)
+                .where(MediaBlob.stored_path == previous)
+                .values(ref_count=MediaBlob.ref_count - 1, updated_at=now)
+            )
+
+    @staticmethod
+    async def find_by_path(db: AsyncSession, stored_path: str) -> MediaBlob | None:
+        result = await db.execute(select(MediaBlob).where(MediaBlob.stored_path == stored_path))
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def release_course(db: AsyncSession, course_id: int) -> None:
+        """Drop the references held by a course's lessons before it is deleted. Caller commits."""
+        rows = (
+            await db.execute(
+                select(Lesson.video_path, Lesson.audio_path, Lesson.pdf_path)
+                .join(Module, Module.id == Lesson.module_id)
+                .where(Module.course_id == course_id)
+            )
+        ).all()
+        references = Counter(path for row in rows for path in row if path)
+        now = datetime.now(timezone.utc)
+        for stored_path, count in references.items():
+            await db.execute(
+                update(MediaBlob)
+                .where(MediaBlob.stored_path == stored_path)
+                .values(ref_count=MediaBlob.ref_count - count, updated_at=now)
+            )
+
+    @staticmethod
+    async def collect_garbage() -> None:
+        """Delete blobs no lesson has referenced for `media_gc_grace_hours`, with their files."""
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.media_gc_grace_hours)
+        async with AsyncSessionLocal() as db:
+            # The row locks make a concurrent ingest of the same content wait
+            # until the files are gone and the rows deleted, so it stores the
+            # file again instead of reusing a blob whose file is being removed
+            removed = (
+                await db.execute(
+                    select(MediaBlob.stored_path, MediaBlob.sha256)
+                    .where(MediaBlob.ref_count <= 0, MediaBlob.updated_at < cutoff)
+                    .with_for_update(skip_locked=True)
+                )
+            ).all()
+            if not removed:
+                return
+
+            for stored_path, sha256 in removed:
+                local = FileService.local_path(stored_path)
+                if local is None:
+                    continue  # cloud copies are left in place
+                await asyncio.to_thread(local.unlink, True)
+                await asyncio.to_thread(shutil.rmtree, FileService.BASE_DIR / "hls" / sha256, True)
+
+            await db.execute(delete(MediaBlob).where(MediaBlob.sha256.in_([sha256 for _, sha256 in removed])))
+            await db.commit()
+        logger.info(f"[MediaStore] Removed {len(removed)} unreferenced blobs")
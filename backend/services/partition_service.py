@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import re
+from datetime import date, datetime, timezone
+
+from loguru import logger
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.config import settings
+from backend.db.session import AsyncSessionLocal
+
+
+# Shared by all workers so only one runs partition maintenance at a time
+_MAINTENANCE_LOCK_KEY = 7_240_312
+
+# Monthly range-partitioned tables -> bound suffix. activity_logs.created_at is
+# timestamptz (bounds pinned to UTC); chat_logs.created_at is a naive UTC timestamp.
+PARTITIONED_TABLES = {
+    "activity_logs": "+00",
+    "chat_logs": "",
+}
+
+_PARTITION_NAME = re.compile(r"_y(\d{4})m(\d{2})$")
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+class PartitionService:
+    """
+    Maintenance for the monthly log partitions created by the
+    partition_log_tables revision: keeps `log_partition_months_ahead` future
+    months in place and applies the retention policy to old ones.
+    """
+
+    @staticmethod
+    async def ensure_future_partitions(db: AsyncSession, today: date | None = None) -> list[str]:
+        """Create any missing partitions from the current month up to the configured horizon."""
+        today = today or datetime.now(timezone.utc).date()
+        current = today.replace(day=1)
+        created = []
+        for table, suffix in PARTITIONED_TABLES.items():
+            # Catch-all so inserts never fail on a month that has no partition yet
+            # (e.g. a fresh database built by create_all)
+            await db.execute(text(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"))
+            for offset in range(settings.log_partition_months_ahead + 1):
+                month = _add_months(current, offset)
+                name = partition_name(table, month)
+                exists = (await db.execute(select(func.to_regclass(name)))).scalar()
+                if exists:
+                    continue
+                # A savepoint so a clash with rows already sitting in the DEFAULT
+                # partition only skips this month instead of aborting the run
+                try:
+                    async with db.begin_nested():
+                        await db.execute(text(
+                            f"CREATE TABLE {name} PARTITION OF {table} "
+                            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00{suffix}') "
+                            f"TO ('{_add_months(month, 1).isoformat()} 00:00:00{suffix}')"
+                        ))
+                    created.append(name)
+                except Exception as e:
+                    logger.error(f"[Partitions] Could not create {name}: {e}")
+        return created
+
+    @staticmethod
+    async def list_partitions(db: AsyncSession, table: str) -> list[tuple[str, date]]:
+        """Monthly partitions of `table` as (name, first day of month), oldest first."""
+        rows = await db.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = to_regclass(:table)"
+            ),
+            {"table": table},
+        )
+        partitions = []
+        for (name,) in rows:
+            match = _PARTITION_NAME.search(name)
+            if match:
+                partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+        return sorted(partitions, key=lambda p: p[1])
+
+    @staticmethod
+    async def apply_retention(db: AsyncSession, today: date | None = None) -> list[str]:
+        """
+        Detach (archive) or drop partitions older than `log_retention_months`.
+        Detached partitions stay as ordinary tables for pg_dump/export and can
+        be re-attached. A retention of 0 keeps everything.
+        """
+        if settings.log_retention_months <= 0:
+            return []
+        today = today or datetime.now(timezone.utc).date()
+        cutoff = _add_months(today.replace(day=1), -settings.log_retention_months)
+        drop = settings.log_retention_action == "drop"
+
+        removed = []
+        for table in PARTITIONED_TABLES:
+            for name, month in await PartitionService.list_partitions(db, table):
+                if month >= cutoff:
+                    break
+                if drop:
+                    await db.execute(text(f"DROP TABLE {name}"))
+                else:
+                    await db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+                removed.append(name)
+        return removed
+
+    @staticmethod
+    async def run_maintenance() -> None:
+        async with AsyncSessionLocal() as db:
+            locked = (
+                await db.execute(select(func.pg_try_advisory_xact_lock(_MAINTENANCE_LOCK_KEY)))
+            ).scalar()
+            if not locked:
+                logger.debug("Partition maintenance already running in another worker — skipping")
+                return
+            created = await PartitionService.ensure_future_partitions(db)
+            removed = await PartitionService.apply_retention(db)
+            await db.commit()
+            if created or removed:
+                action = "dropped" if settings.log_retention_action == "drop" else "detached"
+                logger.info(f"[Partitions] Created {created or 'none'}; {action} {removed or 'none'}")
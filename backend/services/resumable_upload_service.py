@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import binascii
+import fcntl
+import hashlib
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import AsyncIterator
+
+from fastapi import HTTPException, status
+from loguru import logger
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import ClientDisconnect
+
+from backend.core.auth_cache import AuthUser
+from backend.core.config import settings
+from backend.db.session import AsyncSessionLocal
+from backend.models.course import Lesson
+from backend.models.upload import UploadSession
+from backend.services.file_service import UPLOAD_CATEGORIES, FileService
+from backend.services.media_store import MediaStore
+
+
+PARTIAL_DIR = FileService.STAGING_DIR
+
+# Request bodies arrive in ~64 KiB pieces; buffer so each disk write (one
+# thread hop) moves at least this much
+_WRITE_BUFFER_BYTES = 1024 * 1024
+
+HTTP_CHECKSUM_MISMATCH = 460  # status used by the tus checksum extension
+
+# Whole-file SHA-256 carried across the PATCH requests this worker handles:
+# upload id -> (bytes hashed, hasher). A chunk landing on another worker, or
+# after a restart, re-hashes what is already on disk once and carries on.
+_hashers: dict[str, tuple[int, "hashlib._Hash"]] = {}
+
+
+def _partial_path(upload_id: str) -> Path:
+    return PARTIAL_DIR / upload_id
+
+
+def _hash_file(path: Path, length: int) -> "hashlib._Hash":
+    hasher = hashlib.sha256()
+    with path.open("rb") as f:
+        remaining = length
+        while remaining:
+            block = f.read(min(_WRITE_BUFFER_BYTES, remaining))
+            if not block:
+                break
+            hasher.update(block)
+            remaining -= len(block)
+    return hasher
+
+
+def _parse_checksum(header: str | None) -> bytes | None:
+    """`Upload-Checksum: sha256 <base64 digest>` → digest bytes."""
+    if not header:
+        return None
+    algorithm, _, value = header.strip().partition(" ")
+    if algorithm.lower() != "sha256":
+        raise HTTPException(status_code=400, detail="Only sha256 chunk checksums are supported")
+    try:
+        return base64.b64decode(value.strip(), validate=True)
+    except binascii.Error:
+        raise HTTPException(status_code=400, detail="Malformed Upload-Checksum header")
+
+
+def _open_locked(path: Path) -> int:
+    """Open the partial file for writing under an exclusive, non-blocking lock."""
+    fd = os.open(path, os.O_WRONLY)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        raise
+    return fd
+
+
+def _close(fd: int) -> None:
+    fcntl.flock(fd, fcntl.LOCK_UN)
+    os.close(fd)
+
+
+class ResumableUploadService:
+    """
+    tus-style resumable uploads: create a session, PATCH chunks at the
+    current offset, then finalize. Chunks are written with pwrite() into a
+    single partial file, so finalizing moves it into storage with a rename
+    instead of re-assembling pieces. The whole-file SHA-256 is computed as
+    bytes stream in (it is the MediaStore key), and each chunk can carry its
+    own checksum.
+    """
+
+    @staticmethod
+    async def create(
+        db: AsyncSession, user: AuthUser, lesson_id: int, filename: str, size: int
+    ) -> UploadSession:
+        ext = Path(filename).suffix.lstrip(".").lower()
+        if ext not in UPLOAD_CATEGORIES:
+            raise HTTPException(status_code=400, detail="Unsupported file type")
+        if size <= 0 or size > settings.upload_max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Upload size must be between 1 and {settings.upload_max_bytes} bytes",
+            )
+        if await db.get(Lesson, lesson_id) is None:
+            raise HTTPException(status_code=404, detail="Lesson not found")
+
+        session = UploadSession(
+            user_id=user.id,
+            lesson_id=lesson_id,
+            filename=Path(filename).name,
+            category=UPLOAD_CATEGORIES[ext][0],
+            size=size,
+            offset=0,
+            status="open",
+        )
+        db.add(session)
+        await db.flush()
+
+        PARTIAL_DIR.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(_partial_path(session.id).touch)
+        await db.commit()
+        await db.refresh(session)
+        return session
+
+    @staticmethod
+    async def get_owned(db: AsyncSession, upload_id: str, user: AuthUser) -> UploadSession:
+        session = await db.get(UploadSession, upload_id)
+        if session is None or (session.user_id != user.id and user.role != "admin"):
+            raise HTTPException(status_code=404, detail="Upload not found")
+        return session
+
+    @staticmethod
+    async def append(
+        db: AsyncSession,
+        upload_id: str,
+        user: AuthUser,
+        offset: int,
+        checksum_header: str | None,
+        body: AsyncIterator[bytes],
+    ) -> int:
+        """Write one PATCH body at `offset`; returns the new offset."""
+        session = await ResumableUploadService.get_owned(db, upload_id, user)
+        if session.status != "open":
+            raise HTTPException(status_code=409, detail="Upload already finalized")
+        if offset != session.offset:
+            raise HTTPException(
+                status_code=409,
+                detail="Upload-Offset does not match the current offset",
+                headers={"Upload-Offset": str(session.offset)},
+            )
+        size = session.size
+        expected_checksum = _parse_checksum(checksum_header)
+        # Don't hold a pooled connection while the body streams in
+        await db.rollback()
+
+        path = _partial_path(upload_id)
+        try:
+            fd = await asyncio.to_thread(_open_locked, path)
+        except BlockingIOError:
+            raise HTTPException(status_code=409, detail="Another request is writing to this upload")
+        except FileNotFoundError:
+            raise HTTPException(status_code=410, detail="Upload data expired")
+
+        try:
+            # Drop bytes past the committed offset left by an interrupted request
+            await asyncio.to_thread(os.ftruncate, fd, offset)
+            cached = _hashers.get(upload_id)
+            if cached is not None and cached[0] == offset:
+                file_hasher = cached[1].copy()
+            else:
+                file_hasher = await asyncio.to_thread(_hash_file, path, offset)
+            chunk_hasher = hashlib.sha256()
+
+            position = offset
+            buffer = bytearray()
+            disconnected = False
+            try:
+                async for piece in body:
+                    if position + len(buffer) + len(piece) > size:
+                        await asyncio.to_thread(os.ftruncate, fd, offset)
+                        raise HTTPException(
+                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail="Chunk goes past the declared upload size",
+                        )
+                    chunk_hasher.update(piece)
+                    file_hasher.update(piece)
+                    buffer += piece
+                    if len(buffer) >= _WRITE_BUFFER_BYTES:
+                        position += await asyncio.to_thread(os.pwrite, fd, bytes(buffer), position)
+                        buffer.clear()
+            except ClientDisconnect:
+                disconnected = True
+
+            if disconnected and expected_checksum is not None:
+                # A partial chunk can't be verified — discard it
+                await asyncio.to_thread(os.ftruncate, fd, offset)
+                return offset
+            if buffer:
+                position += await asyncio.to_thread(os.pwrite, fd, bytes(buffer), position)
+
+            if not disconnected and expected_checksum is not None and chunk_hasher.digest() != expected_checksum:
+                await asyncio.to_thread(os.ftruncate, fd, offset)
+                raise HTTPException(status_code=HTTP_CHECKSUM_MISMATCH, detail="Checksum mismatch")
+
+            result = await db.execute(
+                update(UploadSession)
+                .where(UploadSession.id == upload_id, UploadSession.offset == offset)
+                .values(offset=position, updated_at=datetime.now(timezone.utc))
+            )
+            await db.commit()
+            if result.rowcount != 1:
+                raise HTTPException(status_code=409, detail="Upload changed concurrently")
+            _hashers[upload_id] = (position, file_hasher)
+            return position
+        finally:
+            await asyncio.to_thread(_close, fd)
+
+    @staticmethod
+    async def finalize(
+        db: AsyncSession, upload_id: str, user: AuthUser, expected_sha256: str | None = None
+    ) -> UploadSession:
+        """Move the complete file into storage and attach it to the lesson."""
+        session = await ResumableUploadService.get_owned(db, upload_id, user)
+        if session.status == "finalizing":
+            raise HTTPException(status_code=409, detail="Upload is already being finalized")
+        if session.status != "open":
+            raise HTTPException(status_code=409, detail="Upload already finalized")
+        if session.offset != session.size:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Upload incomplete: {session.offset} of {session.size} bytes received",
+                headers={"Upload-Offset": str(session.offset)},
+            )
+
+        # Claim the session: a concurrent finalize of the same upload gets a
+        # 409 instead of racing for the partial file
+        claimed = await db.execute(
+            update(UploadSession)
+            .where(
+                UploadSession.id == upload_id,
+                UploadSession.status == "open",
+                UploadSession.offset == UploadSession.size,
+            )
+            .values(status="finalizing", updated_at=datetime.now(timezone.utc))
+        )
+        await db.commit()
+        if claimed.rowcount != 1:
+            raise HTTPException(status_code=409, detail="Upload is already being finalized")
+
+        try:
+            path = _partial_path(upload_id)
+            cached = _hashers.get(upload_id)
+            if cached is not None and cached[0] == session.size:
+                sha256 = cached[1].hexdigest()
+            else:
+                sha256 = (await asyncio.to_thread(_hash_file, path, session.size)).hexdigest()
+            if expected_sha256 and expected_sha256.lower() != sha256:
+                raise HTTPException(status_code=HTTP_CHECKSUM_MISMATCH, detail="Checksum mismatch")
+
+            blob = await MediaStore.ingest_file(
+                db, path, session.category, session.filename, sha256, session.size
+            )
+            _hashers.pop(upload_id, None)
+
+            lesson = await db.get(Lesson, session.lesson_id)
+            if lesson is not None:
+                column = UPLOAD_CATEGORIES[Path(session.filename).suffix.lstrip(".").lower()][1]
+                await MediaStore.attach(db, lesson, column, blob)
+            session.status = "completed"
+            session.sha256 = sha256
+            session.stored_path = blob.stored_path
+            session.updated_at = datetime.now(timezone.utc)
+            await db.commit()
+        except BaseException:
+            # The partial file is still there (storage only consumes it on
+            # success), so the session goes back to open for a retry
+            await db.rollback()
+            await db.execute(
+                update(UploadSession)
+                .where(UploadSession.id == upload_id, UploadSession.status == "finalizing")
+                .values(status="open")
+            )
+            await db.commit()
+            raise
+        await db.refresh(session)
+        return session
+
+    @staticmethod
+    async def abort(db: AsyncSession, upload_id: str, user: AuthUser) -> None:
+        session = await ResumableUploadService.get_owned(db, upload_id, user)
+        if session.status == "finalizing":
+            raise HTTPException(status_code=409, detail="Upload is being finalized")
+        await db.delete(session)
+        await db.commit()
+        _hashers.pop(upload_id, None)
+        await asyncio.to_thread(_partial_path(upload_id).unlink, True)
+
+    @staticmethod
+    async def expire_stale() -> None:
+        """Delete open uploads untouched for `upload_session_ttl_hours`, and their partial files."""
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.upload_session_ttl_hours)
+        async with AsyncSessionLocal() as db:
+            expired = (
+                await db.execute(
+                    delete(UploadSession)
+                    .where(
+                        # "finalizing" too: left behind if a process died mid-finalize
+                        UploadSession.status.in_(("open", "finalizing")),
+                        UploadSession.updated_at < cutoff,
+                    )
+                    .returning(UploadSession.id)
+                )
+            ).scalars().all()
+            await db.commit()
+        for upload_id in expired:
+            _hashers.pop(upload_id, None)
+            await asyncio.to_thread(_partial_path(upload_id).unlink, True)
+        if expired:
+            logger.info(f"[Uploads] Expired {len(expired)} abandoned resumable uploads")
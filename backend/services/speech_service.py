@@ -4,15 +4,22 @@ import uuid
 import tempfile
 from typing import Optional
 
-import azure.cognitiveservices.speech as speechsdk
 from loguru import logger
 
 from backend.core.config import settings
 
 
+def _sdk():
+    """The Azure Speech SDK, imported on first use (it loads a large native library)."""
+    import azure.cognitiveservices.speech as speechsdk
+
+    return speechsdk
+
+
 class SpeechService:
     @staticmethod
-    def _speech_config() -> speechsdk.SpeechConfig:
+    def _speech_config():
+        speechsdk = _sdk()
         config = speechsdk.SpeechConfig(
             subscription=settings.azure_speech_key,
             region=settings.azure_speech_region,
@@ -40,6 +47,7 @@ class SpeechService:
             logger.info("Transcribing audio file: %s", abs_path)
 
             try:
+                speechsdk = _sdk()
                 speech_config = SpeechService._speech_config()
                 audio_config = speechsdk.audio.AudioConfig(filename=abs_path)
                 recognizer = speechsdk.SpeechRecognizer(speech_config=speech_config, audio_config=audio_config)
@@ -95,6 +103,7 @@ class SpeechService:
                 abs_path = os.path.abspath(base_path)
 
                 logger.info("Synthesizing speech to %s", abs_path)
+                speechsdk = _sdk()
                 speech_config = SpeechService._speech_config()
                 speech_config.speech_synthesis_voice_name = voice_name
                 
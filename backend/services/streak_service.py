@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import case, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from backend.core.auth_cache import AuthUser
+from backend.core.config import settings
+from backend.models.user import User
+
+
+_tz = ZoneInfo(settings.streak_timezone)
+
+
+class StreakService:
+    """
+    Learning streaks maintained incrementally on every activity write.
+    `User.last_active_date` holds the last local calendar day with activity,
+    so reading a streak never needs a query.
+    """
+
+    @staticmethod
+    def local_today(now: datetime | None = None) -> date:
+        now = now or datetime.now(timezone.utc)
+        return now.astimezone(_tz).date()
+
+    @staticmethod
+    async def record_activity(
+        db: AsyncSession, user: User | AuthUser, now: datetime | None = None
+    ) -> tuple[int, bool]:
+        """
+        Bump or reset the user's streak for today. Returns (streak, updated).
+        Does not commit — the caller's transaction carries the write, and when
+        `updated` the caller invalidates the user's cached auth state after
+        committing. Repeat activity on the same day is free.
+        """
+        today = StreakService.local_today(now)
+        if user.last_active_date == today:
+            return user.current_streak, False
+
+        yesterday = today - timedelta(days=1)
+        # Compare against the stored date inside the UPDATE so two concurrent
+        # first-heartbeats of the day cannot both increment the streak.
+        stmt = (
+            update(User)
+            .where(
+                User.id == user.id,
+                or_(User.last_active_date.is_(None), User.last_active_date != today),
+            )
+            .values(
+                current_streak=case(
+                    (User.last_active_date == yesterday, User.current_streak + 1),
+                    else_=1,
+                ),
+                last_active_date=today,
+            )
+            .returning(User.current_streak)
+            .execution_options(synchronize_session=False)
+        )
+        streak = (await db.execute(stmt)).scalar_one_or_none()
+        if streak is None:
+            # Another request already recorded today's activity
+            return user.current_streak, False
+        if isinstance(user, User):
+            # Already persisted by the UPDATE — refresh the loaded row without dirtying it
+            set_committed_value(user, "current_streak", streak)
+            set_committed_value(user, "last_active_date", today)
+        return streak, True
+
+    @staticmethod
+    def get_streak(user: User | AuthUser, now: datetime | None = None) -> int:
+        """Current streak from the loaded user row; a missed day reads as 0."""
+        if user.last_active_date is None:
+            return 0
+        today = StreakService.local_today(now)
+        if user.last_active_date < today - timedelta(days=1):
+            return 0
+        return user.current_streak or 0
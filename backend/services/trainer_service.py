@@ -1,13 +1,14 @@
 from __future__ import annotations
 
 from fastapi import HTTPException
-from sqlalchemy import select, func, desc, extract
+from sqlalchemy import select, func, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.models.user import User
 from backend.models.course import Course, Module, Lesson, LessonProgress
 from backend.models.enrollment import Enrollment
 from backend.models.activity_log import ActivityLog
+from backend.services.analytics_service import AnalyticsService
 
 
 class TrainerService:
@@ -215,24 +216,7 @@ class TrainerService:
     # ━━━━ Analytics — Completion ━━━━
     @staticmethod
     async def get_completion_rates(db: AsyncSession, trainer_id: int) -> list[dict]:
-        stmt = (
-            select(
-                Course.id, Course.title,
-                func.coalesce(func.avg(LessonProgress.completion_percentage), 0).label("avg_completion"),
-                func.count(func.distinct(LessonProgress.user_id)).label("students"),
-            )
-            .where(Course.created_by_id == trainer_id)
-            .outerjoin(Module, Module.course_id == Course.id)
-            .outerjoin(Lesson, Lesson.module_id == Module.id)
-            .outerjoin(LessonProgress, LessonProgress.lesson_id == Lesson.id)
-            .group_by(Course.id, Course.title)
-            .order_by(desc("avg_completion"))
-        )
-        rows = (await db.execute(stmt)).all()
-        return [
-            {"id": r.id, "name": r.title, "completion": round(float(r.avg_completion), 1), "students": r.students}
-            for r in rows
-        ]
+        return await AnalyticsService.get_course_completion_rates(db, trainer_id=trainer_id)
 
     # ━━━━ Analytics — Enrollment Trend ━━━━
     @staticmethod
@@ -244,23 +228,7 @@ class TrainerService:
         if not course_ids:
             return []
 
-        stmt = (
-            select(
-                extract("year", Enrollment.enrolled_at).label("year"),
-                extract("month", Enrollment.enrolled_at).label("month"),
-                func.count(Enrollment.id).label("count"),
-            )
-            .where(Enrollment.course_id.in_(list(course_ids)))
-            .group_by("year", "month")
-            .order_by("year", "month")
-            .limit(12)
-        )
-        rows = (await db.execute(stmt)).all()
-        month_names = ["", "Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
-        return [
-            {"month": month_names[int(r.month)] if 1 <= int(r.month) <= 12 else str(int(r.month)), "users": r.count}
-            for r in rows
-        ]
+        return await AnalyticsService.get_enrollment_trend(db, course_ids=list(course_ids))
 
     # ━━━━ Activities ━━━━
     @staticmethod
@@ -0,0 +1,435 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import shutil
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from loguru import logger
+from sqlalchemy import func, select, update
+
+from backend.core import metrics
+from backend.core.config import settings
+from backend.db.session import AsyncSessionLocal
+from backend.models.course import Lesson
+from backend.services.file_service import FileService
+
+
+HLS_DIR = "hls"
+MASTER_PLAYLIST = "master.m3u8"
+PARTIAL_SUFFIX = ".partial"
+
+# Progress is written at most this often (it doubles as the job heartbeat)
+_PROGRESS_WRITE_SECONDS = 5.0
+
+HLS_JOBS_COMPLETED = metrics.Counter("hls_jobs_completed_total", "Videos packaged into HLS renditions")
+HLS_JOBS_FAILED = metrics.Counter("hls_jobs_failed_total", "HLS transcodes that failed")
+HLS_TRANSCODE_SECONDS = metrics.Histogram(
+    "hls_transcode_seconds",
+    "Wall time of one HLS transcode (all renditions)",
+    buckets=(10, 30, 60, 120, 300, 600, 1200, 2400, 3600, 7200),
+)
+
+
+@dataclass(frozen=True)
+class Rendition:
+    height: int
+    video_kbps: int
+    audio_kbps: int = 128
+
+
+def parse_renditions(spec: str) -> list[Rendition]:
+    """Parse "360:800,720:2800" (height:video kbps) into renditions, lowest first."""
+    renditions = []
+    for item in spec.split(","):
+        height, _, kbps = item.strip().partition(":")
+        renditions.append(Rendition(int(height), int(kbps)))
+    return sorted(renditions, key=lambda r: r.height)
+
+
+def build_ffmpeg_command(
+    source: Path,
+    out_dir: Path,
+    renditions: list[Rendition],
+    has_audio: bool,
+    segment_seconds: int,
+) -> list[str]:
+    """
+    One ffmpeg run decoding the source once and encoding every rendition,
+    with keyframes aligned on segment boundaries so players can switch
+    bitrate between any two segments.
+    """
+    count = len(renditions)
+    split = f"[0:v]split={count}" + "".join(f"[v{i}]" for i in range(count))
+    scales = [f"[v{i}]scale=-2:{r.height}[v{i}out]" for i, r in enumerate(renditions)]
+
+    cmd = [
+        settings.ffmpeg_path, "-hide_banner", "-nostdin", "-y",
+        "-i", str(source),
+        "-filter_complex", ";".join([split, *scales]),
+    ]
+    for i, r in enumerate(renditions):
+        cmd += [
+            "-map", f"[v{i}out]",
+            f"-c:v:{i}", "libx264",
+            f"-b:v:{i}", f"{r.video_kbps}k",
+            f"-maxrate:v:{i}", f"{int(r.video_kbps * 1.07)}k",
+            f"-bufsize:v:{i}", f"{int(r.video_kbps * 1.5)}k",
+        ]
+        if has_audio:
+            cmd += ["-map", "0:a:0", f"-c:a:{i}", "aac", f"-b:a:{i}", f"{r.audio_kbps}k"]
+    if has_audio:
+        cmd += ["-ac", "2"]
+    stream_map = " ".join(f"v:{i},a:{i}" if has_audio else f"v:{i}" for i in range(count))
+    cmd += [
+        "-preset", "veryfast",
+        "-sc_threshold", "0",
+        "-force_key_frames", f"expr:gte(t,n_forced*{segment_seconds})",
+        "-f", "hls",
+        "-hls_time", str(segment_seconds),
+        "-hls_playlist_type", "vod",
+        "-hls_flags", "independent_segments",
+        "-hls_segment_filename", str(out_dir / "v%v" / "seg_%05d.ts"),
+        "-master_pl_name", MASTER_PLAYLIST,
+        "-var_stream_map", stream_map,
+        "-progress", "pipe:1",
+        "-nostats",
+        str(out_dir / "v%v" / "index.m3u8"),
+    ]
+    return cmd
+
+
+class TranscodeService:
+    """
+    Offline HLS packaging of uploaded lecture videos.
+
+    The lessons table is the job queue (hls_status = queued → processing →
+    ready | failed), so jobs survive restarts and every app process can run
+    `hls_workers` ffmpeg jobs: a job is claimed with FOR UPDATE SKIP LOCKED,
+    progress is written back as it runs, and a job whose progress stops for
+    `hls_stale_after_seconds` (its process died) is queued again.
+    """
+
+    _tasks: list[asyncio.Task] = []
+    _wakeup: asyncio.Event | None = None
+    _running: set[int] = set()
+
+    @classmethod
+    def start(cls) -> None:
+        if not settings.hls_enabled or cls._tasks:
+            return
+        if shutil.which(settings.ffmpeg_path) is None or shutil.which(settings.ffprobe_path) is None:
+            logger.error("[Transcode] ffmpeg/ffprobe not found — HLS packaging disabled")
+            return
+        cls._wakeup = asyncio.Event()
+        cls._tasks = [
+            asyncio.create_task(cls._worker(), name=f"hls-transcode-{i}")
+            for i in range(max(1, settings.hls_workers))
+        ]
+        logger.info(f"[Transcode] Started {len(cls._tasks)} HLS worker(s)")
+
+    @classmethod
+    async def stop(cls) -> None:
+        """Stop the workers (killing ffmpeg) and put interrupted jobs back in the queue."""
+        if not cls._tasks:
+            return
+        for task in cls._tasks:
+            task.cancel()
+        await asyncio.gather(*cls._tasks, return_exceptions=True)
+        cls._tasks = []
+        if cls._running:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(Lesson)
+                    .where(Lesson.id.in_(cls._running), Lesson.hls_status == "processing")
+                    .values(hls_status="queued")
+                )
+                await db.commit()
+            cls._running.clear()
+        logger.info("[Transcode] Stopped")
+
+    @classmethod
+    def running_jobs(cls) -> int:
+        return len(cls._running)
+
+    @staticmethod
+    async def enqueue(lesson_id: int) -> bool:
+        """Queue a lesson's video for packaging. Only locally stored videos can be transcoded."""
+        if not settings.hls_enabled:
+            return False
+        async with AsyncSessionLocal() as db:
+            lesson = await db.get(Lesson, lesson_id)
+            if lesson is None or FileService.local_path(lesson.video_path or "") is None:
+                return False
+            lesson.hls_updated_at = datetime.now(timezone.utc)
+            # Deduplicated uploads share the stored video, so its renditions too
+            packaged = (
+                await db.execute(
+                    select(Lesson.hls_path)
+                    .where(
+                        Lesson.video_path == lesson.video_path,
+                        Lesson.hls_status == "ready",
+                        Lesson.id != lesson.id,
+                    )
+                    .limit(1)
+                )
+            ).scalar_one_or_none()
+            if packaged:
+                lesson.hls_status, lesson.hls_progress, lesson.hls_path = "ready", 100, packaged
+                await db.commit()
+                return True
+            lesson.hls_status = "queued"
+            lesson.hls_progress = 0
+            await db.commit()
+        if TranscodeService._wakeup is not None:
+            TranscodeService._wakeup.set()
+        return True
+
+    # ─── Worker loop ──────────────────────────────────────────────────────────
+
+    @classmethod
+    async def _worker(cls) -> None:
+        while True:
+            try:
+                job = await cls._claim()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[Transcode] Could not claim a job: {e}")
+                job = None
+
+            if job is None:
+                cls._wakeup.clear()
+                try:
+                    await asyncio.wait_for(cls._wakeup.wait(), settings.hls_poll_interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            lesson_id, video_path = job
+            cls._running.add(lesson_id)
+            try:
+                await cls._transcode(lesson_id, video_path)
+            except asyncio.CancelledError:
+                # Left in _running so stop() puts it back in the queue
+                raise
+            except Exception as e:
+                HLS_JOBS_FAILED.inc()
+                logger.error(f"[Transcode] Lesson {lesson_id} failed: {e}")
+                try:
+                    await cls._finish(lesson_id, video_path, "failed")
+                except Exception as e:
+                    logger.error(f"[Transcode] Could not mark lesson {lesson_id} failed: {e}")
+            cls._running.discard(lesson_id)
+
+    @classmethod
+    async def _claim(cls) -> tuple[int, str] | None:
+        async with AsyncSessionLocal() as db:
+            stale_before = datetime.now(timezone.utc) - timedelta(seconds=settings.hls_stale_after_seconds)
+            stale = (
+                update(Lesson)
+                .where(Lesson.hls_status == "processing", Lesson.hls_updated_at < stale_before)
+                .values(hls_status="queued")
+            )
+            if cls._running:
+                # Jobs running here are alive whatever their heartbeat says
+                stale = stale.where(Lesson.id.not_in(cls._running))
+            requeued = (await db.execute(stale)).rowcount
+            next_job = (
+                select(Lesson.id)
+                .where(Lesson.hls_status == "queued")
+                .order_by(Lesson.id)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+            row = (
+                await db.execute(
+                    update(Lesson)
+                    .where(Lesson.id == next_job)
+                    .values(hls_status="processing", hls_progress=0, hls_updated_at=func.now())
+                    .returning(Lesson.id, Lesson.video_path)
+                )
+            ).first()
+            await db.commit()
+        if requeued:
+            # The processes that ran them died and left their working directories
+            await asyncio.to_thread(_remove_abandoned_work_dirs)
+        return (row[0], row[1]) if row else None
+
+    @staticmethod
+    async def _probe(source: Path) -> tuple[float, int, bool]:
+        """Duration (seconds), video height and whether there is an audio stream."""
+        proc = await asyncio.create_subprocess_exec(
+            settings.ffprobe_path, "-v", "error", "-print_format", "json",
+            "-show_entries", "format=duration:stream=codec_type,height",
+            str(source),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await proc.communicate()
+        if proc.returncode != 0:
+            raise RuntimeError(f"ffprobe failed: {stderr.decode(errors='replace')[-500:]}")
+        info = json.loads(stdout)
+        streams = info.get("streams", [])
+        heights = [s.get("height") or 0 for s in streams if s.get("codec_type") == "video"]
+        if not heights:
+            raise RuntimeError("no video stream")
+        has_audio = any(s.get("codec_type") == "audio" for s in streams)
+        return float(info.get("format", {}).get("duration") or 0), max(heights), has_audio
+
+    @classmethod
+    async def _transcode(cls, lesson_id: int, video_path: str) -> None:
+        source = FileService.local_path(video_path or "")
+        if source is None or not source.is_file():
+            raise RuntimeError(f"source video {video_path!r} not found")
+
+        duration, height, has_audio = await cls._probe(source)
+        ladder = parse_renditions(settings.hls_renditions)
+        # No upscaling: rungs above the source height are skipped
+        renditions = [r for r in ladder if r.height <= height] if height else ladder
+        if not renditions:
+            # Source below the smallest rung: a single rendition at its own height
+            renditions = [Rendition(height - height % 2, ladder[0].video_kbps)]
+
+        hls_root = FileService.BASE_DIR / HLS_DIR
+        # One directory per run: a requeued job's new run never shares (or
+        # deletes) the files of a run that is still going
+        work_dir = hls_root / f"{source.stem}.{uuid.uuid4().hex[:8]}{PARTIAL_SUFFIX}"
+        work_dir.mkdir(parents=True)
+
+        cmd = build_ffmpeg_command(source, work_dir, renditions, has_audio, settings.hls_segment_seconds)
+        started = time.monotonic()
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        # Drain stderr concurrently so ffmpeg never blocks on a full pipe
+        stderr_task = asyncio.create_task(proc.stderr.read())
+        try:
+            await cls._follow_progress(lesson_id, video_path, proc.stdout, duration)
+            await proc.wait()
+            stderr = await stderr_task
+        except BaseException:
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+            stderr_task.cancel()
+            shutil.rmtree(work_dir, ignore_errors=True)
+            raise
+        if proc.returncode != 0:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            raise RuntimeError(f"ffmpeg exited {proc.returncode}: {stderr.decode(errors='replace')[-500:]}")
+
+        hls_path = f"uploads/{HLS_DIR}/{source.stem}/{MASTER_PLAYLIST}"
+        if not await cls._finish(lesson_id, video_path, "ready", hls_path, work_dir):
+            shutil.rmtree(work_dir, ignore_errors=True)
+            logger.info(f"[Transcode] Lesson {lesson_id}: video replaced during transcode — output discarded")
+            return
+        HLS_TRANSCODE_SECONDS.observe(time.monotonic() - started)
+        HLS_JOBS_COMPLETED.inc()
+        logger.info(
+            f"[Transcode] Lesson {lesson_id}: {len(renditions)} renditions "
+            f"({', '.join(f'{r.height}p' for r in renditions)}) → {hls_path}"
+        )
+
+    @staticmethod
+    async def _follow_progress(
+        lesson_id: int, video_path: str, stdout: asyncio.StreamReader, duration: float
+    ) -> None:
+        """
+        Turn ffmpeg's `-progress` key=value stream into hls_progress updates.
+        hls_updated_at is written every _PROGRESS_WRITE_SECONDS even when the
+        percentage is unknown or unchanged, since it is the job's heartbeat.
+        """
+        last_written, percent = time.monotonic(), 0
+        async for raw in stdout:
+            key, _, value = raw.decode(errors="replace").strip().partition("=")
+            if key == "out_time_us" and duration > 0 and value.isdigit():
+                percent = min(99, int(int(value) / 1_000_000 / duration * 100))
+            now = time.monotonic()
+            if now - last_written < _PROGRESS_WRITE_SECONDS:
+                continue
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(Lesson)
+                    .where(
+                        Lesson.id == lesson_id,
+                        Lesson.hls_status == "processing",
+                        Lesson.video_path == video_path,
+                    )
+                    .values(hls_progress=percent, hls_updated_at=func.now())
+                )
+                await db.commit()
+            last_written = now
+
+    @staticmethod
+    async def _finish(
+        lesson_id: int,
+        video_path: str,
+        status: str,
+        hls_path: str | None = None,
+        work_dir: Path | None = None,
+    ) -> bool:
+        """
+        Record the outcome of the job claimed for `video_path`, moving a ready
+        job's output from `work_dir` into place. Returns False, changing
+        nothing, when the lesson is no longer processing that video (it was
+        re-uploaded or requeued meanwhile).
+        """
+        async with AsyncSessionLocal() as db:
+            previous = (
+                await db.execute(
+                    select(Lesson.hls_path)
+                    .where(
+                        Lesson.id == lesson_id,
+                        Lesson.hls_status == "processing",
+                        Lesson.video_path == video_path,
+                    )
+                    .with_for_update()
+                )
+            ).first()
+            if previous is None:
+                return False
+            previous = previous[0]
+
+            values = {"hls_status": status, "hls_updated_at": datetime.now(timezone.utc)}
+            if status == "ready":
+                out_dir = FileService.local_path(hls_path).parent
+                # Moved while the row is locked, so a re-upload can't slip in between
+                await asyncio.to_thread(shutil.rmtree, out_dir, True)
+                await asyncio.to_thread(work_dir.rename, out_dir)
+                values.update(hls_progress=100, hls_path=hls_path)
+            await db.execute(update(Lesson).where(Lesson.id == lesson_id).values(**values))
+            await db.commit()
+            still_used = previous is not None and (
+                await db.execute(select(Lesson.id).where(Lesson.hls_path == previous).limit(1))
+            ).first() is not None
+        # A replaced video's renditions, unless another lesson shares them
+        if status == "ready" and previous and previous != hls_path and not still_used:
+            old_dir = FileService.local_path(previous)
+            if old_dir is not None:
+                await asyncio.to_thread(shutil.rmtree, old_dir.parent, True)
+        return True
+
+
+def _remove_abandoned_work_dirs() -> None:
+    """Delete run directories no ffmpeg has written to for `hls_stale_after_seconds`."""
+    hls_root = FileService.BASE_DIR / HLS_DIR
+    if not hls_root.is_dir():
+        return
+    cutoff = time.time() - settings.hls_stale_after_seconds
+    for work_dir in hls_root.glob(f"*{PARTIAL_SUFFIX}"):
+        try:
+            # Segments land in the per-rendition subdirectories
+            newest = max(entry.stat().st_mtime for entry in (work_dir, *work_dir.iterdir()))
+        except FileNotFoundError:
+            continue  # finished or removed by its run meanwhile
+        if newest < cutoff:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+metrics.Gauge("hls_jobs_running", "HLS transcodes running in this worker", TranscodeService.running_jobs)
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Callable
+
+from loguru import logger
+
+
+def _build_crewai_agents() -> None:
+    import ai_agents.knowledge_processing  # noqa: F401
+    from ai_agents.registry import build_all
+
+    build_all()
+
+
+def _import_pdf_libraries() -> None:
+    import fitz  # noqa: F401
+    import reportlab.pdfgen.canvas  # noqa: F401
+
+
+def _steps() -> list[tuple[str, Callable[[], object]]]:
+    from backend.services.azure_openai_service import get_client
+    from backend.services.chroma_service import get_collection
+    from backend.services.speech_service import _sdk
+
+    return [
+        ("azure-openai", get_client),
+        ("chroma", get_collection),
+        ("azure-speech", _sdk),
+        ("pdf", _import_pdf_libraries),
+        ("crewai", _build_crewai_agents),
+    ]
+
+
+class WarmupService:
+    """
+    Heavy SDKs (Chroma, CrewAI, OpenAI, Azure Speech, PyMuPDF, ReportLab) are
+    imported on first use. Workers that serve AI features can opt into loading
+    them right after startup instead (WARMUP_ON_STARTUP), off the event loop.
+    """
+
+    @staticmethod
+    async def run() -> None:
+        for name, step in _steps():
+            start = time.perf_counter()
+            try:
+                await asyncio.to_thread(step)
+                logger.info(f"[Warmup] {name} ready in {time.perf_counter() - start:.2f}s")
+            except Exception as e:
+                logger.warning(f"[Warmup] {name} failed: {e}")
@@ -0,0 +1,114 @@
+"""
+Certificates per second for a cohort-wide batch: the original per-certificate
+page drawing versus the compiled template (backend.services.certificate_template),
+serially and on a process pool like `manage rerender-certificates`.
+
+    python -m benchmarks.certificate_render --cohort 500 --workers 4
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks import _env
+
+_env.apply()
+
+from backend.services.certificate_template import get_template  # noqa: E402
+
+
+def _legacy(file_path, user_name, course_title, verification_id, ai_mastery_score, issued_at) -> None:
+    """The page as CertificateService._generate_pdf drew it before the template."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    c = canvas.Canvas(file_path, pagesize=A4)
+    width, height = A4
+    c.setFont("Helvetica-Bold", 30)
+    c.drawCentredString(width / 2, height - 120, "Certificate of Completion")
+    c.setFont("Helvetica", 18)
+    c.drawCentredString(width / 2, height - 200, "This certifies that")
+    c.setFont("Helvetica-Bold", 26)
+    c.drawCentredString(width / 2, height - 240, user_name)
+    c.setFont("Helvetica", 18)
+    c.drawCentredString(width / 2, height - 290, "has successfully completed")
+    c.setFont("Helvetica-Bold", 22)
+    c.drawCentredString(width / 2, height - 330, course_title)
+    if ai_mastery_score:
+        c.setFont("Helvetica", 16)
+        c.drawCentredString(width / 2, height - 380, f"AI Mastery Score: {round(ai_mastery_score, 2)}%")
+    c.setFont("Helvetica", 14)
+    c.drawCentredString(width / 2, height - 420, f"Issued on {issued_at.strftime('%d %B %Y')}")
+    c.setFont("Helvetica-Oblique", 10)
+    c.drawCentredString(width / 2, height - 460, f"Verification ID: {verification_id}")
+    c.save()
+
+
+def _template(*fields) -> None:
+    get_template().render(*fields)
+
+
+def _cohort(size: int, out_dir: Path) -> list[tuple]:
+    issued_at = datetime.now(timezone.utc)
+    return [
+        (
+            str(out_dir / f"cert_{i:06d}.pdf"),
+            f"Learner Number {i}",
+            "Applied Machine Learning for Engineers",
+            f"{i:012X}",
+            60 + (i % 40),
+            issued_at,
+        )
+        for i in range(size)
+    ]
+
+
+def _render_batch(render, batch: list[tuple]) -> int:
+    for fields in batch:
+        render(*fields)
+    return len(batch)
+
+
+def _measure(label: str, render, cohort: list[tuple], pool: ProcessPoolExecutor | None, repeat: int) -> None:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if pool is None:
+            _render_batch(render, cohort)
+        else:
+            workers = pool._max_workers
+            list(pool.map(_render_batch, [render] * workers, [cohort[i::workers] for i in range(workers)]))
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:>22}: {len(cohort) / best:8.1f} certificates/s  (best of {repeat}: {best:6.2f} s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Certificate PDF rendering throughput")
+    parser.add_argument("--cohort", type=int, default=500, help="Certificates per batch")
+    parser.add_argument("--workers", type=int, default=4, help="Processes for the pooled runs")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per variant; the fastest is reported")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cohort = _cohort(args.cohort, Path(tmp))
+        # Import reportlab and compile the template outside the measurement
+        _template(*cohort[0])
+
+        print(f"cohort of {args.cohort}")
+        _measure("legacy, serial", _legacy, cohort, None, args.repeat)
+        _measure("template, serial", _template, cohort, None, args.repeat)
+
+        with ProcessPoolExecutor(args.workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            # Start every worker (and compile its template) before timing
+            list(pool.map(_render_batch, [_template] * args.workers, [cohort[:1]] * args.workers))
+            _measure(f"legacy, {args.workers} workers", _legacy, cohort, pool, args.repeat)
+            _measure(f"template, {args.workers} workers", _template, cohort, pool, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
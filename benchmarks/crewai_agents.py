@@ -0,0 +1,54 @@
+"""
+Per-call overhead of the CrewAI agent wiring in ai_agents: building a fresh
+Agent/Task/Crew on every call (the old behaviour) versus the shared
+definitions from ai_agents.registry, and the bypass (CREWAI_AGENTS_ENABLED=false).
+
+    python -m benchmarks.crewai_agents --calls 50
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from benchmarks import _env
+
+_env.apply()
+
+from ai_agents import registry  # noqa: E402
+from backend.core.config import settings  # noqa: E402
+
+
+def _measure(label: str, fn, calls: int) -> None:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i in range(calls):
+        fn(list(registry.AGENT_SPECS)[i % len(registry.AGENT_SPECS)])
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:>10}: {elapsed / calls * 1000:8.3f} ms/call  "
+        f"retained {current / 1024:8.1f} KiB  peak {peak / 1024:8.1f} KiB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CrewAI agent construction overhead")
+    parser.add_argument("--calls", type=int, default=50)
+    args = parser.parse_args()
+
+    # Import crewai outside the measurement so only construction is timed
+    import crewai  # noqa: F401
+
+    print(f"{args.calls} calls across {len(registry.AGENT_SPECS)} agents")
+    _measure("per-call", lambda name: registry.build_crew(registry.AGENT_SPECS[name]), args.calls)
+    _measure("registry", registry.get_crew, args.calls)
+    settings.crewai_agents_enabled = False
+    _measure("bypass", registry.get_crew, args.calls)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Cold-start profile of `import backend.main` using `python -X importtime`.
+
+    python -m benchmarks.import_time [--module backend.main] [--top 15] [--json]
+
+Runs the import in a fresh interpreter and reports total import time, peak
+RSS, the slowest top-level packages and which heavy SDKs were loaded. The
+heavy SDKs should stay unloaded unless WARMUP_ON_STARTUP is set.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import resource
+import subprocess
+import sys
+from collections import defaultdict
+
+from benchmarks import _env
+
+HEAVY_MODULES = (
+    "chromadb",
+    "crewai",
+    "openai",
+    "azure.cognitiveservices.speech",
+    "fitz",
+    "reportlab",
+)
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _profile(module: str) -> tuple[list[tuple[int, int, str]], list[str]]:
+    probe = (
+        f"import {module}, sys; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        capture_output=True,
+        text=True,
+        env=dict(_env.apply()),
+    )
+    if proc.returncode != 0:
+        sys.exit(proc.stderr[-2000:])
+    entries = []
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((int(cumulative_us), len(indent), name))
+    loaded = [m for m in proc.stdout.strip().split(",") if m]
+    return entries, loaded
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import-time profile of the API process")
+    parser.add_argument("--module", default="backend.main")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", action="store_true", help="Machine-readable output for tracking")
+    args = parser.parse_args()
+
+    entries, loaded = _profile(args.module)
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+
+    # Top-level packages only (indent of one space = imported directly by the probe)
+    min_indent = min(indent for _, indent, _ in entries)
+    by_package: dict[str, int] = defaultdict(int)
+    for cumulative_us, indent, name in entries:
+        if indent == min_indent:
+            by_package[name.split(".")[0]] += cumulative_us
+    total_us = sum(by_package.values())
+    slowest = sorted(by_package.items(), key=lambda kv: kv[1], reverse=True)[: args.top]
+
+    if args.json:
+        print(json.dumps({
+            "module": args.module,
+            "total_ms": round(total_us / 1000, 1),
+            "peak_rss_mb": round(peak_rss_mb, 1),
+            "heavy_modules_loaded": loaded,
+            "slowest": {name: round(us / 1000, 1) for name, us in slowest},
+        }))
+        return
+
+    print(f"import {args.module}: {total_us / 1000:.0f} ms, peak RSS {peak_rss_mb:.0f} MB")
+    print(f"heavy SDKs loaded: {', '.join(loaded) or 'none'}")
+    for name, us in slowest:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Event-loop lag during a burst of logins, with argon2 run inline (the old
+behaviour) versus on the bounded hash pool in backend.core.security.
+
+    python -m benchmarks.login_storm --logins 200
+
+A ticker coroutine sleeps 5 ms in a loop and records how late it wakes up;
+that lateness is what every other request on the worker would see.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks import _env
+
+# Measure queueing, not load shedding
+_env.apply(PASSWORD_HASH_MAX_PENDING="1000000")
+
+from backend.core import security  # noqa: E402
+
+TICK_SECONDS = 0.005
+
+
+async def _ticker(lags: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(time.perf_counter() - start - TICK_SECONDS)
+
+
+async def _inline_login(password: str, hashed: str) -> bool:
+    return security.pwd_context.verify(password, hashed)
+
+
+async def _pooled_login(password: str, hashed: str) -> bool:
+    return await security.verify_password_async(password, hashed)
+
+
+async def _storm(login, logins: int, hashed: str) -> dict:
+    lags: list[float] = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_ticker(lags, stop))
+    await asyncio.sleep(TICK_SECONDS * 4)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login("correct horse", hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await ticker
+    lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+    return {
+        "elapsed_s": elapsed,
+        "logins_per_s": logins / elapsed,
+        "lag_p50_ms": statistics.median(lags_ms),
+        "lag_p99_ms": lags_ms[int(len(lags_ms) * 0.99) - 1] if len(lags_ms) > 1 else lags_ms[0],
+        "lag_max_ms": lags_ms[-1],
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=100)
+    args = parser.parse_args()
+
+    hashed = security.pwd_context.hash("correct horse")
+    settings = security.settings
+    print(
+        f"argon2 t={settings.argon2_time_cost} m={settings.argon2_memory_cost_kib}KiB "
+        f"p={settings.argon2_parallelism}; pool={settings.password_hash_workers} threads; "
+        f"{args.logins} concurrent logins"
+    )
+    for name, login in (("inline", _inline_login), ("pool", _pooled_login)):
+        result = await _storm(login, args.logins, hashed)
+        print(
+            f"{name:>7}: {result['elapsed_s']:.2f}s ({result['logins_per_s']:.0f}/s)  "
+            f"loop lag p50 {result['lag_p50_ms']:.1f}ms  p99 {result['lag_p99_ms']:.1f}ms  "
+            f"max {result['lag_max_ms']:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())